@@ -17,6 +17,7 @@ from pathlib import Path
 from core.url_resolver import FrontendUrlType
 from decouple import Csv, config
 from dj_database_url import parse as db_url
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import gettext_lazy as _
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -64,6 +65,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.RequestCacheMiddleware",
+    "issues.middleware.HistoryOutboxMiddleware",
+    "core.middleware.EmailOutboxMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -104,7 +108,51 @@ WSGI_APPLICATION = "bug_tracker.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {"default": config("DATABASE_URL", cast=db_url)}
+SERVER_INTERFACE = config("SERVER_INTERFACE", default="wsgi")
+
+# Connections of the pool are returned to it at the end of every request, so they are never kept open by Django.
+# The pool is provided by psycopg-pool and is supported on PostgreSQL only.
+DATABASE_POOL_MAX_SIZE = config("DATABASE_POOL_MAX_SIZE", cast=int, default=0)
+DATABASE_POOL_MIN_SIZE = config("DATABASE_POOL_MIN_SIZE", cast=int, default=0)
+DATABASE_POOL_TIMEOUT = config("DATABASE_POOL_TIMEOUT", cast=int, default=30)
+# Under ASGI every request runs in a new thread, which would leave its persistent connection behind,
+# so connections are kept open between requests under WSGI only
+DATABASE_CONN_MAX_AGE = config(
+    "DATABASE_CONN_MAX_AGE", cast=int, default=0 if DATABASE_POOL_MAX_SIZE or SERVER_INTERFACE == "asgi" else 60
+)
+# PgBouncer in transaction pooling mode does not keep server-side cursors between transactions
+DATABASE_PGBOUNCER = config("DATABASE_PGBOUNCER", cast=bool, default=False)
+
+DATABASES = {
+    "default": db_url(
+        config("DATABASE_URL"),
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        conn_health_checks=DATABASE_CONN_MAX_AGE > 0,
+        disable_server_side_cursors=DATABASE_PGBOUNCER,
+    )
+}
+
+if DATABASE_POOL_MAX_SIZE:
+    if DATABASES["default"]["ENGINE"] != "django.db.backends.postgresql":
+        raise ImproperlyConfigured("DATABASE_POOL_MAX_SIZE requires a PostgreSQL DATABASE_URL")
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": DATABASE_POOL_MIN_SIZE,
+        "max_size": DATABASE_POOL_MAX_SIZE,
+        "timeout": DATABASE_POOL_TIMEOUT,
+    }
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHE_URL = config("CACHE_URL", default="")
+
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}
+        if CACHE_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    ),
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -177,6 +225,10 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
     "SWAGGER_UI_DIST": "SIDECAR",
     "SWAGGER_UI_FAVICON_HREF": "SIDECAR",
+    "ENUM_NAME_OVERRIDES": {
+        "IssueBulkResultEnum": "issues.services.command_issue.BulkResult.choices",
+        "MemberImportResultEnum": "projects.services.command_member.ImportResult.choices",
+    },
 }
 
 ACCOUNT_USERNAME_MIN_LENGTH = 5
@@ -298,6 +350,34 @@ LOGGING = {
 SUBDOMAIN_HEADER_NAME = "X-Project-Identifier"
 SUBDOMAIN_CHANGE_INTERVAL_DAYS = 14
 
+PROJECT_MEMBERSHIP_CACHE_TIMEOUT = config("PROJECT_MEMBERSHIP_CACHE_TIMEOUT", cast=int, default=60 * 5)
+ISSUE_PROJECT_CACHE_TIMEOUT = config("ISSUE_PROJECT_CACHE_TIMEOUT", cast=int, default=60 * 60 * 24)
+
+# Project event streams are served only by the ASGI application. Without a Redis URL, events are delivered
+# within a single process only, which is why production requires it.
+EVENTS_BROKER_URL = config("EVENTS_BROKER_URL", default="")
+EVENTS_HEARTBEAT_INTERVAL = config("EVENTS_HEARTBEAT_INTERVAL", cast=int, default=15)
+EVENTS_STREAM_TIMEOUT = config("EVENTS_STREAM_TIMEOUT", cast=int, default=60 * 5)
+EVENTS_QUEUE_SIZE = config("EVENTS_QUEUE_SIZE", cast=int, default=100)
+
+# When enabled, issue history entries are collected per request and written by a Celery task after commit
+ISSUE_HISTORY_ASYNC = config("ISSUE_HISTORY_ASYNC", cast=bool, default=False)
+
+# "storages.backends.s3.S3Storage" serves attachments with signed URLs and lets clients upload them directly,
+# it requires the `s3` extra of django-storages
+MEDIA_STORAGE_BACKEND = config("MEDIA_STORAGE_BACKEND", default="django.core.files.storage.FileSystemStorage")
+AWS_STORAGE_BUCKET_NAME = config("AWS_STORAGE_BUCKET_NAME", default="")
+AWS_S3_REGION_NAME = config("AWS_S3_REGION_NAME", default=None)
+# Set for S3-compatible servers, e.g. a local MinIO
+AWS_S3_ENDPOINT_URL = config("AWS_S3_ENDPOINT_URL", default=None)
+AWS_ACCESS_KEY_ID = config("AWS_ACCESS_KEY_ID", default=None)
+AWS_SECRET_ACCESS_KEY = config("AWS_SECRET_ACCESS_KEY", default=None)
+AWS_DEFAULT_ACL = None
+AWS_QUERYSTRING_AUTH = True
+AWS_S3_SIGNATURE_VERSION = "s3v4"
+AWS_QUERYSTRING_EXPIRE = config("AWS_QUERYSTRING_EXPIRE", cast=int, default=60 * 5)
+AWS_S3_FILE_OVERWRITE = False
+
 STORAGES = {
     "staticfiles": {
         "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
@@ -310,7 +390,19 @@ ATTACHMENTS_ALLOWED_FILE_TYPES = {
     "png": "image/png",
     "txt": "text/plain",
 }
-ATTACHMENTS_MAX_SIZE = config("ATTACHMENTS_MAX_SIZE", default=1024 * 1024 * 10)
+ATTACHMENTS_MAX_SIZE = config("ATTACHMENTS_MAX_SIZE", cast=int, default=1024 * 1024 * 10)
+# When enabled, attachments with the same content share a single file stored under its digest
+ATTACHMENTS_CONTENT_ADDRESSED = config("ATTACHMENTS_CONTENT_ADDRESSED", cast=bool, default=False)
+# Internal nginx location serving MEDIA_ROOT, to which attachment downloads are handed over after
+# the permission check. Leave empty when not running behind nginx to stream the files from Django.
+MEDIA_ACCEL_REDIRECT_LOCATION = config("MEDIA_ACCEL_REDIRECT_LOCATION", default="/internal/media/")
+# Thumbnails of image and PDF attachments fit in this box
+ATTACHMENTS_THUMBNAIL_SIZE = (320, 320)
+# Presigned upload URLs are valid for this many seconds. Files uploaded but never confirmed stay in the bucket
+# until `manage.py delete_unconfirmed_uploads` deletes them, run it periodically (e.g. hourly from cron).
+ATTACHMENTS_UPLOAD_EXPIRE = config("ATTACHMENTS_UPLOAD_EXPIRE", cast=int, default=60 * 5)
+# Uploads are streamed into this directory, keep it on the media volume so that saving them is a rename
+FILE_UPLOAD_TEMP_DIR = config("FILE_UPLOAD_TEMP_DIR", default=None)
 
 CORS_URLS_REGEX = r"^/api/.*$"
 CORS_ALLOWED_ORIGIN_REGEXES = [rf"^https?://([-a-zA-Z0-9_]+\.)*{re.escape(config("FRONT_DOMAIN"))}$"]
@@ -1,5 +1,5 @@
 from .base import *
-from .base import REST_AUTH, STORAGES
+from .base import MEDIA_STORAGE_BACKEND, REST_AUTH, STORAGES
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
@@ -13,11 +13,10 @@ REST_AUTH.update(
 
 CORE_EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
-MEDIA_URL = "http://media.bugtracker.local/"
 STORAGES.update(
     {
         "default": {
-            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "BACKEND": MEDIA_STORAGE_BACKEND,
         },
     }
 )
@@ -1,5 +1,17 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
-from .base import REST_AUTH, STORAGES
+from .base import CACHE_URL, EVENTS_BROKER_URL, MEDIA_STORAGE_BACKEND, REST_AUTH, STORAGES
+
+if not CACHE_URL:
+    # Memberships and roles checked by permissions are cached across requests, a per-process cache
+    # would let a removed member keep access in the other processes until the entries expire
+    raise ImproperlyConfigured("CACHE_URL must point to a cache shared by all processes")
+
+if not EVENTS_BROKER_URL:
+    # Events are published by every web and Celery worker, an in-memory broker would deliver them
+    # only to the streams served by the same process
+    raise ImproperlyConfigured("EVENTS_BROKER_URL must point to a broker shared by all processes")
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = False
@@ -18,11 +30,10 @@ REST_AUTH.update(
 
 CORE_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 
-MEDIA_URL = "https://media.bugtracker.com/"
 STORAGES.update(
     {
         "default": {
-            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "BACKEND": MEDIA_STORAGE_BACKEND,
         },
     }
 )
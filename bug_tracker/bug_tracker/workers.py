@@ -0,0 +1,10 @@
+"""
+Gunicorn worker classes, see `gunicorn.conf.py`
+"""
+
+from uvicorn_worker import UvicornWorker as _UvicornWorker
+
+
+class UvicornWorker(_UvicornWorker):
+    # Django does not implement the lifespan protocol
+    CONFIG_KWARGS = {**_UvicornWorker.CONFIG_KWARGS, "lifespan": "off"}
@@ -0,0 +1,115 @@
+import hashlib
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Concatenate, ParamSpec
+
+from core.exceptions import PreconditionFailed, PreconditionRequired
+from django.db import transaction
+from django.db.models import Expression, F, QuerySet
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status, views
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+P = ParamSpec("P")
+Handler = Callable[Concatenate[views.APIView, Request, P], Response]
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+@dataclass(frozen=True)
+class Version:
+    etag: str
+    last_modified: datetime | None = None
+
+    @property
+    def timestamp(self) -> int | None:
+        return None if self.last_modified is None else int(self.last_modified.timestamp())
+
+
+def _make_etag(*parts: Any) -> str:
+    key = ":".join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+
+def get_version(*, pk: Any, updated_at: datetime, variant: str = "") -> Version:
+    """
+    Returns the version of a resource, identified by the time it was last updated.
+    `variant` distinguishes representations of the same resource, which differ between users.
+    """
+    return Version(etag=_make_etag(pk, updated_at.isoformat(), variant), last_modified=updated_at)
+
+
+def get_token_version(*, token: Any, variant: str = "") -> Version:
+    """Returns the version of a collection, identified by a token which changes whenever any of its items does"""
+    return Version(etag=_make_etag(token, variant))
+
+
+def queryset_get_version(
+    queryset: QuerySet, *, for_update: bool = False, updated_at: Expression | None = None, variant: str = ""
+) -> Version | None:
+    """
+    Returns the version of the single object matched by `queryset`, reading only its `updated_at`.
+    With `for_update`, the row stays locked until the end of the transaction.
+    """
+    if for_update:
+        queryset = queryset.select_for_update(of=("self",))
+    row = queryset.values_list("pk", updated_at or F("updated_at")).first()
+    if row is None:
+        return None
+    return get_version(pk=row[0], updated_at=row[1], variant=variant)
+
+
+def _set_version_headers(response: HttpResponse, version: Version | None) -> HttpResponse:
+    if version is not None:
+        response.headers["ETag"] = version.etag
+    if version is not None and version.last_modified is not None:
+        response.headers["Last-Modified"] = http_date(version.timestamp)
+    return response
+
+
+def conditional(version_getter: Callable[..., Version | None]) -> Callable[[Handler], Handler]:
+    """
+    Makes an APIView handler answer conditional requests, before it runs. `GET` with a matching `If-None-Match`
+    (or `If-Modified-Since`) is answered with 304, and an unsafe request with a stale `If-Match` is rejected with 412.
+    Successful responses carry `ETag` and `Last-Modified`.
+
+    `Last-Modified` has a precision of one second, which can't tell apart two versions written within the same second,
+    so unsafe requests with `If-Unmodified-Since` alone are rejected with 428 instead of risking a lost update.
+
+    `version_getter` is called with the request, `for_update` and the URL kwargs, and returns `None` when the resource
+    does not exist or is not visible to the user. Unsafe requests run in a transaction, in which `for_update` locks
+    the resource until the handler has changed it, so that two clients can't both update the same version.
+    """
+
+    def decorator(handler: Handler) -> Handler:
+        @wraps(handler)
+        def wrapper(view: views.APIView, request: Request, *args: P.args, **kwargs: P.kwargs) -> Response:
+            is_safe = request.method in SAFE_METHODS
+            if not is_safe and "If-Unmodified-Since" in request.headers and "If-Match" not in request.headers:
+                raise PreconditionRequired
+            with nullcontext() if is_safe else transaction.atomic():
+                version = version_getter(request=request, for_update=not is_safe, **kwargs)
+                if version is not None:
+                    conditional_response = get_conditional_response(
+                        request, etag=version.etag, last_modified=version.timestamp if is_safe else None
+                    )
+                    if conditional_response is not None:
+                        if conditional_response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+                            raise PreconditionFailed
+                        return _set_version_headers(conditional_response, version)
+                response = handler(view, request, *args, **kwargs)
+
+            if not status.is_success(response.status_code):
+                return response
+            if not is_safe:
+                version = version_getter(request=request, for_update=False, **kwargs)
+            return _set_version_headers(response, version)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,45 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+
+def _get_sql(queryset: QuerySet) -> tuple[str, tuple]:
+    return queryset.order_by().query.get_compiler(using=queryset.db).as_sql()
+
+
+def estimate_count(queryset: QuerySet, *, exact_below: int) -> int:
+    """
+    Returns the PostgreSQL planner's row estimate for the queryset. Falls back to an exact count
+    on other databases, and when the estimate is small enough for counting to be cheap.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = _get_sql(queryset)
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < exact_below:
+        return queryset.count()
+    return estimate
+
+
+def cached_count(queryset: QuerySet, *, timeout: int) -> int:
+    """Returns the queryset's count, cached under a key derived from its SQL and parameters"""
+    sql, params = _get_sql(queryset)
+    digest = hashlib.sha256(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+    key = f"core:count:{digest}"
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=timeout)
+    return count
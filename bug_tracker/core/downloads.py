@@ -0,0 +1,46 @@
+import mimetypes
+from pathlib import PurePosixPath
+from urllib.parse import quote
+
+from core.storage import get_signed_url, serves_signed_urls
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, HttpRequest, HttpResponse, HttpResponseRedirect
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+
+def get_file_etag(file: FieldFile) -> tuple[str, int]:
+    """Returns the ETag and modification timestamp of a stored file, the ETag in the format nginx uses"""
+    last_modified = int(file.storage.get_modified_time(file.name).timestamp())
+    return f'"{last_modified:x}-{file.size:x}"', last_modified
+
+
+def file_download_response(
+    request: HttpRequest, file: FieldFile, *, filename: str | None = None, as_attachment: bool = True
+) -> HttpResponseBase:
+    """
+    Serves a stored file after the caller checked access to it. Storages with signed URLs are redirected to,
+    otherwise the transfer is handed over to nginx with `X-Accel-Redirect` if `MEDIA_ACCEL_REDIRECT_LOCATION`
+    is set, so that no worker is tied up streaming it. nginx answers Range requests for the internal location.
+    The file is downloaded as `filename`, or under its stored name if it is not given.
+    """
+    if serves_signed_urls(file.storage):
+        return HttpResponseRedirect(get_signed_url(file, filename=filename, as_attachment=as_attachment))
+
+    etag, last_modified = get_file_etag(file)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        filename = filename or PurePosixPath(file.name).name
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        if settings.MEDIA_ACCEL_REDIRECT_LOCATION:
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = quote(f"{settings.MEDIA_ACCEL_REDIRECT_LOCATION}{file.name}")
+        else:
+            response = FileResponse(file.open("rb"), content_type=content_type)
+        response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
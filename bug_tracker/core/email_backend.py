@@ -1,13 +1,39 @@
-from typing import Sequence
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Sequence
 
 from core.emails import serialize_email_messages
 from core.tasks import async_send_messages
 from django.core.mail import EmailMessage
 from django.core.mail.backends.base import BaseEmailBackend
 
+_outbox: ContextVar[list[dict] | None] = ContextVar("email_outbox", default=None)
+
+
+def _enqueue(serialized_messages: Sequence[dict]) -> None:
+    async_send_messages.delay(serialized_messages, enqueued_at=time.time())
+
+
+@contextmanager
+def email_outbox_scope() -> Iterator[None]:
+    """Collects messages sent within the `with` block (usually a single request) and enqueues them as one task"""
+    token = _outbox.set([])
+    try:
+        yield
+    finally:
+        messages = _outbox.get()
+        _outbox.reset(token)
+        if messages:
+            _enqueue(messages)
+
 
 class AsyncEmailBackend(BaseEmailBackend):
     def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
         serialized_messages = serialize_email_messages(email_messages)
-        async_send_messages.delay(serialized_messages)
+        outbox = _outbox.get()
+        if outbox is None:
+            _enqueue(serialized_messages)
+        else:
+            outbox.extend(serialized_messages)
         return len(email_messages)
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from functools import cache, partial
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import redis
+import redis.asyncio as aioredis
+from core.logger import get_main_logger
+from django.conf import settings
+from django.db import transaction
+
+# Sent first on a stream the client reconnected to, events published while it was disconnected are not replayed
+RESYNC_EVENT = "stream.resync"
+
+
+def _new_event_id() -> str:
+    return str(time.time_ns())
+
+
+@dataclass(frozen=True)
+class Event:
+    type: str
+    channel: str
+    data: dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=_new_event_id, compare=False)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    def to_sse(self) -> str:
+        """Formats the event as a server-sent event"""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+    @classmethod
+    def from_json(cls, value: str | bytes) -> "Event":
+        return cls(**json.loads(value))
+
+
+class Subscription:
+    """Events published to the subscribed channels, in the order in which they were received"""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        self.loop = asyncio.get_running_loop()
+
+    def put(self, event: Event) -> None:
+        """Thread-safe, drops the event if the subscriber does not keep up"""
+        self.loop.call_soon_threadsafe(self._put_nowait, event)
+
+    def close(self) -> None:
+        """Thread-safe, ends the subscription once the events received so far are consumed"""
+        self.loop.call_soon_threadsafe(self._close)
+
+    def _close(self) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    def _put_nowait(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            get_main_logger().warning(f"Dropped `{event.type}` event on `{event.channel}`, the subscriber is too slow")
+
+    async def get(self) -> Event | None:
+        """Returns the next event, or `None` once the subscription is closed"""
+        return await self.queue.get()
+
+
+class InMemoryBroker:
+    """Delivers events to subscribers within the same process"""
+
+    def __init__(self) -> None:
+        self._subscriptions: defaultdict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, event: Event) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event.channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    @asynccontextmanager
+    async def subscribe(self, channels: list[str]) -> AsyncIterator[Subscription]:
+        subscription = Subscription()
+        with self._lock:
+            for channel in channels:
+                self._subscriptions[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                for channel in channels:
+                    self._subscriptions[channel].discard(subscription)
+                    if not self._subscriptions[channel]:
+                        del self._subscriptions[channel]
+
+
+class RedisBroker:
+    """Delivers events to subscribers in every process connected to the same Redis, through pub/sub"""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def _get_channel_name(self, channel: str) -> str:
+        return f"events:{channel}"
+
+    def publish(self, event: Event) -> None:
+        try:
+            self._client.publish(self._get_channel_name(event.channel), event.to_json())
+        except redis.RedisError as e:  # Events are best-effort, they must never fail a committed change
+            get_main_logger().warning(f"Failed to publish `{event.type}` event on `{event.channel}`: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, channels: list[str]) -> AsyncIterator[Subscription]:
+        subscription = Subscription()
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(*[self._get_channel_name(channel) for channel in channels])
+        reader = asyncio.create_task(self._read(pubsub, subscription))
+        try:
+            yield subscription
+        finally:
+            reader.cancel()
+            await pubsub.aclose()
+            await client.aclose()
+
+    async def _read(self, pubsub: aioredis.client.PubSub, subscription: Subscription) -> None:
+        try:
+            async for message in pubsub.listen():
+                subscription.put(Event.from_json(message["data"]))
+        except redis.RedisError as e:
+            get_main_logger().warning(f"Lost the connection to the events broker: {e}")
+            subscription.close()
+
+
+Broker = InMemoryBroker | RedisBroker
+
+
+@cache
+def get_broker() -> Broker:
+    """Returns the broker configured with `EVENTS_BROKER_URL`, or an in-memory one if it is empty"""
+    if not settings.EVENTS_BROKER_URL:
+        return InMemoryBroker()
+    return RedisBroker(settings.EVENTS_BROKER_URL)
+
+
+def _publish(event: Event) -> None:
+    get_broker().publish(event)
+
+
+def publish_event(event_type: str, *, channel: str, **data: Any) -> None:
+    """Publishes the event once the current transaction commits, and discards it if the transaction is rolled back"""
+    transaction.on_commit(partial(_publish, Event(type=event_type, channel=channel, data=data)))
+
+
+async def stream_events(
+    channels: list[str], *, is_allowed: Callable[[], Awaitable[bool]], last_event_id: str | None = None
+) -> AsyncIterator[str]:
+    """
+    Yields events published to the channels as server-sent events, with a comment every `EVENTS_HEARTBEAT_INTERVAL`
+    seconds which keeps proxies from closing an idle connection. `is_allowed` is awaited along with every heartbeat,
+    and the stream ends once it returns `False`. It ends after `EVENTS_STREAM_TIMEOUT` seconds too,
+    so that the client reconnects and authenticates again.
+
+    Every stream starts with an id, so that the client sends `Last-Event-ID` when it reconnects, even if no event
+    came meanwhile. A reconnected stream (`last_event_id`) starts with a `RESYNC_EVENT`, which tells the client
+    to fetch what it shows again, as events are not replayed.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EVENTS_STREAM_TIMEOUT
+    async with get_broker().subscribe(channels) as subscription:
+        yield f": connected\nid: {_new_event_id()}\n\n"
+        if last_event_id is not None:
+            yield Event(type=RESYNC_EVENT, channel="").to_sse()
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), timeout=min(remaining, settings.EVENTS_HEARTBEAT_INTERVAL)
+                )
+            except TimeoutError:
+                if not await is_allowed():
+                    return
+                yield ": heartbeat\n\n"
+                continue
+            if event is None:
+                return
+            yield event.to_sse()
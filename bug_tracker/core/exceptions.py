@@ -30,6 +30,24 @@ class Unprocessable(exceptions.APIException):
     default_code = "unprocessable_entity"
 
 
+class PreconditionFailed(exceptions.APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = _("The resource has been modified since it was last fetched.")
+    default_code = "precondition_failed"
+
+
+class PreconditionRequired(exceptions.APIException):
+    status_code = status.HTTP_428_PRECONDITION_REQUIRED
+    default_detail = _("Conditional updates require the If-Match header.")
+    default_code = "precondition_required"
+
+
+class NotSupported(exceptions.APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = _("The server does not support this request.")
+    default_code = "not_supported"
+
+
 def custom_exception_handler(exc: Any, ctx: Any) -> Response | None:
     if isinstance(exc, DjangoValidationError):
         exc = exceptions.ValidationError(as_serializer_error(exc))
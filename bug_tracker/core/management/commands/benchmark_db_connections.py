@@ -0,0 +1,59 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+def get_unpooled_connection(alias: str) -> BaseDatabaseWrapper:
+    """Returns a connection to the database which is opened and closed on every request"""
+    connection = connections[alias]
+    options = {key: value for key, value in connection.settings_dict.get("OPTIONS", {}).items() if key != "pool"}
+    settings_dict = {**connection.settings_dict, "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False, "OPTIONS": options}
+    return connection.__class__(settings_dict, alias)
+
+
+def time_requests(connection: BaseDatabaseWrapper, *, requests: int) -> list[float]:
+    """Runs a single query per request, managing the connection as Django does around every request"""
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        connection.close_if_unusable_or_obsolete()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+class Command(BaseCommand):
+    help = "Compare the time of requests opening a new database connection with the configured connection handling"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=100, help="Number of requests to time")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database to connect to")
+
+    def handle(self, *args, requests: int, database: str, **kwargs) -> None:
+        connection = connections[database]
+        if connection.settings_dict.get("OPTIONS", {}).get("pool"):
+            configured = "connection pool"
+        elif connection.settings_dict["CONN_MAX_AGE"] != 0:
+            configured = "persistent connection"
+        else:
+            configured = "new connection per request"
+
+        unpooled_connection = get_unpooled_connection(database)
+        try:
+            baseline = time_requests(unpooled_connection, requests=requests)
+        finally:
+            unpooled_connection.close()
+        timings = time_requests(connection, requests=requests)
+
+        for label, values in (("new connection per request", baseline), (configured, timings)):
+            self.stdout.write(
+                f"{label}: mean {statistics.mean(values) * 1000:.3f} ms, "
+                f"median {statistics.median(values) * 1000:.3f} ms, max {max(values) * 1000:.3f} ms"
+            )
+        speedup = statistics.mean(baseline) / statistics.mean(timings)
+        self.stdout.write(self.style.SUCCESS(f"Requests with {configured} are {speedup:.1f}x as fast"))
@@ -1,6 +1,8 @@
 from typing import Callable
 
+from core.email_backend import email_outbox_scope
 from core.logger import get_main_logger
+from core.request_cache import request_cache_scope
 from django.http import HttpRequest, HttpResponse
 
 
@@ -23,3 +25,25 @@ class LogIpMiddleware:
         user = request.user
         get_main_logger().info(f"Request from IP: {ip}, user: {user}")
         return response
+
+
+class RequestCacheMiddleware:
+    """Middleware to scope `core.request_cache` to a single HTTP request."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with request_cache_scope():
+            return self.get_response(request)
+
+
+class EmailOutboxMiddleware:
+    """Middleware to enqueue emails sent during a single HTTP request as one task."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with email_outbox_scope():
+            return self.get_response(request)
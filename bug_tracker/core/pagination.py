@@ -1,11 +1,24 @@
-from typing import Sequence
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Sequence
 
-from django.db.models import QuerySet
+from core.counts import cached_count, estimate_count
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Q, QuerySet
+from django.utils.translation import gettext_lazy as _
 from django.views import View
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import BasePagination, LimitOffsetPagination as _LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.utils.urls import replace_query_param
+
+Position = list[Any]
 
 
 def get_paginated_response(
@@ -15,23 +28,98 @@ def get_paginated_response(
     queryset: QuerySet,
     request: Request,
     view: View,
+    cursor_pagination_class: type["CursorPagination"] | None = None,
 ):
+    """
+    Paginates the queryset with `pagination_class`, unless `cursor_pagination_class` is given
+    and the client opted into cursor pagination by sending the cursor query parameter.
+    """
+    if cursor_pagination_class is not None and cursor_pagination_class.cursor_query_param in request.query_params:
+        pagination_class = cursor_pagination_class
+
     paginator = pagination_class()
 
     page = paginator.paginate_queryset(queryset, request, view=view)
 
     if page is not None:
-        serializer = serializer_class(page, many=True)
+        serializer = serializer_class(page, many=True, context={"request": request})
         return paginator.get_paginated_response(serializer.data)
 
-    serializer = serializer_class(queryset, many=True)
+    serializer = serializer_class(queryset, many=True, context={"request": request})
 
     return Response(serializer.data)
 
 
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
 class LimitOffsetPagination(_LimitOffsetPagination):
+    """
+    Limit/offset pagination with a configurable `count_mode`:
+
+    - `EXACT` runs `COUNT(*)` on every request,
+    - `ESTIMATED` uses the PostgreSQL planner estimate unless it is below `estimate_exact_below`,
+    - `CACHED` caches the exact count for `count_cache_timeout` seconds,
+    - `NONE` leaves `count` out (`null`).
+
+    In every mode but `EXACT` one extra row is fetched to tell whether a next page exists,
+    so an approximate count never hides or invents pages.
+    """
+
     default_limit = 10
     max_limit = 100
+    count_mode = CountMode.EXACT
+    estimate_exact_below = 10_000
+    count_cache_timeout = 30
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: View | None = None) -> list | None:
+        if self.count_mode == CountMode.EXACT:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+
+        results = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        results = results[: self.limit]
+
+        if not self.has_next and (results or self.offset == 0):
+            self.count = self.offset + len(results)
+        elif self.count_mode == CountMode.NONE:
+            self.count = None
+        else:
+            lower_bound = self.offset + len(results) + self.has_next if results else 0
+            self.count = max(self.get_count(queryset), lower_bound)
+        return results
+
+    def get_count(self, queryset: QuerySet) -> int:
+        if isinstance(queryset, QuerySet):
+            if self.count_mode == CountMode.ESTIMATED:
+                return estimate_count(queryset, exact_below=self.estimate_exact_below)
+            if self.count_mode == CountMode.CACHED:
+                return cached_count(queryset, timeout=self.count_cache_timeout)
+        return super().get_count(queryset)
+
+    def get_next_link(self) -> str | None:
+        if self.count_mode == CountMode.EXACT:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        if self.count_mode == CountMode.NONE:
+            response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
 
     def get_paginated_response(self, data: Sequence) -> Response:
         return Response(
@@ -44,3 +132,185 @@ class LimitOffsetPagination(_LimitOffsetPagination):
                 "results": data,
             }
         )
+
+
+class CursorPagination(BasePagination):
+    """
+    Keyset pagination over the queryset's own ordering, with `pk` appended as a tie-breaker.
+
+    Pages are selected with a `WHERE` clause on the ordering values of the last seen row
+    instead of `OFFSET`, and no `COUNT(*)` is run, so every page costs the same.
+    Fields used for ordering must not be nullable.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value. Send it empty to request the first page.")
+    limit_query_param = "limit"
+    limit_query_description = _("Number of results to return per page.")
+    invalid_cursor_message = _("Invalid cursor")
+    default_limit = 10
+    max_limit = 100
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: View | None = None) -> list[Model]:
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(queryset)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self._reverse_ordering(self.ordering) if reverse else self.ordering
+        try:
+            queryset = queryset.order_by(*ordering)
+            if position is not None:
+                queryset = queryset.filter(self._get_keyset_filter(ordering, position))
+            results = list(queryset[: self.limit + 1])
+        except (ValidationError, ValueError, TypeError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data: Sequence) -> Response:
+        return Response(
+            {
+                "limit": self.limit,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_limit(self, request: Request) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def get_ordering(self, queryset: QuerySet) -> list[str]:
+        query = queryset.query
+        ordering = list(query.order_by)
+        if not ordering and query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        ordering = [field for field in ordering if isinstance(field, str) and field != "?"]
+
+        if not any(field.lstrip("-") in ("pk", queryset.model._meta.pk.name) for field in ordering):
+            is_descending = bool(ordering) and ordering[0].startswith("-")
+            ordering.append("-pk" if is_descending else "pk")
+        return ordering
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._get_position(self.page[0]), reverse=True)
+
+    def decode_cursor(self, request: Request) -> tuple[Position | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(urlsafe_b64decode(padded.encode("ascii")))
+            position, reverse = cursor["p"], bool(cursor.get("r", False))
+        except (TypeError, ValueError, KeyError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position: Position, reverse: bool) -> str:
+        cursor = {"p": position, "r": reverse}
+        encoded = urlsafe_b64encode(json.dumps(cursor, separators=(",", ":")).encode("ascii")).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded.rstrip("="))
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "limit": {"type": "integer", "example": self.default_limit},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view: View) -> list[dict]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.limit_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.limit_query_description),
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    @staticmethod
+    def _reverse_ordering(ordering: Sequence[str]) -> list[str]:
+        return [field[1:] if field.startswith("-") else f"-{field}" for field in ordering]
+
+    @staticmethod
+    def _get_keyset_filter(ordering: Sequence[str], position: Position) -> Q:
+        """Builds `(a > x) OR (a = x AND b > y) OR ...`, flipping comparisons for descending fields"""
+        keyset_filter = Q()
+        equal_to_previous = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset_filter |= equal_to_previous & Q(**{f"{name}__{lookup}": value})
+            equal_to_previous &= Q(**{name: value})
+        return keyset_filter
+
+    def _get_position(self, instance: Model) -> Position:
+        return [self._to_json_value(self._get_attribute(instance, field.lstrip("-"))) for field in self.ordering]
+
+    @staticmethod
+    def _get_attribute(instance: Model, field: str) -> Any:
+        value = instance
+        for attr in field.split("__"):
+            value = getattr(value, attr)
+        return value
+
+    @staticmethod
+    def _to_json_value(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+
+cursor_query_parameter = OpenApiParameter(
+    name=CursorPagination.cursor_query_param,
+    type=str,
+    required=False,
+    description=_(
+        "Opts into keyset pagination: the response contains `next`/`previous` cursor links "
+        "instead of `offset` and `count`. Send it empty to request the first page."
+    ),
+)
@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Hashable, Iterator
+
+_request_cache: ContextVar[dict[Hashable, Any] | None] = ContextVar("request_cache", default=None)
+
+
+@contextmanager
+def request_cache_scope() -> Iterator[None]:
+    """Opens a fresh cache which lives until the end of the `with` block (usually a single request)."""
+    token = _request_cache.set({})
+    try:
+        yield
+    finally:
+        _request_cache.reset(token)
+
+
+def request_cache_get(key: Hashable, default: Any = None) -> Any:
+    cache = _request_cache.get()
+    if cache is None:
+        return default
+    return cache.get(key, default)
+
+
+def request_cache_set(key: Hashable, value: Any) -> None:
+    """Stores value in the current cache scope. Does nothing if no scope is active."""
+    cache = _request_cache.get()
+    if cache is not None:
+        cache[key] = value
+
+
+def request_cache_delete(key: Hashable) -> None:
+    cache = _request_cache.get()
+    if cache is not None:
+        cache.pop(key, None)
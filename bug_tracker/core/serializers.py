@@ -11,5 +11,12 @@ class CommaSeparatedMultipleChoiceField(serializers.MultipleChoiceField):
         return ",".join(data)
 
 
+class AbsoluteURLField(serializers.CharField):
+    """URL made absolute against the request in the serializer context, as clients are served from another origin"""
+
+    def to_representation(self, value: str) -> str:
+        return self.context["request"].build_absolute_uri(value)
+
+
 def create_validation_error_for_field(field: str, message: str) -> exceptions.ValidationError:
     return exceptions.ValidationError({field: [message]})
@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Any, Iterator
+
+from core.exceptions import ApplicationException
+from django.core.files.storage import Storage
+from django.db.models.fields.files import FieldFile
+from django.utils.http import content_disposition_header
+from django.utils.translation import gettext_lazy as _
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+
+class DirectUploadNotSupported(ApplicationException):
+    message = _("The file storage does not support direct uploads.")
+
+
+def supports_direct_upload(storage: Storage) -> bool:
+    return isinstance(storage, S3Storage)
+
+
+def serves_signed_urls(storage: Storage) -> bool:
+    return supports_direct_upload(storage) and storage.querystring_auth
+
+
+def get_signed_url(file: FieldFile, *, filename: str | None = None, as_attachment: bool = True) -> str:
+    """Returns the signed URL of the file, with which the storage serves it under `filename` if given"""
+    if filename is None:
+        return file.url
+    disposition = content_disposition_header(as_attachment, filename)
+    return file.storage.url(file.name, parameters={"ResponseContentDisposition": disposition})
+
+
+def _get_key(storage: S3Storage, name: str) -> str:
+    return storage._normalize_name(clean_name(name))
+
+
+def _get_name(storage: S3Storage, key: str) -> str:
+    return key.removeprefix(f"{storage.location}/") if storage.location else key
+
+
+def list_files(storage: Storage, path: str, *, modified_before: datetime) -> Iterator[str]:
+    """Yields the names of the files under the directory `path`, which were last modified before `modified_before`"""
+    if supports_direct_upload(storage):
+        # A single listing of the bucket, instead of a request per directory
+        for summary in storage.bucket.objects.filter(Prefix=_get_key(storage, f"{path.rstrip('/')}/")):
+            if summary.last_modified < modified_before:
+                yield _get_name(storage, summary.key)
+        return
+
+    if not storage.exists(path):
+        return
+    directories, files = storage.listdir(path)
+    for file in files:
+        name = f"{path.rstrip('/')}/{file}"
+        if storage.get_modified_time(name) < modified_before:
+            yield name
+    for directory in directories:
+        yield from list_files(storage, f"{path.rstrip('/')}/{directory}", modified_before=modified_before)
+
+
+def generate_presigned_upload(storage: Storage, name: str, *, max_size: int, expires_in: int) -> dict[str, Any]:
+    """
+    Returns the URL and form fields of a presigned POST, with which the client uploads a file
+    of at most `max_size` bytes under `name` directly to the bucket
+    """
+    if not supports_direct_upload(storage):
+        raise DirectUploadNotSupported
+    return storage.bucket.meta.client.generate_presigned_post(
+        Bucket=storage.bucket_name,
+        Key=_get_key(storage, name),
+        Conditions=[["content-length-range", 1, max_size]],
+        ExpiresIn=expires_in,
+    )
+
+
+def read_file_head(storage: Storage, name: str, size: int) -> bytes:
+    """Reads the first `size` bytes of a stored file, with a ranged request instead of downloading it from S3"""
+    if supports_direct_upload(storage):
+        response = storage.bucket.Object(_get_key(storage, name)).get(Range=f"bytes=0-{size - 1}")
+        return response["Body"].read()
+    with storage.open(name) as file:
+        return file.read(size)
@@ -0,0 +1,57 @@
+from io import BytesIO
+
+import pypdfium2
+from django.core.files import File
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Raised for corrupted, truncated or oversized files
+_READ_ERRORS = (OSError, ValueError, Image.DecompressionBombError, pypdfium2.PdfiumError)
+
+THUMBNAIL_EXTENSION = "jpg"
+
+
+def supports_thumbnail(extension: str) -> bool:
+    return extension in ("jpg", "jpeg", "png", "pdf")
+
+
+def _open_image(file: File, size: tuple[int, int]) -> Image.Image:
+    image = Image.open(file)
+    # Lets the JPEG decoder scale the image down while decoding, instead of decoding it at full size
+    image.draft("RGB", size)
+    return ImageOps.exif_transpose(image)
+
+
+def _render_pdf_page(file: File, size: tuple[int, int]) -> Image.Image:
+    document = pypdfium2.PdfDocument(file.read())
+    try:
+        page = document[0]
+        width, height = page.get_size()
+        return page.render(scale=min(size[0] / width, size[1] / height)).to_pil()
+    finally:
+        document.close()
+
+
+def build_thumbnail(file: File, *, extension: str, size: tuple[int, int]) -> ContentFile | None:
+    """
+    Returns a JPEG thumbnail of an image, or a preview of the first page of a PDF, fitting in `size`.
+    Returns `None` for unsupported or unreadable files.
+    """
+    if not supports_thumbnail(extension):
+        return None
+
+    file.seek(0)
+    try:
+        image = _render_pdf_page(file, size) if extension == "pdf" else _open_image(file, size)
+        image.thumbnail(size)
+        if image.mode != "RGB":
+            background = Image.new("RGB", image.size, "white")
+            image = image.convert("RGBA")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+    except _READ_ERRORS:
+        return None
+
+    output = BytesIO()
+    image.save(output, format="JPEG", quality=80, optimize=True)
+    return ContentFile(output.getvalue())
@@ -0,0 +1,56 @@
+import hashlib
+from typing import Any
+
+from core.validators import MIME_TYPE_SNIFF_SIZE, get_mime_type, validate_file_size
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http import HttpRequest
+
+
+class AttachmentUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams every uploaded file into a temporary file, rejecting it as soon as it exceeds `max_size`.
+    The MIME type is sniffed from the first bytes and the SHA-256 digest is computed on the way,
+    so that neither validation nor deduplication reads the upload again.
+
+    Files are never buffered in memory. If `FILE_UPLOAD_TEMP_DIR` is on the same filesystem as the storage,
+    saving the file moves it into place instead of copying.
+    """
+
+    def __init__(self, request: HttpRequest | None = None, max_size: int | None = None) -> None:
+        super().__init__(request)
+        self.max_size = settings.ATTACHMENTS_MAX_SIZE if max_size is None else max_size
+
+    def new_file(self, *args: Any, **kwargs: Any) -> None:
+        super().new_file(*args, **kwargs)
+        self.file.mime_type = None
+        self.head = b""
+        self.hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        self.file.size = start + len(raw_data)
+        try:
+            validate_file_size(self.file, max_size=self.max_size)
+        except ValidationError as e:
+            # The parser closes only completed files, and leaves the rest of the request body unread
+            self.upload_interrupted()
+            raise ValidationError({self.field_name: e.messages}) from e
+
+        if self.file.mime_type is None:
+            self.head += raw_data
+            if len(self.head) >= MIME_TYPE_SNIFF_SIZE:
+                self._sniff_mime_type()
+        self.hash.update(raw_data)
+        super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size: int) -> UploadedFile:
+        if self.file.mime_type is None:
+            self._sniff_mime_type()
+        self.file.sha256 = self.hash.hexdigest()
+        return super().file_complete(file_size)
+
+    def _sniff_mime_type(self) -> None:
+        self.file.mime_type = get_mime_type(self.head)
+        self.head = b""
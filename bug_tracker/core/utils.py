@@ -7,7 +7,8 @@ def snake_to_title_case(text: str) -> str:
 
 
 def generate_username(prefix: str = "user_") -> str:
-    return f"{prefix}{uuid.uuid4().hex[:8]}"
+    """Returns a username with a random 128-bit suffix, unique without checking the database"""
+    return f"{prefix}{uuid.uuid4().hex}"
 
 
 def bytes_to_mib(value: int) -> float:
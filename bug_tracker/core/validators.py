@@ -1,3 +1,5 @@
+from functools import cache
+
 import magic
 from core.utils import bytes_to_mib, get_file_extension
 from django.conf import settings
@@ -8,11 +10,34 @@ from django.utils.translation import gettext_lazy as _
 
 default_extension_validator = FileExtensionValidator(allowed_extensions=settings.ATTACHMENTS_ALLOWED_FILE_TYPES.keys())
 
+MIME_TYPE_SNIFF_SIZE = 2048
+
+
+@cache
+def _get_magic() -> magic.Magic:
+    # Loading the magic database is expensive, and `Magic` serializes calls with its own lock
+    return magic.Magic(mime=True)
+
+
+def get_mime_type(buffer: bytes) -> str:
+    """Detects the MIME type of the buffer with a libmagic handle shared by all threads"""
+    return _get_magic().from_buffer(buffer[:MIME_TYPE_SNIFF_SIZE])
+
+
+def _sniff_mime_type(file: File) -> str:
+    # Upload handlers sniff the type from the first chunk, so that the upload is not read again.
+    # Model field validators get the upload wrapped in a `FieldFile`.
+    mime_type = getattr(file, "mime_type", None) or getattr(getattr(file, "file", None), "mime_type", None)
+    if mime_type is None:
+        file.seek(0)
+        mime_type = get_mime_type(file.read(MIME_TYPE_SNIFF_SIZE))
+    return mime_type
+
 
 def validate_mime_type(
     file: File, allowed_file_types: dict[str, str] = settings.ATTACHMENTS_ALLOWED_FILE_TYPES
 ) -> None:
-    mime_type = magic.Magic(mime=True).from_buffer(file.read(2048))
+    mime_type = _sniff_mime_type(file)
     ext = get_file_extension(file.name)
     expected_mime_type = allowed_file_types.get(ext)
 
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration, loaded from the working directory by default.
+
+`SERVER_INTERFACE=asgi` serves `bug_tracker.asgi` with uvicorn workers (`uvicorn-worker`).
+Each worker then reads requests and writes responses in its event loop, and runs the (sync) views in threads,
+so that slow clients and event streams hold a connection instead of a whole worker.
+`SERVER_INTERFACE=wsgi` (the default) serves `bug_tracker.wsgi` with sync workers.
+
+For more information on this file, see
+https://docs.gunicorn.org/en/stable/settings.html
+"""
+
+import multiprocessing
+
+from decouple import config
+
+SERVER_INTERFACE = config("SERVER_INTERFACE", default="wsgi")
+
+bind = config("GUNICORN_BIND", default="0.0.0.0:8000")
+timeout = config("GUNICORN_TIMEOUT", cast=int, default=30)
+graceful_timeout = config("GUNICORN_GRACEFUL_TIMEOUT", cast=int, default=30)
+keepalive = config("GUNICORN_KEEPALIVE", cast=int, default=5)
+# Requests come through nginx only
+forwarded_allow_ips = "*"
+accesslog = "-"
+
+if SERVER_INTERFACE == "asgi":
+    wsgi_app = "bug_tracker.asgi:application"
+    worker_class = "bug_tracker.workers.UvicornWorker"
+    # Views block in threads rather than in processes, so one process per core is enough
+    workers = config("WEB_CONCURRENCY", cast=int, default=multiprocessing.cpu_count())
+elif SERVER_INTERFACE == "wsgi":
+    wsgi_app = "bug_tracker.wsgi:application"
+    worker_class = "sync"
+    workers = config("WEB_CONCURRENCY", cast=int, default=multiprocessing.cpu_count() * 2 + 1)
+else:
+    raise ValueError(f"SERVER_INTERFACE must be `asgi` or `wsgi`, not `{SERVER_INTERFACE}`")
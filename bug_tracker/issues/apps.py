@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class IssuesConfig(AppConfig):
@@ -7,3 +8,9 @@ class IssuesConfig(AppConfig):
 
     def ready(self) -> None:
         from issues import signals  # noqa
+
+        if settings.ISSUE_HISTORY_ASYNC:
+            from issues.audit import enable_buffered_history
+            from issues.models import Issue, IssueAttachment, IssueComment
+
+            enable_buffered_history([Issue, IssueComment, IssueAttachment])
@@ -0,0 +1,215 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Iterable, Iterator
+from uuid import uuid4
+
+from auditlog.cid import get_cid
+from auditlog.context import auditlog_disabled
+from auditlog.diff import model_instance_diff
+from auditlog.models import LogEntry
+from auditlog.receivers import check_disable
+from auditlog.registry import AuditlogModelRegistry, auditlog
+from auditlog.signals import pre_log
+from core.logger import get_main_logger
+from django.contrib.contenttypes.models import ContentType
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.encoding import smart_str
+from issues.services.command_history import HistoryEntryData, history_write_entries
+from issues.tasks import write_history_entries
+from kombu.exceptions import OperationalError
+
+_outbox: ContextVar[list[HistoryEntryData] | None] = ContextVar("history_outbox", default=None)
+_capturing: ContextVar[bool] = ContextVar("history_capturing", default=False)
+
+
+@contextmanager
+def history_outbox_scope() -> Iterator[None]:
+    """Collects entries committed within the `with` block (usually a single request) and flushes them at once"""
+    token = _outbox.set([])
+    try:
+        yield
+    finally:
+        entries = _outbox.get()
+        _outbox.reset(token)
+        flush_history_entries(entries)
+
+
+def _enqueue_committed_entries(entries: list[HistoryEntryData]) -> None:
+    outbox = _outbox.get()
+    if outbox is None:
+        flush_history_entries(entries)
+    else:
+        outbox.extend(entries)
+
+
+def flush_history_entries(entries: list[HistoryEntryData]) -> None:
+    """Hands the entries over to a Celery task, or writes them in-process if the broker is unreachable"""
+    if not entries:
+        return
+    try:
+        write_history_entries.delay(entries)
+    except OperationalError as e:
+        get_main_logger().warning(f"Failed to enqueue {len(entries)} history entries, writing them in-process: {e}")
+        history_write_entries(entries=entries)
+
+
+def _serialize_entry(entry: LogEntry) -> HistoryEntryData:
+    return {
+        "content_type_id": entry.content_type_id,
+        "object_pk": entry.object_pk,
+        "object_id": entry.object_id,
+        "object_repr": entry.object_repr,
+        "action": entry.action,
+        "changes": entry.changes,
+        "actor_id": entry.actor_id,
+        "remote_addr": entry.remote_addr,
+        "cid": entry.cid,
+        "additional_data": entry.additional_data,
+        "timestamp": entry.timestamp.isoformat(),
+        # Lets the task skip entries it has already written when a batch is delivered again
+        "capture_id": str(uuid4()),
+    }
+
+
+def _build_log_entry(
+    *,
+    sender: type[Model],
+    instance: Model,
+    action: int,
+    diff_old: Model | None,
+    diff_new: Model | None,
+    fields_to_check: Iterable[str] | None = None,
+) -> LogEntry | None:
+    token = _capturing.set(True)
+    try:
+        pre_log_results = pre_log.send(sender, instance=instance, action=action)
+    finally:
+        _capturing.reset(token)
+    if any(result is False for _receiver, result in pre_log_results):
+        return None
+
+    changes = model_instance_diff(diff_old, diff_new, fields_to_check=fields_to_check)
+    if not changes:
+        return None
+
+    entry = LogEntry(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_pk=smart_str(instance.pk),
+        object_id=instance.pk if isinstance(instance.pk, int) else None,
+        object_repr=smart_str(instance),
+        action=action,
+        changes=changes,
+        additional_data=instance.get_additional_data(),
+        cid=get_cid(),
+        # Stamped now rather than on write, so that history keeps the order in which changes were made
+        timestamp=timezone.now(),
+    )
+    # Lets auditlog's `set_actor` receiver fill in the actor and remote address, as it does when saving
+    pre_save.send(sender=LogEntry, instance=entry, raw=False, using=_get_log_db(), update_fields=None)
+    return entry
+
+
+def _get_log_db() -> str:
+    return router.db_for_write(LogEntry) or DEFAULT_DB_ALIAS
+
+
+def _capture_log_entry(**kwargs: Any) -> None:
+    entry = _build_log_entry(**kwargs)
+    if entry is not None:
+        # Django discards the callback if the surrounding transaction or savepoint is rolled back
+        transaction.on_commit(partial(_enqueue_committed_entries, [_serialize_entry(entry)]), using=_get_log_db())
+
+
+def log_bulk_update(*, model: type[Model], changes: Iterable[tuple[Model, Model]], fields: Iterable[str]) -> None:
+    """
+    Records update entries for `(old, new)` instance pairs written with `bulk_update`, which sends no signals.
+    The entries are inserted at once, or handed over to a Celery task on commit if history is buffered.
+    """
+    if auditlog_disabled.get() or not (auditlog.contains(model) or buffered_registry.contains(model)):
+        return
+
+    entries = []
+    for old, new in changes:
+        entry = _build_log_entry(
+            sender=model,
+            instance=new,
+            action=LogEntry.Action.UPDATE,
+            diff_old=old,
+            diff_new=new,
+            fields_to_check=fields,
+        )
+        if entry is not None:
+            entries.append(_serialize_entry(entry))
+    if not entries:
+        return
+
+    if buffered_registry.contains(model):
+        transaction.on_commit(partial(_enqueue_committed_entries, entries), using=_get_log_db())
+    else:
+        history_write_entries(entries=entries)
+
+
+@check_disable
+def capture_create(sender: type[Model], instance: Model, created: bool, **kwargs: Any) -> None:
+    if created:
+        _capture_log_entry(
+            sender=sender, instance=instance, action=LogEntry.Action.CREATE, diff_old=None, diff_new=instance
+        )
+
+
+@check_disable
+def capture_update(sender: type[Model], instance: Model, **kwargs: Any) -> None:
+    if not instance._state.adding:
+        _capture_log_entry(
+            sender=sender,
+            instance=instance,
+            action=LogEntry.Action.UPDATE,
+            diff_old=sender.objects.filter(pk=instance.pk).first(),
+            diff_new=instance,
+            fields_to_check=kwargs.get("update_fields"),
+        )
+
+
+@check_disable
+def capture_delete(sender: type[Model], instance: Model, **kwargs: Any) -> None:
+    if instance.pk is not None:
+        _capture_log_entry(
+            sender=sender, instance=instance, action=LogEntry.Action.DELETE, diff_old=instance, diff_new=None
+        )
+
+
+buffered_registry = AuditlogModelRegistry(
+    create=False,
+    update=False,
+    delete=False,
+    access=False,
+    m2m=False,
+    custom={post_save: capture_create, pre_save: capture_update, post_delete: capture_delete},
+)
+
+
+@receiver(pre_log)
+def skip_buffered_log_entry(sender: type[Model], **kwargs: Any) -> bool | None:
+    """Stops auditlog's own receivers from writing entries which the buffered receivers capture instead"""
+    if buffered_registry.contains(sender) and not _capturing.get():
+        return False
+    return None
+
+
+def enable_buffered_history(models: Iterable[type[Model]]) -> None:
+    """
+    Buffers log entries of the given (already registered) models until commit and writes them from a Celery task.
+    Field options stay registered with auditlog, whose own entries of these models are skipped through `pre_log`.
+    """
+    for model in models:
+        buffered_registry.register(model)
+
+
+def disable_buffered_history(models: Iterable[type[Model]]) -> None:
+    for model in models:
+        buffered_registry.unregister(model)
@@ -0,0 +1,83 @@
+import time
+
+from core.conditional import Version, get_token_version
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from issues.models import Issue
+from projects.membership_cache import get_user_project_ids
+
+
+def _get_token_key(project_id: int) -> str:
+    return f"issues:changes:{project_id}"
+
+
+def _get_issue_project_key(issue_id: int) -> str:
+    return f"issues:project:{issue_id}"
+
+
+def _bump_token(project_id: int) -> None:
+    key = _get_token_key(project_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_project_change_token(*, project_id: int) -> int:
+    """Returns a token which changes whenever an issue, comment or attachment in the project does"""
+    key = _get_token_key(project_id)
+    token = cache.get(key)
+    if token is None:
+        # Seeding with a timestamp guarantees that an evicted token never repeats a value handed out before
+        cache.add(key, time.time_ns(), timeout=None)
+        token = cache.get(key)
+    return token
+
+
+def bump_project_change_token(*, project_id: int) -> None:
+    """
+    Bumps the project's token now and once again after commit, so that
+    versions read by concurrent readers before the transaction committed are discarded too.
+    """
+    _bump_token(project_id)
+    transaction.on_commit(lambda: _bump_token(project_id))
+
+
+def _get_issue_project_id(issue_id: int) -> int | None:
+    key = _get_issue_project_key(issue_id)
+    project_id = cache.get(key)
+    if project_id is None:
+        project_id = Issue.objects.filter(id=issue_id).values_list("project_id", flat=True).first()
+        if project_id is not None:
+            # Issues never move between projects
+            cache.set(key, project_id, timeout=settings.ISSUE_PROJECT_CACHE_TIMEOUT)
+    return project_id
+
+
+def _is_cache_shared() -> bool:
+    # Processes which never see the bumps of the others would keep answering 304 for changed lists
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def project_changes_get_version(*, project_id: int, user: AbstractBaseUser, variant: str = "") -> Version | None:
+    """
+    Returns the version of the project's issues, comments and attachments, without querying the database.
+    `None` if the user is not a member of the project, or if the cache is not shared by all processes.
+    """
+    if not _is_cache_shared():
+        return None
+    if project_id not in get_user_project_ids(user_id=user.pk):
+        return None
+    return get_token_version(token=f"{project_id}:{get_project_change_token(project_id=project_id)}", variant=variant)
+
+
+def issue_changes_get_version(*, issue_id: int, user: AbstractBaseUser, variant: str = "") -> Version | None:
+    """Returns the version of the project the issue belongs to, see `project_changes_get_version`"""
+    project_id = _get_issue_project_id(issue_id)
+    if project_id is None:
+        return None
+    return project_changes_get_version(project_id=project_id, user=user, variant=variant)
@@ -0,0 +1,29 @@
+from enum import Enum
+from typing import Any
+
+from core.events import publish_event
+
+
+class ProjectEvent(str, Enum):
+    ISSUE_CREATED = "issue.created"
+    ISSUE_UPDATED = "issue.updated"
+    ISSUE_ASSIGNED = "issue.assigned"
+    ISSUE_REMOVED = "issue.removed"
+    COMMENT_CREATED = "comment.created"
+    COMMENT_UPDATED = "comment.updated"
+    COMMENT_REMOVED = "comment.removed"
+    ATTACHMENT_CREATED = "attachment.created"
+    ATTACHMENT_THUMBNAIL_CREATED = "attachment.thumbnail_created"
+    ATTACHMENT_REMOVED = "attachment.removed"
+
+
+def get_project_channel(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+def publish_project_event(event: ProjectEvent, *, project_id: int, **data: Any) -> None:
+    """
+    Publishes a change within the project to its event stream, after commit.
+    Events carry ids only, clients fetch the changed resources themselves.
+    """
+    publish_event(event.value, channel=get_project_channel(project_id), project_id=project_id, **data)
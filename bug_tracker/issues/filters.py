@@ -1,7 +1,10 @@
 from auditlog.models import LogEntry
 from core.filters import BaseOrdering
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import QuerySet
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Greatest
 from django.utils.functional import classproperty
 from django_filters import rest_framework as filters
 from issues.models import HistoryEntrySubject, Issue, IssueAttachment, IssueComment
@@ -26,12 +29,27 @@ class IssueHistoryOrdering(BaseOrdering):
 class IssueFilter(filters.FilterSet):
     order_by = filters.OrderingFilter(fields=IssueOrdering.base_fields)
     unassigned = filters.BooleanFilter(method="filter_unassigned")
+    search = filters.CharFilter(method="filter_search")
 
     def filter_unassigned(self, queryset: QuerySet[Issue], _name: str, value: bool | None) -> QuerySet[Issue]:
         if value:
             return queryset.filter(assigned_to__isnull=True)
         return queryset
 
+    def filter_search(self, queryset: QuerySet[Issue], _name: str, value: str | None) -> QuerySet[Issue]:
+        """
+        Matches the value within title or description. On PostgreSQL the lookups use trigram indexes
+        and, unless `order_by` is given, results are ranked by word similarity, title matches first.
+        """
+        if not value:
+            return queryset
+        queryset = queryset.filter(Q(title__icontains=value) | Q(description__icontains=value))
+        if connections[queryset.db].vendor != "postgresql" or self.form.cleaned_data.get("order_by"):
+            return queryset
+
+        rank = Greatest(TrigramWordSimilarity(value, "title"), TrigramWordSimilarity(value, "description") * 0.5)
+        return queryset.annotate(search_rank=rank).order_by("-search_rank", "pk")
+
     class Meta:
         model = Issue
         fields = {
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandParser
+from issues.services.command_history import history_backfill_entries
+
+
+class Command(BaseCommand):
+    help = "Link existing audit log entries to their issues"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of log entries processed at once")
+
+    def handle(self, *args, batch_size: int, **kwargs) -> None:
+        created = history_backfill_entries(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Linked {created} history entries"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandParser
+from issues.services.command_attachment import attachment_upload_delete_unconfirmed
+
+
+class Command(BaseCommand):
+    help = "Delete files uploaded directly to the storage, whose upload was never confirmed"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of files checked at once")
+
+    def handle(self, *args, batch_size: int, **kwargs) -> None:
+        deleted = attachment_upload_delete_unconfirmed(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} unconfirmed uploads"))
@@ -0,0 +1,79 @@
+import re
+from itertools import product
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections
+from django.db.models import Count
+from django_filters import BooleanFilter, Filter
+from issues.filters import IssueFilter, IssueOrdering
+from issues.models import Issue
+
+SEQUENTIAL_SCAN_PATTERNS = {
+    "postgresql": r'Seq Scan on "?{table}"?',
+    "sqlite": r"\bSCAN {table}\b(?! USING)",
+}
+
+
+def _get_sample_value(filter_: Filter, issue: Issue) -> Any:
+    if isinstance(filter_, BooleanFilter):
+        return True
+    if filter_.method is None and filter_.lookup_expr == "exact":
+        return getattr(issue, Issue._meta.get_field(filter_.field_name).attname)
+    return issue.title.split()[0]
+
+
+def _get_combinations(issue: Issue) -> Iterator[dict[str, Any]]:
+    """Yields filter data for no filter and every single filter of `IssueFilter`, each in every ordering"""
+    filters = [{}] + [
+        {name: _get_sample_value(filter_, issue)}
+        for name, filter_ in IssueFilter.base_filters.items()
+        if name != "order_by"
+    ]
+    orderings = [value for value, _label in IssueOrdering.fields]
+    for data, ordering in product(filters, orderings):
+        yield {**data, "order_by": ordering}
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN for every filter and ordering of the issue list and report sequential scans"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--project", type=int, help="Project to run the queries for, defaults to the largest one")
+        parser.add_argument("--limit", type=int, default=10, help="Page size used in the queries")
+        parser.add_argument("--fail", action="store_true", help="Exit with an error if any query scans sequentially")
+
+    def handle(self, *args, project: int | None, limit: int, fail: bool, **kwargs) -> None:
+        if project is None:
+            # Plans for a small project are not representative, the planner scans small tables anyway
+            project = (
+                Issue.objects.values("project_id")
+                .annotate(issue_count=Count("id"))
+                .order_by("-issue_count")
+                .values_list("project_id", flat=True)
+                .first()
+            )
+        issue = Issue.objects.filter(project_id=project).first()
+        if issue is None:
+            raise CommandError("No issues to run the queries for")
+
+        connection = connections[Issue.objects.db]
+        pattern = SEQUENTIAL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Sequential scans cannot be detected on {connection.vendor}")
+        sequential_scan = re.compile(pattern.format(table=Issue._meta.db_table))
+
+        seq_scans = 0
+        for data in _get_combinations(issue):
+            queryset = IssueFilter(data, queryset=Issue.objects.filter(project_id=project)).qs
+            plan = queryset[:limit].explain()
+            description = " ".join(f"{key}={value}" for key, value in data.items())
+            if sequential_scan.search(plan):
+                seq_scans += 1
+                self.stdout.write(self.style.WARNING(f"Sequential scan: {description}"))
+            elif kwargs["verbosity"] > 1:
+                self.stdout.write(f"Index scan: {description}")
+
+        if seq_scans and fail:
+            raise CommandError(f"{seq_scans} queries scan the issues table sequentially")
+        self.stdout.write(self.style.SUCCESS(f"Explained issue list queries, {seq_scans} sequential scans"))
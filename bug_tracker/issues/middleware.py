@@ -0,0 +1,15 @@
+from typing import Callable
+
+from django.http import HttpRequest, HttpResponse
+from issues.audit import history_outbox_scope
+
+
+class HistoryOutboxMiddleware:
+    """Middleware to write the issue history entries of a single HTTP request in one batch."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with history_outbox_scope():
+            return self.get_response(request)
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auditlog", "0015_alter_logentry_changes"),
+        ("issues", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueHistoryEntry",
+            fields=[
+                (
+                    "log_entry",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="issue_history_entry",
+                        serialize=False,
+                        to="auditlog.logentry",
+                    ),
+                ),
+                ("issue_id", models.BigIntegerField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "Issue history entry",
+                "verbose_name_plural": "Issue history entries",
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0003_issue_trigram_indexes"),
+        ("projects", "0003_alter_projectroleassignment_options"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(fields=["project", "created_at"], name="issue_project_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(fields=["project", "status", "created_at"], name="issue_project_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(fields=["project", "priority", "created_at"], name="issue_project_priority_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(fields=["project", "type", "created_at"], name="issue_project_type_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(fields=["project", "title"], name="issue_project_title_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:25
+
+import django.db.models.deletion
+import issues.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0004_issue_list_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttachmentBlob",
+            fields=[
+                ("digest", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("file", models.FileField(upload_to=issues.models.get_blob_upload_path)),
+                ("size", models.PositiveBigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Attachment blob",
+                "verbose_name_plural": "Attachment blobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="issueattachment",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="attachments",
+                to="issues.attachmentblob",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:41
+
+import issues.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0005_attachmentblob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issueattachment",
+            name="thumbnail",
+            field=models.FileField(blank=True, upload_to=issues.models.get_thumbnail_upload_path),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0006_issueattachment_thumbnail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issuehistoryentry",
+            name="capture_id",
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+    ]
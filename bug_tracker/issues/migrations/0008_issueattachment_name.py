@@ -0,0 +1,29 @@
+from pathlib import PurePosixPath
+
+from django.db import migrations, models
+
+
+def set_names(apps, schema_editor):
+    IssueAttachment = apps.get_model("issues", "IssueAttachment")
+    attachments = list(IssueAttachment.objects.only("file"))
+    for attachment in attachments:
+        # Names of content-addressed attachments are lost, their files are named after the digest
+        attachment.name = PurePosixPath(attachment.file.name).name
+    IssueAttachment.objects.bulk_update(attachments, ["name"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0007_issuehistoryentry_capture_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issueattachment",
+            name="name",
+            field=models.CharField(default="", max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_names, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,15 @@
+from pathlib import PurePosixPath
+
+from auditlog.models import LogEntry
 from auditlog.registry import auditlog
 from core.models import BaseModel
+from core.storage import get_signed_url, serves_signed_urls
+from core.utils import get_file_extension
 from core.validators import validate_file_size, validate_file_type
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 
@@ -16,6 +22,16 @@ def get_attachment_upload_path(instance: "IssueAttachment", filename: str) -> st
     return f"{settings.ATTACHMENTS_BASE_PATH}/{parent_path}/{filename}"
 
 
+def get_thumbnail_upload_path(instance: "IssueAttachment", filename: str) -> str:
+    # Stored next to the attachment's file
+    return str(PurePosixPath(instance.file.name).with_name(filename))
+
+
+def get_blob_upload_path(instance: "AttachmentBlob", filename: str) -> str:
+    extension = get_file_extension(filename)
+    return f"{settings.ATTACHMENTS_BASE_PATH}/blobs/{instance.digest[:2]}/{instance.digest}.{extension}"
+
+
 class Issue(BaseModel):
     class Status(models.IntegerChoices):
         OPEN = 1, _("open")
@@ -47,10 +63,22 @@ class Issue(BaseModel):
     class Meta:
         verbose_name = _("Issue")
         verbose_name_plural = _("Issues")
+        # One index per `IssueOrdering` field within a project; the `status`, `priority` and `type` ones
+        # also serve equality filters on these fields ordered by `created_at`
+        indexes = [
+            models.Index(fields=["project", "created_at"], name="issue_project_created_idx"),
+            models.Index(fields=["project", "status", "created_at"], name="issue_project_status_idx"),
+            models.Index(fields=["project", "priority", "created_at"], name="issue_project_priority_idx"),
+            models.Index(fields=["project", "type", "created_at"], name="issue_project_type_idx"),
+            models.Index(fields=["project", "title"], name="issue_project_title_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
+    def get_additional_data(self) -> dict[str, int]:
+        return {"issue_id": self.id}
+
 
 class IssueComment(BaseModel):
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="comments")
@@ -65,6 +93,25 @@ class IssueComment(BaseModel):
     def __str__(self) -> str:
         return self.text[:100]
 
+    def get_additional_data(self) -> dict[str, int]:
+        return {"issue_id": self.issue_id}
+
+
+class AttachmentBlob(models.Model):
+    """File content stored once under its SHA-256 digest and shared by every attachment with the same content"""
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(upload_to=get_blob_upload_path)
+    size = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Attachment blob")
+        verbose_name_plural = _("Attachment blobs")
+
+    def __str__(self) -> str:
+        return self.digest
+
 
 class IssueAttachment(BaseModel):
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="attachments")
@@ -74,7 +121,14 @@ class IssueAttachment(BaseModel):
     uploaded_by = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="issue_attachments")
 
     file = models.FileField(upload_to=get_attachment_upload_path, validators=[validate_file_type, validate_file_size])
+    # Name of the uploaded file, which `file` is not stored under in content-addressed mode
+    name = models.CharField(max_length=255)
     extension = models.CharField(max_length=255)
+    thumbnail = models.FileField(upload_to=get_thumbnail_upload_path, blank=True)
+    # Set in content-addressed mode, where `file` points to the blob's file
+    blob = models.ForeignKey(
+        AttachmentBlob, on_delete=models.PROTECT, related_name="attachments", null=True, blank=True
+    )
 
     class Meta:
         verbose_name = _("Issue attachment")
@@ -82,10 +136,43 @@ class IssueAttachment(BaseModel):
 
     @property
     def url(self) -> str:
-        return self.file.url
+        if serves_signed_urls(self.file.storage):
+            return get_signed_url(self.file, filename=self.name)
+        # Files are not public, the download view checks access first
+        return reverse("attachment-download", kwargs={"issue_id": self.issue_id, "attachment_id": self.pk})
+
+    @property
+    def thumbnail_url(self) -> str | None:
+        if not self.thumbnail:
+            return None
+        if serves_signed_urls(self.thumbnail.storage):
+            return self.thumbnail.url
+        return reverse("attachment-thumbnail", kwargs={"issue_id": self.issue_id, "attachment_id": self.pk})
+
+    def __str__(self) -> str:
+        return self.name
+
+    def get_additional_data(self) -> dict[str, int]:
+        return {"issue_id": self.issue_id}
+
+
+class IssueHistoryEntry(models.Model):
+    """Links audit log entries to the issue they belong to through an indexed column"""
+
+    log_entry = models.OneToOneField(
+        LogEntry, on_delete=models.CASCADE, primary_key=True, related_name="issue_history_entry"
+    )
+    # Not a foreign key: entries logging an issue's deletion are written after the issue row is gone
+    issue_id = models.BigIntegerField(db_index=True)
+    # Set for entries written by a Celery task, which may be delivered more than once
+    capture_id = models.UUIDField(unique=True, null=True, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = _("Issue history entry")
+        verbose_name_plural = _("Issue history entries")
 
     def __str__(self) -> str:
-        return self.file.name
+        return f"{self.issue_id}: {self.log_entry_id}"
 
 
 class HistoryEntrySubject:
@@ -102,4 +189,4 @@ class HistoryEntrySubject:
 
 auditlog.register(Issue, include_fields=["title", "description", "status", "priority", "type", "assigned_to"])
 auditlog.register(IssueComment, include_fields=["text"])
-auditlog.register(IssueAttachment, include_fields=["file", "extension"])
+auditlog.register(IssueAttachment, include_fields=["file", "name", "extension"])
@@ -1,17 +1,17 @@
 from django.contrib.auth.base_user import AbstractBaseUser
 from issues.models import Issue, IssueComment
 from projects.models import Project, ProjectRole
-from projects.services.query_project import project_get_user_role, project_has_user_roles
+from projects.role_resolver import resolve_user_role
 
 CREATE_ISSUE_ALLOWED_ROLES = [ProjectRole.MANAGER, ProjectRole.DEVELOPER, ProjectRole.REPORTER]
 
 
 def can_create_issue(*, project: Project, user: AbstractBaseUser) -> bool:
-    return project_has_user_roles(project=project, user=user, roles=CREATE_ISSUE_ALLOWED_ROLES)
+    return resolve_user_role(project_id=project.id, user=user) in CREATE_ISSUE_ALLOWED_ROLES
 
 
 def can_assign_issue(*, project: Project, user: AbstractBaseUser, assign_to: AbstractBaseUser) -> bool:
-    user_role = project_get_user_role(project=project, user=user)
+    user_role = resolve_user_role(project_id=project.id, user=user)
 
     if user_role == ProjectRole.REPORTER:
         return False
@@ -23,22 +23,22 @@ def can_assign_issue(*, project: Project, user: AbstractBaseUser, assign_to: Abs
 
 
 def can_remove_issue(*, issue: Issue, user: AbstractBaseUser) -> bool:
-    user_role = project_get_user_role(project=issue.project, user=user)
+    user_role = resolve_user_role(project_id=issue.project_id, user=user)
 
     if user_role == ProjectRole.REPORTER:
         return False
     elif user_role == ProjectRole.DEVELOPER:
-        return issue.created_by == user
+        return issue.created_by_id == user.pk
     elif user_role == ProjectRole.MANAGER:
         return True
     return False
 
 
 def can_edit_issue(*, issue: Issue, user: AbstractBaseUser) -> bool:
-    user_role = project_get_user_role(project=issue.project, user=user)
+    user_role = resolve_user_role(project_id=issue.project_id, user=user)
 
     if user_role in [ProjectRole.REPORTER, ProjectRole.DEVELOPER]:
-        return issue.created_by == user
+        return issue.created_by_id == user.pk
     elif user_role == ProjectRole.MANAGER:
         return True
     return False
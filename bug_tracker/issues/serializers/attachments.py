@@ -1,13 +1,30 @@
+from core.serializers import AbsoluteURLField
 from rest_framework import serializers
 
 
 class AttachmentListSerializer(serializers.Serializer):
     id = serializers.IntegerField()
-    url = serializers.CharField()
+    url = AbsoluteURLField()
+    thumbnail_url = AbsoluteURLField(allow_null=True)
     created_at = serializers.DateTimeField()
 
 
 class AttachmentDetailSerializer(serializers.Serializer):
     id = serializers.IntegerField()
-    url = serializers.CharField()
+    url = AbsoluteURLField()
     created_at = serializers.DateTimeField()
+
+
+class AttachmentUploadStartSerializer(serializers.Serializer):
+    file_name = serializers.CharField(max_length=200)
+
+
+class AttachmentUploadSerializer(serializers.Serializer):
+    url = serializers.URLField()
+    fields = serializers.DictField(child=serializers.CharField())
+    token = serializers.CharField()
+    expires_in = serializers.IntegerField()
+
+
+class AttachmentUploadConfirmSerializer(serializers.Serializer):
+    token = serializers.CharField()
@@ -1,7 +1,11 @@
+from django.utils.translation import gettext_lazy as _
 from issues.models import Issue
 from issues.serializers.shared import IssueParticipantSerializer
+from issues.services.command_issue import BulkResult
 from rest_framework import serializers
 
+BULK_MAX_ITEMS = 500
+
 
 class IssueListSerializer(serializers.Serializer):
     id = serializers.IntegerField()
@@ -45,3 +49,46 @@ class IssueUpdateSerializer(serializers.Serializer):
 
 class IssueAssignSerializer(serializers.Serializer):
     assigned_to_id = serializers.IntegerField(allow_null=True)
+
+
+def _validate_unique_ids(items: list[dict]) -> list[dict]:
+    ids = [item["id"] for item in items]
+    if len(ids) != len(set(ids)):
+        raise serializers.ValidationError(_("Each issue may appear only once."))
+    return items
+
+
+class IssueBulkUpdateItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Issue.Status.choices, required=False)
+    priority = serializers.ChoiceField(choices=Issue.Priority.choices, required=False)
+    issue_type = serializers.ChoiceField(choices=Issue.Type.choices, required=False)
+
+
+class IssueBulkUpdateSerializer(serializers.Serializer):
+    items = IssueBulkUpdateItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+    def validate_items(self, items: list[dict]) -> list[dict]:
+        return _validate_unique_ids(items)
+
+
+class IssueBulkAssignItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    assigned_to_id = serializers.IntegerField(allow_null=True)
+
+
+class IssueBulkAssignSerializer(serializers.Serializer):
+    items = IssueBulkAssignItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+    def validate_items(self, items: list[dict]) -> list[dict]:
+        return _validate_unique_ids(items)
+
+
+class IssueBulkResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    result = serializers.ChoiceField(choices=BulkResult.choices)
+    errors = serializers.DictField(child=serializers.ListField(child=serializers.CharField()), allow_null=True)
+
+
+class IssueBulkResponseSerializer(serializers.Serializer):
+    results = IssueBulkResultSerializer(many=True)
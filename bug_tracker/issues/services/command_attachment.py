@@ -1,29 +1,131 @@
-from typing import Protocol
+import hashlib
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+from itertools import islice
+from pathlib import PurePosixPath
+from typing import Any, Protocol
 
+from core.storage import generate_presigned_upload, list_files, read_file_head
+from core.thumbnails import supports_thumbnail
 from core.utils import get_file_extension
+from core.validators import MIME_TYPE_SNIFF_SIZE, default_extension_validator, get_mime_type
+from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
-from django.db import transaction
-from issues.models import Issue, IssueAttachment, IssueComment
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.files import File as DjangoFile
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from issues.change_token import bump_project_change_token
+from issues.events import ProjectEvent, publish_project_event
+from issues.models import AttachmentBlob, Issue, IssueAttachment, IssueComment
 from issues.permissions import can_edit_comment, can_edit_issue
-from issues.services.exceptions import CommentActionNotPermitted, IssueActionNotPermitted
+from issues.services.exceptions import (
+    AttachmentNotUploaded,
+    AttachmentUploadInvalid,
+    CommentActionNotPermitted,
+    IssueActionNotPermitted,
+)
+from issues.tasks import generate_attachment_thumbnail
+
+UPLOAD_TOKEN_SALT = "issues.attachment-upload"
+# Counted from the start of the upload, so that large files have time to finish uploading
+UPLOAD_TOKEN_MAX_AGE = timedelta(hours=1)
+# Files uploaded directly are stored in a random directory, see `_start_upload`
+UPLOAD_NAME_PATTERN = re.compile(r"/[0-9a-f]{32}/[^/]+$")
 
 
 class File(Protocol):
     name: str
 
 
+@dataclass
+class PresignedUpload:
+    url: str
+    fields: dict[str, Any]
+    token: str
+    expires_in: int
+
+
+def _get_digest(file: DjangoFile) -> str:
+    # Uploads parsed by `AttachmentUploadHandler` are hashed while they stream
+    digest = getattr(file, "sha256", None)
+    if digest is None:
+        file_hash = hashlib.sha256()
+        file.seek(0)
+        for chunk in file.chunks():
+            file_hash.update(chunk)
+        digest = file_hash.hexdigest()
+    return digest
+
+
+def _get_or_create_blob(*, file: DjangoFile) -> AttachmentBlob:
+    """Returns the blob with the file's content, storing the content if it is not stored yet"""
+    digest = _get_digest(file)
+    # The lock keeps a concurrent `attachment_blob_release` from deleting the blob before it is referenced
+    blob = AttachmentBlob.objects.select_for_update().filter(digest=digest).first()
+    if blob is not None:
+        return blob
+
+    blob = AttachmentBlob(digest=digest, size=file.size)
+    storage = blob.file.storage
+    name = blob.file.field.generate_filename(blob, file.name)
+    is_stored = storage.exists(name)
+    blob.file.name = name if is_stored else storage.save(name, file)
+    try:
+        with transaction.atomic():
+            blob.save(force_insert=True)
+    except IntegrityError:
+        # Stored concurrently by another upload
+        stored_blob = AttachmentBlob.objects.select_for_update().get(digest=digest)
+        if not is_stored and blob.file.name != stored_blob.file.name:
+            storage.delete(blob.file.name)
+        return stored_blob
+    return blob
+
+
+def _schedule_thumbnail(attachment: IssueAttachment) -> None:
+    if supports_thumbnail(attachment.extension):
+        transaction.on_commit(partial(generate_attachment_thumbnail.delay, attachment_id=attachment.id))
+
+
+def _publish_attachment_event(event: ProjectEvent, *, attachment: IssueAttachment, attachment_id: int) -> None:
+    publish_project_event(
+        event,
+        project_id=attachment.issue.project_id,
+        issue_id=attachment.issue_id,
+        comment_id=attachment.comment_id,
+        attachment_id=attachment_id,
+    )
+
+
 def _create_attachment(
     *, file: File, uploaded_by: AbstractBaseUser, issue: Issue, comment: IssueComment | None
 ) -> IssueAttachment:
     extension = get_file_extension(file.name)
     attachment = IssueAttachment(
         file=file,
+        name=PurePosixPath(file.name).name,
         extension=extension,
         issue=issue,
         comment=comment,
         uploaded_by=uploaded_by,
     )
-    attachment.validate_and_save()
+    if settings.ATTACHMENTS_CONTENT_ADDRESSED:
+        attachment.full_clean()
+        attachment.blob = _get_or_create_blob(file=file)
+        attachment.file = attachment.blob.file.name
+        attachment.save()
+    else:
+        attachment.validate_and_save()
+
+    bump_project_change_token(project_id=issue.project_id)
+    _schedule_thumbnail(attachment)
+    _publish_attachment_event(ProjectEvent.ATTACHMENT_CREATED, attachment=attachment, attachment_id=attachment.id)
     return attachment
 
 
@@ -45,6 +147,132 @@ def attachment_add_to_comment(*, uploaded_by: AbstractBaseUser, comment: IssueCo
     return new_attachment
 
 
+def _start_upload(
+    *, file_name: str, uploaded_by: AbstractBaseUser, issue: Issue, comment: IssueComment | None
+) -> PresignedUpload:
+    default_extension_validator(DjangoFile(None, name=file_name))
+
+    field = IssueAttachment._meta.get_field("file")
+    # A random directory keeps the original file name, which the presigned upload must not overwrite
+    name = field.generate_filename(IssueAttachment(issue=issue, comment=comment), f"{uuid.uuid4().hex}/{file_name}")
+    expires_in = settings.ATTACHMENTS_UPLOAD_EXPIRE
+    presigned = generate_presigned_upload(
+        field.storage, name, max_size=settings.ATTACHMENTS_MAX_SIZE, expires_in=expires_in
+    )
+    token = signing.dumps(
+        {"name": name, "issue": issue.pk, "comment": comment.pk if comment else None, "user": uploaded_by.pk},
+        salt=UPLOAD_TOKEN_SALT,
+    )
+    return PresignedUpload(url=presigned["url"], fields=presigned["fields"], token=token, expires_in=expires_in)
+
+
+def _confirm_upload(
+    *, token: str, uploaded_by: AbstractBaseUser, issue: Issue, comment: IssueComment | None
+) -> IssueAttachment:
+    try:
+        data = signing.loads(token, salt=UPLOAD_TOKEN_SALT, max_age=UPLOAD_TOKEN_MAX_AGE)
+    except signing.BadSignature as e:
+        raise AttachmentUploadInvalid from e
+    if (data["issue"], data["comment"], data["user"]) != (issue.pk, comment.pk if comment else None, uploaded_by.pk):
+        raise AttachmentUploadInvalid
+
+    name = data["name"]
+    storage = IssueAttachment._meta.get_field("file").storage
+    # Concurrent confirms of the same token wait for each other here, so that the token is used once only
+    Issue.objects.select_for_update().only("pk").get(pk=issue.pk)
+    if IssueAttachment.objects.filter(file=name).exists():
+        raise AttachmentUploadInvalid
+    if not storage.exists(name):
+        raise AttachmentNotUploaded
+
+    attachment = IssueAttachment(
+        file=name,
+        name=PurePosixPath(name).name,
+        extension=get_file_extension(name),
+        issue=issue,
+        comment=comment,
+        uploaded_by=uploaded_by,
+    )
+    # Validating the type would otherwise download the whole file from the storage
+    attachment.file.mime_type = get_mime_type(read_file_head(storage, name, MIME_TYPE_SNIFF_SIZE))
+    try:
+        attachment.validate_and_save()
+    except ValidationError:
+        storage.delete(name)
+        raise
+
+    bump_project_change_token(project_id=issue.project_id)
+    _schedule_thumbnail(attachment)
+    _publish_attachment_event(ProjectEvent.ATTACHMENT_CREATED, attachment=attachment, attachment_id=attachment.id)
+    return attachment
+
+
+def attachment_upload_delete_unconfirmed(*, batch_size: int = 1000) -> int:
+    """
+    Deletes the files uploaded directly to the storage, whose upload was never confirmed and can no longer be,
+    as their token expired. Returns the number of deleted files.
+    """
+    storage = IssueAttachment._meta.get_field("file").storage
+    # A token is valid for `UPLOAD_TOKEN_MAX_AGE` from the start of the upload, which precedes the file's storing
+    names = (
+        name
+        for name in list_files(
+            storage, settings.ATTACHMENTS_BASE_PATH, modified_before=timezone.now() - UPLOAD_TOKEN_MAX_AGE
+        )
+        if UPLOAD_NAME_PATTERN.search(name)
+    )
+    deleted = 0
+    while batch := list(islice(names, batch_size)):
+        # Thumbnails are stored next to the attachment's file
+        references = IssueAttachment.objects.filter(Q(file__in=batch) | Q(thumbnail__in=batch))
+        referenced = {name for pair in references.values_list("file", "thumbnail") for name in pair}
+        for name in batch:
+            if name not in referenced:
+                storage.delete(name)
+                deleted += 1
+    return deleted
+
+
+def attachment_upload_start_for_issue(
+    *, file_name: str, uploaded_by: AbstractBaseUser, issue: Issue
+) -> PresignedUpload:
+    """Returns a presigned upload, with which the client uploads the file directly to the storage"""
+    if not can_edit_issue(issue=issue, user=uploaded_by):
+        raise IssueActionNotPermitted(IssueActionNotPermitted.EDIT)
+
+    return _start_upload(file_name=file_name, uploaded_by=uploaded_by, issue=issue, comment=None)
+
+
+def attachment_upload_start_for_comment(
+    *, file_name: str, uploaded_by: AbstractBaseUser, comment: IssueComment
+) -> PresignedUpload:
+    """Returns a presigned upload, with which the client uploads the file directly to the storage"""
+    if not can_edit_comment(comment=comment, user=uploaded_by):
+        raise CommentActionNotPermitted(CommentActionNotPermitted.EDIT)
+
+    return _start_upload(file_name=file_name, uploaded_by=uploaded_by, issue=comment.issue, comment=comment)
+
+
+@transaction.atomic
+def attachment_upload_confirm_for_issue(*, token: str, uploaded_by: AbstractBaseUser, issue: Issue) -> IssueAttachment:
+    """Creates the attachment for a file uploaded with `attachment_upload_start_for_issue`"""
+    if not can_edit_issue(issue=issue, user=uploaded_by):
+        raise IssueActionNotPermitted(IssueActionNotPermitted.EDIT)
+
+    return _confirm_upload(token=token, uploaded_by=uploaded_by, issue=issue, comment=None)
+
+
+@transaction.atomic
+def attachment_upload_confirm_for_comment(
+    *, token: str, uploaded_by: AbstractBaseUser, comment: IssueComment
+) -> IssueAttachment:
+    """Creates the attachment for a file uploaded with `attachment_upload_start_for_comment`"""
+    if not can_edit_comment(comment=comment, user=uploaded_by):
+        raise CommentActionNotPermitted(CommentActionNotPermitted.EDIT)
+
+    return _confirm_upload(token=token, uploaded_by=uploaded_by, issue=comment.issue, comment=comment)
+
+
 @transaction.atomic
 def attachment_remove(*, attachment: IssueAttachment, requestor: AbstractBaseUser) -> None:
     if attachment.comment is not None and not can_edit_comment(comment=attachment.comment, user=requestor):
@@ -52,4 +280,29 @@ def attachment_remove(*, attachment: IssueAttachment, requestor: AbstractBaseUse
     elif attachment.comment is None and not can_edit_issue(issue=attachment.issue, user=requestor):
         raise IssueActionNotPermitted(IssueActionNotPermitted.EDIT)
 
+    attachment_id = attachment.id
     attachment.delete()
+    bump_project_change_token(project_id=attachment.issue.project_id)
+    _publish_attachment_event(ProjectEvent.ATTACHMENT_REMOVED, attachment=attachment, attachment_id=attachment_id)
+
+
+@transaction.atomic
+def _delete_blob_file(*, digest: str, name: str) -> None:
+    # An upload of the same content may have stored the blob again meanwhile, under the same name
+    if AttachmentBlob.objects.select_for_update().filter(digest=digest).exists():
+        return
+    storage = AttachmentBlob._meta.get_field("file").storage
+    if storage.exists(name):
+        storage.delete(name)
+
+
+@transaction.atomic
+def attachment_blob_release(*, digest: str) -> None:
+    """Deletes the blob and its file once no attachment references it"""
+    blob = AttachmentBlob.objects.select_for_update().filter(digest=digest).first()
+    if blob is None or blob.attachments.exists():
+        return
+
+    blob.delete()
+    # A rolled back transaction brings the blob back, so its file is deleted only once the deletion commits
+    transaction.on_commit(partial(_delete_blob_file, digest=digest, name=blob.file.name))
@@ -1,6 +1,8 @@
 import nh3
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db import transaction
+from issues.change_token import bump_project_change_token
+from issues.events import ProjectEvent, publish_project_event
 from issues.models import Issue, IssueComment
 from issues.permissions import can_edit_comment, can_remove_comment
 from issues.services.exceptions import CommentActionNotPermitted
@@ -13,6 +15,7 @@ def _create_comment(*, issue: Issue, author: AbstractBaseUser, text: str) -> Iss
         text=text,
     )
     comment.validate_and_save()
+    bump_project_change_token(project_id=issue.project_id)
     return comment
 
 
@@ -20,12 +23,16 @@ def _update_comment(*, comment: IssueComment, text: str | None = None) -> IssueC
     if text is not None:
         comment.text = text
     comment.validate_and_save()
+    bump_project_change_token(project_id=comment.issue.project_id)
     return comment
 
 
 @transaction.atomic
 def comment_create(*, issue: Issue, author: AbstractBaseUser, text: str) -> IssueComment:
     new_comment = _create_comment(issue=issue, author=author, text=nh3.clean(text))
+    publish_project_event(
+        ProjectEvent.COMMENT_CREATED, project_id=issue.project_id, issue_id=issue.id, comment_id=new_comment.id
+    )
     return new_comment
 
 
@@ -34,7 +41,15 @@ def comment_remove(*, comment: IssueComment, editor: AbstractBaseUser) -> None:
     if not can_remove_comment(comment=comment, user=editor):
         raise CommentActionNotPermitted(CommentActionNotPermitted.REMOVE)
 
+    comment_id = comment.id
     comment.delete()
+    bump_project_change_token(project_id=comment.issue.project_id)
+    publish_project_event(
+        ProjectEvent.COMMENT_REMOVED,
+        project_id=comment.issue.project_id,
+        issue_id=comment.issue_id,
+        comment_id=comment_id,
+    )
 
 
 @transaction.atomic
@@ -43,4 +58,10 @@ def comment_update(*, comment: IssueComment, text: str, editor: AbstractBaseUser
         raise CommentActionNotPermitted(CommentActionNotPermitted.EDIT)
 
     _update_comment(comment=comment, text=text)
+    publish_project_event(
+        ProjectEvent.COMMENT_UPDATED,
+        project_id=comment.issue.project_id,
+        issue_id=comment.issue_id,
+        comment_id=comment.id,
+    )
     return comment
@@ -1,8 +1,69 @@
+from typing import Any, Sequence
+from uuid import UUID
+
 from auditlog.models import LogEntry
 from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from issues.models import IssueHistoryEntry
+
+HistoryEntryData = dict[str, Any]
+
+
+def history_link_entry_to_issue(*, log_entry: LogEntry) -> None:
+    """Indexes the entry by the `issue_id` which the logged model put in `additional_data`"""
+    IssueHistoryEntry.objects.create(log_entry=log_entry, issue_id=log_entry.additional_data["issue_id"])
+
+
+def history_backfill_entries(*, batch_size: int = 1000) -> int:
+    """
+    Creates missing `IssueHistoryEntry` rows for log entries that carry `issue_id` in `additional_data`.
+    Walks the log in primary key order, one batch at a time, and returns the number of rows created.
+    """
+    created = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            LogEntry.objects.filter(
+                pk__gt=last_pk, issue_history_entry__isnull=True, additional_data__has_key="issue_id"
+            )
+            .order_by("pk")
+            .values_list("pk", "additional_data")[:batch_size]
+        )
+        if not batch:
+            return created
+
+        last_pk = batch[-1][0]
+        IssueHistoryEntry.objects.bulk_create(
+            [IssueHistoryEntry(log_entry_id=pk, issue_id=additional_data["issue_id"]) for pk, additional_data in batch],
+            ignore_conflicts=True,
+        )
+        created += len(batch)
+
+
+def _to_log_entry(entry: HistoryEntryData) -> LogEntry:
+    data = {**entry, "timestamp": parse_datetime(entry["timestamp"])}
+    del data["capture_id"]
+    return LogEntry(**data)
 
 
 @transaction.atomic
-def history_add_issue_id_to_entry(*, log_entry: LogEntry, issue_id: int) -> None:
-    log_entry.additional_data = {"issue_id": issue_id}
-    log_entry.save()
+def history_write_entries(*, entries: Sequence[HistoryEntryData]) -> list[LogEntry]:
+    """
+    Writes log entries captured by `issues.audit` and links them to their issues.
+    Entries whose `capture_id` has already been written are skipped, so that a redelivered batch is written once.
+    """
+    capture_ids = [UUID(entry["capture_id"]) for entry in entries]
+    written = set(IssueHistoryEntry.objects.filter(capture_id__in=capture_ids).values_list("capture_id", flat=True))
+    pending = [(capture_id, entry) for capture_id, entry in zip(capture_ids, entries) if capture_id not in written]
+
+    log_entries = LogEntry.objects.bulk_create([_to_log_entry(entry) for _capture_id, entry in pending])
+    # A concurrent delivery of the same batch fails on the unique `capture_id`, rolling back its log entries too
+    IssueHistoryEntry.objects.bulk_create(
+        [
+            IssueHistoryEntry(
+                log_entry=log_entry, issue_id=log_entry.additional_data["issue_id"], capture_id=capture_id
+            )
+            for log_entry, (capture_id, _entry) in zip(log_entries, pending)
+        ]
+    )
+    return log_entries
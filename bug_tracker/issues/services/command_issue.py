@@ -1,22 +1,51 @@
+from copy import copy
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Sequence
+
 import nh3
+from core.exceptions import ApplicationException
 from django.contrib.auth.base_user import AbstractBaseUser
-from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from issues.audit import log_bulk_update
+from issues.change_token import bump_project_change_token
+from issues.events import ProjectEvent, publish_project_event
 from issues.models import Issue
 from issues.permissions import can_assign_issue, can_create_issue, can_edit_issue, can_remove_issue
-from issues.services.emails import send_issue_assignment_notification_email
 from issues.services.exceptions import (
     AssigneeDoesNotExistWithinProject,
     IssueActionNotPermitted,
     IssueAlreadyAssignedToGivenAssignee,
 )
+from issues.tasks import send_issue_assignment_notification
 from projects.models import Project, ProjectRoleAssignment
 from projects.services.query_member import member_get
 
+BULK_UPDATE_FIELDS = {"status": "status", "priority": "priority", "issue_type": "type"}
+
 
 class EmptyAssignment:
     user = None
 
 
+class BulkResult(models.TextChoices):
+    UPDATED = "updated", _("updated")
+    UNCHANGED = "unchanged", _("unchanged")
+    NOT_FOUND = "not_found", _("not found")
+    FORBIDDEN = "forbidden", _("forbidden")
+    INVALID = "invalid", _("invalid")
+
+
+@dataclass
+class IssueBulkResult:
+    id: int
+    result: BulkResult
+    errors: dict[str, list[str]] | None = None
+
+
 def _get_empty_assignment() -> EmptyAssignment:
     return EmptyAssignment()
 
@@ -55,6 +84,7 @@ def _create_issue(
         type=issue_type,
     )
     issue.validate_and_save()
+    bump_project_change_token(project_id=project.id)
     return issue
 
 
@@ -78,15 +108,22 @@ def _update_issue(
     if issue_type is not None:
         issue.type = issue_type
     issue.validate_and_save()
+    bump_project_change_token(project_id=issue.project_id)
     return issue
 
 
 def _assign_to_issue(*, issue: Issue, assignee: AbstractBaseUser | None) -> Issue:
     issue.assigned_to = assignee
     issue.validate_and_save()
+    bump_project_change_token(project_id=issue.project_id)
     return issue
 
 
+def _notify_assignee(*, issue: Issue, assignee: AbstractBaseUser) -> None:
+    # Rendered and sent by a worker, and only if the transaction commits
+    transaction.on_commit(partial(send_issue_assignment_notification.delay, issue_id=issue.id, assignee_id=assignee.pk))
+
+
 @transaction.atomic
 def issue_create(
     *,
@@ -112,7 +149,8 @@ def issue_create(
         issue_type=issue_type,
     )
     if assigned_to is not None:
-        send_issue_assignment_notification_email(email=assigned_to.email, issue_title=title, issue_id=new_issue.id)
+        _notify_assignee(issue=new_issue, assignee=assigned_to)
+    publish_project_event(ProjectEvent.ISSUE_CREATED, project_id=project.id, issue_id=new_issue.id)
     return new_issue
 
 
@@ -121,7 +159,10 @@ def issue_remove(*, issue: Issue, editor: AbstractBaseUser) -> None:
     if not can_remove_issue(issue=issue, user=editor):
         raise IssueActionNotPermitted(IssueActionNotPermitted.REMOVE)
 
+    issue_id = issue.id
     issue.delete()
+    bump_project_change_token(project_id=issue.project_id)
+    publish_project_event(ProjectEvent.ISSUE_REMOVED, project_id=issue.project_id, issue_id=issue_id)
 
 
 @transaction.atomic
@@ -141,6 +182,7 @@ def issue_update(
     _update_issue(
         issue=issue, title=title, description=description, status=status, priority=priority, issue_type=issue_type
     )
+    publish_project_event(ProjectEvent.ISSUE_UPDATED, project_id=issue.project_id, issue_id=issue.id)
     return issue
 
 
@@ -153,6 +195,126 @@ def issue_assign(*, issue: Issue, editor: AbstractBaseUser, assigned_to_id: int
     _assign_to_issue(issue=issue, assignee=assigned_to)
 
     if assigned_to is not None:
-        send_issue_assignment_notification_email(email=assigned_to.email, issue_title=issue.title, issue_id=issue.id)
+        _notify_assignee(issue=issue, assignee=assigned_to)
 
+    publish_project_event(
+        ProjectEvent.ISSUE_ASSIGNED, project_id=issue.project_id, issue_id=issue.id, assigned_to_id=assigned_to_id
+    )
     return issue
+
+
+def _get_issues_by_id(*, project: Project, ids: Sequence[int]) -> dict[int, Issue]:
+    return Issue.objects.filter(project=project, id__in=ids).in_bulk()
+
+
+def _bulk_save_issues(*, changes: list[tuple[Issue, Issue]], fields: list[str]) -> None:
+    """Writes the new side of `(old, new)` pairs in one query and records their history in bulk"""
+    if not changes:
+        return
+
+    now = timezone.now()
+    issues = [new for _old, new in changes]
+    for issue in issues:
+        issue.updated_at = now
+    Issue.objects.bulk_update(issues, [*fields, "updated_at"])
+    log_bulk_update(model=Issue, changes=changes, fields=fields)
+    bump_project_change_token(project_id=issues[0].project_id)
+
+
+@transaction.atomic
+def issue_bulk_update(
+    *, project: Project, editor: AbstractBaseUser, items: Sequence[dict[str, Any]]
+) -> list[IssueBulkResult]:
+    """
+    Applies per-issue `status`, `priority` and `issue_type` changes. Items are validated in memory,
+    and the ones that pass are written with a single `bulk_update`. Item ids have to be unique.
+    """
+    issues = _get_issues_by_id(project=project, ids=[item["id"] for item in items])
+    results = []
+    changes = []
+    for item in items:
+        issue = issues.get(item["id"])
+        if issue is None:
+            results.append(IssueBulkResult(id=item["id"], result=BulkResult.NOT_FOUND))
+            continue
+        # The editor's role is resolved once and memoized, so this does not query per issue
+        if not can_edit_issue(issue=issue, user=editor):
+            results.append(IssueBulkResult(id=issue.id, result=BulkResult.FORBIDDEN))
+            continue
+
+        old_issue = copy(issue)
+        for key, field in BULK_UPDATE_FIELDS.items():
+            if key in item:
+                setattr(issue, field, item[key])
+        changed_fields = [
+            field for field in BULK_UPDATE_FIELDS.values() if getattr(issue, field) != getattr(old_issue, field)
+        ]
+        if not changed_fields:
+            results.append(IssueBulkResult(id=issue.id, result=BulkResult.UNCHANGED))
+            continue
+
+        try:
+            issue.clean_fields(exclude=[f.name for f in Issue._meta.fields if f.name not in changed_fields])
+        except ValidationError as e:
+            results.append(IssueBulkResult(id=issue.id, result=BulkResult.INVALID, errors=e.message_dict))
+            continue
+
+        changes.append((old_issue, issue))
+        results.append(IssueBulkResult(id=issue.id, result=BulkResult.UPDATED))
+
+    _bulk_save_issues(changes=changes, fields=list(BULK_UPDATE_FIELDS.values()))
+    for _old_issue, issue in changes:
+        publish_project_event(ProjectEvent.ISSUE_UPDATED, project_id=project.id, issue_id=issue.id)
+    return results
+
+
+@transaction.atomic
+def issue_bulk_assign(
+    *, project: Project, editor: AbstractBaseUser, items: Sequence[dict[str, Any]]
+) -> list[IssueBulkResult]:
+    """
+    Assigns each issue to its `assigned_to_id` (or unassigns it for `None`). Each distinct assignee is validated once,
+    and the issues are written with a single `bulk_update`. Item ids have to be unique.
+    """
+    issues = _get_issues_by_id(project=project, ids=[item["id"] for item in items])
+    assignees: dict[int | None, AbstractBaseUser | None | ApplicationException] = {}
+    results = []
+    changes = []
+    for item in items:
+        issue = issues.get(item["id"])
+        if issue is None:
+            results.append(IssueBulkResult(id=item["id"], result=BulkResult.NOT_FOUND))
+            continue
+
+        assignee_id = item["assigned_to_id"]
+        if assignee_id not in assignees:
+            try:
+                assignees[assignee_id] = _get_and_validate_assignee(
+                    assignee_id=assignee_id, project=project, requestor=editor
+                ).user
+            except (AssigneeDoesNotExistWithinProject, IssueActionNotPermitted) as e:
+                assignees[assignee_id] = e
+        assignee = assignees[assignee_id]
+
+        if isinstance(assignee, IssueActionNotPermitted):
+            results.append(IssueBulkResult(id=issue.id, result=BulkResult.FORBIDDEN))
+        elif isinstance(assignee, AssigneeDoesNotExistWithinProject):
+            results.append(
+                IssueBulkResult(id=issue.id, result=BulkResult.INVALID, errors={"assigned_to_id": [assignee.message]})
+            )
+        elif issue.assigned_to_id == assignee_id:
+            results.append(IssueBulkResult(id=issue.id, result=BulkResult.UNCHANGED))
+        else:
+            old_issue = copy(issue)
+            issue.assigned_to = assignee
+            changes.append((old_issue, issue))
+            results.append(IssueBulkResult(id=issue.id, result=BulkResult.UPDATED))
+
+    _bulk_save_issues(changes=changes, fields=["assigned_to"])
+    for _old_issue, issue in changes:
+        if issue.assigned_to is not None:
+            _notify_assignee(issue=issue, assignee=issue.assigned_to)
+        publish_project_event(
+            ProjectEvent.ISSUE_ASSIGNED, project_id=project.id, issue_id=issue.id, assigned_to_id=issue.assigned_to_id
+        )
+    return results
@@ -3,20 +3,31 @@ from django.conf import settings
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.translation import gettext as _
+from issues.models import Issue
 
 
-def send_issue_assignment_notification_email(*, email: str, issue_title: str, issue_id: int) -> None:
-    issue_url = f"{resolve_front_url(FrontendUrlType.ISSUES)}/{issue_id}"
+def send_issue_assignment_notification_email(*, issue_id: int, assignee_id: int) -> None:
+    """Notifies the assignee, unless the issue has been removed or reassigned in the meantime"""
+    issue = (
+        Issue.objects.select_related("assigned_to")
+        .only("title", "assigned_to__email")
+        .filter(id=issue_id, assigned_to_id=assignee_id)
+        .first()
+    )
+    if issue is None:
+        return
+
+    issue_url = f"{resolve_front_url(FrontendUrlType.ISSUES)}/{issue.id}"
     context = {
-        "issue_title": issue_title,
+        "issue_title": issue.title,
         "site_domain": settings.FRONT_DOMAIN,
         "issue_url": issue_url,
     }
     message = render_to_string("issues/email/assignment_notification.txt", context=context)
 
     send_mail(
-        subject=_('You have been assigned a new issue "%(issue_title)s"') % {"issue_title": issue_title},
+        subject=_('You have been assigned a new issue "%(issue_title)s"') % {"issue_title": issue.title},
         message=message,
         from_email=None,
-        recipient_list=[email],
+        recipient_list=[issue.assigned_to.email],
     )
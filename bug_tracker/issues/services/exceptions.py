@@ -33,3 +33,11 @@ class CommentActionNotPermitted(ModelActionNotPermitted):
 
     EDIT = _("edit")
     REMOVE = _("remove")
+
+
+class AttachmentUploadInvalid(ApplicationException):
+    message = _("Upload token is invalid or has expired.")
+
+
+class AttachmentNotUploaded(ApplicationException):
+    message = _("The file has not been uploaded to the storage.")
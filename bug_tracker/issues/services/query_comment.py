@@ -1,18 +1,36 @@
 from typing import Any
 
+from core.conditional import Version, queryset_get_version
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db.models import QuerySet
 from issues.filters import IssueCommentFilter
 from issues.models import IssueComment
+from issues.services.shared import participant_fields
+from projects.membership_cache import get_user_project_ids
 
 
 def comment_list(
     *, issue_id: int, user: AbstractBaseUser, filters: dict[str, Any] | None = None
 ) -> QuerySet[IssueComment]:
-    comments = IssueComment.objects.filter(issue_id=issue_id, issue__project__members=user)
+    comments = (
+        IssueComment.objects.filter(issue_id=issue_id, issue__project_id__in=get_user_project_ids(user_id=user.pk))
+        .select_related("author")
+        .only("id", "issue_id", "text", "created_at", *participant_fields("author"))
+    )
     return IssueCommentFilter(filters, queryset=comments).qs
 
 
 def comment_get(*, comment_id: int, issue_id: int, user: AbstractBaseUser) -> IssueComment | None:
-    comment = IssueComment.objects.filter(id=comment_id, issue_id=issue_id, issue__project__members=user).first()
+    comment = IssueComment.objects.filter(
+        id=comment_id, issue_id=issue_id, issue__project_id__in=get_user_project_ids(user_id=user.pk)
+    ).first()
     return comment
+
+
+def comment_get_version(
+    *, comment_id: int, issue_id: int, user: AbstractBaseUser, for_update: bool = False
+) -> Version | None:
+    comments = IssueComment.objects.filter(
+        id=comment_id, issue_id=issue_id, issue__project_id__in=get_user_project_ids(user_id=user.pk)
+    )
+    return queryset_get_version(comments, for_update=for_update)
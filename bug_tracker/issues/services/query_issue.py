@@ -1,16 +1,30 @@
 from typing import Any
 
+from core.conditional import Version, queryset_get_version
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db.models import QuerySet
 from issues.filters import IssueFilter
 from issues.models import Issue
+from issues.services.shared import participant_fields
+from projects.membership_cache import get_user_project_ids
+
+LIST_FIELDS = ("id", "project_id", "title", "status", "priority", "type", "created_at")
 
 
 def issue_list(*, project_id: int, user: AbstractBaseUser, filters: dict[str, Any] | None = None) -> QuerySet[Issue]:
-    issues = Issue.objects.filter(project_id=project_id, project__members=user)
+    issues = (
+        Issue.objects.filter(project_id=project_id, project_id__in=get_user_project_ids(user_id=user.pk))
+        .select_related("created_by", "assigned_to")
+        .only(*LIST_FIELDS, *participant_fields("created_by", "assigned_to"))
+    )
     return IssueFilter(filters, queryset=issues).qs
 
 
 def issue_get(*, issue_id: int, user: AbstractBaseUser) -> Issue | None:
-    issue = Issue.objects.filter(id=issue_id, project__members=user).first()
+    issue = Issue.objects.filter(id=issue_id, project_id__in=get_user_project_ids(user_id=user.pk)).first()
     return issue
+
+
+def issue_get_version(*, issue_id: int, user: AbstractBaseUser, for_update: bool = False) -> Version | None:
+    issues = Issue.objects.filter(id=issue_id, project_id__in=get_user_project_ids(user_id=user.pk))
+    return queryset_get_version(issues, for_update=for_update)
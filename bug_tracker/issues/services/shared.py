@@ -0,0 +1,6 @@
+PARTICIPANT_FIELDS = ("id", "email", "first_name", "last_name")
+
+
+def participant_fields(*relations: str) -> list[str]:
+    """Lists the user columns rendered by `IssueParticipantSerializer`, for use with `QuerySet.only`"""
+    return [*relations] + [f"{relation}__{field}" for relation in relations for field in PARTICIPANT_FIELDS]
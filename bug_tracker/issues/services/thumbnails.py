@@ -0,0 +1,34 @@
+from pathlib import PurePosixPath
+
+from core.thumbnails import THUMBNAIL_EXTENSION, build_thumbnail
+from django.conf import settings
+from issues.change_token import bump_project_change_token
+from issues.events import ProjectEvent, publish_project_event
+from issues.models import IssueAttachment
+
+
+def attachment_generate_thumbnail(*, attachment_id: int) -> None:
+    """Stores a thumbnail next to the attachment's file, skipping attachments deleted in the meantime"""
+    attachment = IssueAttachment.objects.filter(pk=attachment_id, thumbnail="").first()
+    if attachment is None:
+        return
+
+    with attachment.file.open("rb") as file:
+        thumbnail = build_thumbnail(file, extension=attachment.extension, size=settings.ATTACHMENTS_THUMBNAIL_SIZE)
+    if thumbnail is None:
+        return
+
+    name = f"{PurePosixPath(attachment.file.name).stem}.thumbnail.{THUMBNAIL_EXTENSION}"
+    attachment.thumbnail.save(name, thumbnail, save=False)
+    # Updated directly, so that neither the history nor other fields changed meanwhile are affected
+    if not IssueAttachment.objects.filter(pk=attachment_id).update(thumbnail=attachment.thumbnail.name):
+        attachment.thumbnail.storage.delete(attachment.thumbnail.name)
+        return
+    bump_project_change_token(project_id=attachment.issue.project_id)
+    publish_project_event(
+        ProjectEvent.ATTACHMENT_THUMBNAIL_CREATED,
+        project_id=attachment.issue.project_id,
+        issue_id=attachment.issue_id,
+        comment_id=attachment.comment_id,
+        attachment_id=attachment.id,
+    )
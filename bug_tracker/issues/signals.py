@@ -5,32 +5,28 @@ from auditlog.signals import post_log
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from issues.models import Issue, IssueAttachment, IssueComment
-from issues.services.command_history import history_add_issue_id_to_entry
+from issues.services.command_attachment import attachment_blob_release
+from issues.services.command_history import history_link_entry_to_issue
 
 
 @receiver(post_delete, sender=IssueAttachment)
 def delete_issue_attachment_file(*_args: Any, instance: IssueAttachment, **_kwargs: Any) -> None:
-    if instance.file and instance.file.storage.exists(instance.file.name):
-        instance.file.delete(save=False)
+    if instance.thumbnail:
+        instance.thumbnail.storage.delete(instance.thumbnail.name)
 
+    if instance.blob_id is not None:
+        # The file is shared with other attachments of the same content
+        attachment_blob_release(digest=instance.blob_id)
+        return
 
-@receiver(post_log, sender=Issue)
-def handle_issue_change_log(*_args: Any, instance: Issue, log_entry: LogEntry | None, **_kwargs: Any) -> None:
-    if log_entry is not None:
-        history_add_issue_id_to_entry(log_entry=log_entry, issue_id=instance.id)
+    # Deleting through the storage keeps `instance.file.name`, which audit receivers use to describe the instance
+    if instance.file and instance.file.storage.exists(instance.file.name):
+        instance.file.storage.delete(instance.file.name)
 
 
+@receiver(post_log, sender=Issue)
 @receiver(post_log, sender=IssueComment)
-def handle_issue_comment_change_log(
-    *_args: Any, instance: IssueComment, log_entry: LogEntry | None, **_kwargs: Any
-) -> None:
-    if log_entry is not None:
-        history_add_issue_id_to_entry(log_entry=log_entry, issue_id=instance.issue_id)
-
-
 @receiver(post_log, sender=IssueAttachment)
-def handle_issue_attachment_change_log(
-    *_args: Any, instance: IssueAttachment, log_entry: LogEntry | None, **_kwargs: Any
-) -> None:
+def handle_issue_history_log(*_args: Any, log_entry: LogEntry | None, **_kwargs: Any) -> None:
     if log_entry is not None:
-        history_add_issue_id_to_entry(log_entry=log_entry, issue_id=instance.issue_id)
+        history_link_entry_to_issue(log_entry=log_entry)
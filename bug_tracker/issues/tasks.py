@@ -0,0 +1,23 @@
+from typing import Sequence
+
+from django.db import DatabaseError
+from issues.services.command_history import HistoryEntryData, history_write_entries
+from issues.services.emails import send_issue_assignment_notification_email
+from issues.services.thumbnails import attachment_generate_thumbnail
+
+from bug_tracker.celery import app
+
+
+@app.task(acks_late=True, reject_on_worker_lost=True, autoretry_for=(DatabaseError,), retry_backoff=True)
+def write_history_entries(entries: Sequence[HistoryEntryData]) -> None:
+    history_write_entries(entries=entries)
+
+
+@app.task
+def send_issue_assignment_notification(issue_id: int, assignee_id: int) -> None:
+    send_issue_assignment_notification_email(issue_id=issue_id, assignee_id=assignee_id)
+
+
+@app.task
+def generate_attachment_thumbnail(attachment_id: int) -> None:
+    attachment_generate_thumbnail(attachment_id=attachment_id)
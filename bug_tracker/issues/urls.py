@@ -1,8 +1,14 @@
 from django.urls import path
 from issues.views.attachment import (
     AttachmentDetailDeleteView,
+    AttachmentDownloadView,
+    AttachmentThumbnailView,
     CommentAttachmentListCreateView,
+    CommentAttachmentUploadConfirmView,
+    CommentAttachmentUploadView,
     IssueAttachmentListCreateView,
+    IssueAttachmentUploadConfirmView,
+    IssueAttachmentUploadView,
 )
 from issues.views.comment import CommentDetailUpdateDeleteView, CommentListCreateView
 from issues.views.history import HistoryListView
@@ -13,6 +19,12 @@ urlpatterns = [
     path("<int:issue_id>/assign/", IssueAssignView.as_view(), name="issue-assign"),
     path("<int:issue_id>/history/", HistoryListView.as_view(), name="issue-history"),
     path("<int:issue_id>/attachments/", IssueAttachmentListCreateView.as_view(), name="issue-attachment-list-create"),
+    path("<int:issue_id>/attachments/uploads/", IssueAttachmentUploadView.as_view(), name="issue-attachment-upload"),
+    path(
+        "<int:issue_id>/attachments/uploads/confirm/",
+        IssueAttachmentUploadConfirmView.as_view(),
+        name="issue-attachment-upload-confirm",
+    ),
     path("<int:issue_id>/comments/", CommentListCreateView.as_view(), name="comment-list-create"),
     path(
         "<int:issue_id>/comments/<int:comment_id>",
@@ -24,9 +36,29 @@ urlpatterns = [
         CommentAttachmentListCreateView.as_view(),
         name="comment-attachment-list-create",
     ),
+    path(
+        "<int:issue_id>/comments/<int:comment_id>/attachments/uploads/",
+        CommentAttachmentUploadView.as_view(),
+        name="comment-attachment-upload",
+    ),
+    path(
+        "<int:issue_id>/comments/<int:comment_id>/attachments/uploads/confirm/",
+        CommentAttachmentUploadConfirmView.as_view(),
+        name="comment-attachment-upload-confirm",
+    ),
     path(
         "<int:issue_id>/attachments/<int:attachment_id>",
         AttachmentDetailDeleteView.as_view(),
         name="attachment-detail-delete",
     ),
+    path(
+        "<int:issue_id>/attachments/<int:attachment_id>/download/",
+        AttachmentDownloadView.as_view(),
+        name="attachment-download",
+    ),
+    path(
+        "<int:issue_id>/attachments/<int:attachment_id>/thumbnail/",
+        AttachmentThumbnailView.as_view(),
+        name="attachment-thumbnail",
+    ),
 ]
@@ -1,25 +1,60 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from core.conditional import Version, conditional
+from core.downloads import file_download_response
+from core.exceptions import Unprocessable
 from core.pagination import LimitOffsetPagination, get_paginated_response
 from core.services import query_or_404
+from core.storage import DirectUploadNotSupported, serves_signed_urls
+from core.upload_handlers import AttachmentUploadHandler
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db.models import QuerySet
-from drf_spectacular.utils import extend_schema
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from issues.change_token import issue_changes_get_version
 from issues.models import IssueAttachment
-from issues.serializers.attachments import AttachmentDetailSerializer, AttachmentListSerializer
-from issues.services.command_attachment import attachment_add_to_comment, attachment_add_to_issue, attachment_remove
-from issues.services.exceptions import CommentActionNotPermitted, IssueActionNotPermitted
+from issues.serializers.attachments import (
+    AttachmentDetailSerializer,
+    AttachmentListSerializer,
+    AttachmentUploadConfirmSerializer,
+    AttachmentUploadSerializer,
+    AttachmentUploadStartSerializer,
+)
+from issues.services.command_attachment import (
+    attachment_add_to_comment,
+    attachment_add_to_issue,
+    attachment_remove,
+    attachment_upload_confirm_for_comment,
+    attachment_upload_confirm_for_issue,
+    attachment_upload_start_for_comment,
+    attachment_upload_start_for_issue,
+)
+from issues.services.exceptions import (
+    AttachmentNotUploaded,
+    AttachmentUploadInvalid,
+    CommentActionNotPermitted,
+    IssueActionNotPermitted,
+)
 from issues.services.query_attachment import attachment_get, attachment_list_for_comment, attachment_list_for_issue
 from issues.services.query_comment import comment_get
 from issues.services.query_issue import issue_get
 from rest_framework import serializers, status, views
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 
+def _get_attachment_list_version(*, request: Request, issue_id: int, for_update: bool, **kwargs: Any) -> Version | None:
+    if serves_signed_urls(IssueAttachment._meta.get_field("file").storage):
+        # Signed URLs expire, so the client has to fetch them again anyway
+        return None
+    return issue_changes_get_version(issue_id=issue_id, user=request.user, variant=request.get_full_path())
+
+
 class BaseAttachmentListView(ABC, views.APIView):
     class Pagination(LimitOffsetPagination):
         pass
@@ -30,6 +65,11 @@ class BaseAttachmentListView(ABC, views.APIView):
     pagination_class = Pagination
     parser_classes = (MultiPartParser, JSONParser)
 
+    def initialize_request(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Request:
+        # Handlers have to be replaced before the body is parsed
+        request.upload_handlers = [AttachmentUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     @abstractmethod
     def get_attachments(
         self, user: AbstractBaseUser, filters: dict[str, Any], **kwargs: Any
@@ -39,6 +79,7 @@ class BaseAttachmentListView(ABC, views.APIView):
         parameters=[FilterSerializer],
         responses=AttachmentListSerializer(many=True),
     )
+    @conditional(_get_attachment_list_version)
     def get(self, request: Request, **kwargs: Any) -> Response:
         filters_serializer = self.FilterSerializer(data=request.query_params)
         filters_serializer.is_valid(raise_exception=True)
@@ -78,7 +119,7 @@ class IssueAttachmentListCreateView(BaseAttachmentListView):
             file=request.FILES.get("file"), uploaded_by=self.request.user, issue=issue
         )
 
-        data = AttachmentDetailSerializer(new_attachment).data
+        data = AttachmentDetailSerializer(new_attachment, context={"request": request}).data
         return Response(data, status=status.HTTP_201_CREATED)
 
 
@@ -108,7 +149,91 @@ class CommentAttachmentListCreateView(BaseAttachmentListView):
             file=request.FILES.get("file"), uploaded_by=self.request.user, comment=comment
         )
 
-        data = AttachmentDetailSerializer(new_attachment).data
+        data = AttachmentDetailSerializer(new_attachment, context={"request": request}).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class IssueAttachmentUploadView(views.APIView):
+    @extend_schema(request=AttachmentUploadStartSerializer, responses=AttachmentUploadSerializer)
+    def post(self, request: Request, issue_id: int) -> Response:
+        serializer = AttachmentUploadStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        issue = query_or_404(issue_get, issue_id=issue_id, user=self.request.user)
+
+        try:
+            upload = attachment_upload_start_for_issue(
+                **serializer.validated_data, uploaded_by=self.request.user, issue=issue
+            )
+        except IssueActionNotPermitted as e:
+            raise PermissionDenied(str(e)) from e
+        except DirectUploadNotSupported as e:
+            raise Unprocessable(str(e)) from e
+
+        data = AttachmentUploadSerializer(upload).data
+        return Response(data)
+
+
+class IssueAttachmentUploadConfirmView(views.APIView):
+    @extend_schema(request=AttachmentUploadConfirmSerializer, responses={201: AttachmentDetailSerializer})
+    def post(self, request: Request, issue_id: int) -> Response:
+        serializer = AttachmentUploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        issue = query_or_404(issue_get, issue_id=issue_id, user=self.request.user)
+
+        try:
+            new_attachment = attachment_upload_confirm_for_issue(
+                **serializer.validated_data, uploaded_by=self.request.user, issue=issue
+            )
+        except IssueActionNotPermitted as e:
+            raise PermissionDenied(str(e)) from e
+        except (AttachmentUploadInvalid, AttachmentNotUploaded) as e:
+            raise Unprocessable(str(e)) from e
+
+        data = AttachmentDetailSerializer(new_attachment, context={"request": request}).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class CommentAttachmentUploadView(views.APIView):
+    @extend_schema(request=AttachmentUploadStartSerializer, responses=AttachmentUploadSerializer)
+    def post(self, request: Request, issue_id: int, comment_id: int) -> Response:
+        serializer = AttachmentUploadStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        comment = query_or_404(comment_get, comment_id=comment_id, issue_id=issue_id, user=self.request.user)
+
+        try:
+            upload = attachment_upload_start_for_comment(
+                **serializer.validated_data, uploaded_by=self.request.user, comment=comment
+            )
+        except CommentActionNotPermitted as e:
+            raise PermissionDenied(str(e)) from e
+        except DirectUploadNotSupported as e:
+            raise Unprocessable(str(e)) from e
+
+        data = AttachmentUploadSerializer(upload).data
+        return Response(data)
+
+
+class CommentAttachmentUploadConfirmView(views.APIView):
+    @extend_schema(request=AttachmentUploadConfirmSerializer, responses={201: AttachmentDetailSerializer})
+    def post(self, request: Request, issue_id: int, comment_id: int) -> Response:
+        serializer = AttachmentUploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        comment = query_or_404(comment_get, comment_id=comment_id, issue_id=issue_id, user=self.request.user)
+
+        try:
+            new_attachment = attachment_upload_confirm_for_comment(
+                **serializer.validated_data, uploaded_by=self.request.user, comment=comment
+            )
+        except CommentActionNotPermitted as e:
+            raise PermissionDenied(str(e)) from e
+        except (AttachmentUploadInvalid, AttachmentNotUploaded) as e:
+            raise Unprocessable(str(e)) from e
+
+        data = AttachmentDetailSerializer(new_attachment, context={"request": request}).data
         return Response(data, status=status.HTTP_201_CREATED)
 
 
@@ -119,7 +244,7 @@ class AttachmentDetailDeleteView(views.APIView):
             attachment_get, issue_id=issue_id, attachment_id=attachment_id, user=self.request.user
         )
 
-        data = AttachmentDetailSerializer(attachment).data
+        data = AttachmentDetailSerializer(attachment, context={"request": request}).data
         return Response(data)
 
     @extend_schema(responses={204: None})
@@ -134,3 +259,45 @@ class AttachmentDetailDeleteView(views.APIView):
             raise PermissionDenied(str(e)) from e
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AttachmentDownloadView(views.APIView):
+    def perform_content_negotiation(self, request: Request, force: bool = False) -> tuple:
+        # The file is served whatever the client accepts
+        return super().perform_content_negotiation(request, force=True)
+
+    @extend_schema(
+        responses={
+            (200, "application/octet-stream"): OpenApiTypes.BINARY,
+            302: OpenApiResponse(description="Redirect to a signed storage URL"),
+            304: OpenApiResponse(description="Not modified"),
+        }
+    )
+    def get(self, request: Request, issue_id: int, attachment_id: int) -> HttpResponseBase:
+        attachment = query_or_404(
+            attachment_get, issue_id=issue_id, attachment_id=attachment_id, user=self.request.user
+        )
+
+        return file_download_response(request, attachment.file, filename=attachment.name)
+
+
+class AttachmentThumbnailView(views.APIView):
+    def perform_content_negotiation(self, request: Request, force: bool = False) -> tuple:
+        # The thumbnail is served whatever the client accepts
+        return super().perform_content_negotiation(request, force=True)
+
+    @extend_schema(
+        responses={
+            (200, "image/jpeg"): OpenApiTypes.BINARY,
+            302: OpenApiResponse(description="Redirect to a signed storage URL"),
+            304: OpenApiResponse(description="Not modified"),
+        }
+    )
+    def get(self, request: Request, issue_id: int, attachment_id: int) -> HttpResponseBase:
+        attachment = query_or_404(
+            attachment_get, issue_id=issue_id, attachment_id=attachment_id, user=self.request.user
+        )
+        if not attachment.thumbnail:
+            raise NotFound
+
+        return file_download_response(request, attachment.thumbnail, as_attachment=False)
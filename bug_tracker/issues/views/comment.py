@@ -1,6 +1,8 @@
-from core.pagination import LimitOffsetPagination, get_paginated_response
+from core.conditional import Version, conditional
+from core.pagination import CursorPagination, LimitOffsetPagination, cursor_query_parameter, get_paginated_response
 from core.services import query_or_404
 from drf_spectacular.utils import extend_schema
+from issues.change_token import issue_changes_get_version
 from issues.serializers.comment import (
     CommentCreateSerializer,
     CommentDetailSerializer,
@@ -9,7 +11,7 @@ from issues.serializers.comment import (
 )
 from issues.services.command_comment import comment_create, comment_remove, comment_update
 from issues.services.exceptions import CommentActionNotPermitted
-from issues.services.query_comment import comment_get, comment_list
+from issues.services.query_comment import comment_get, comment_get_version, comment_list
 from issues.services.query_issue import issue_get
 from rest_framework import serializers, status, views
 from rest_framework.exceptions import PermissionDenied
@@ -17,6 +19,14 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 
+def _get_comment_list_version(*, request: Request, issue_id: int, for_update: bool) -> Version | None:
+    return issue_changes_get_version(issue_id=issue_id, user=request.user, variant=request.get_full_path())
+
+
+def _get_comment_version(*, request: Request, issue_id: int, comment_id: int, for_update: bool) -> Version | None:
+    return comment_get_version(comment_id=comment_id, issue_id=issue_id, user=request.user, for_update=for_update)
+
+
 class CommentListCreateView(views.APIView):
     class Pagination(LimitOffsetPagination):
         pass
@@ -27,9 +37,10 @@ class CommentListCreateView(views.APIView):
     pagination_class = Pagination
 
     @extend_schema(
-        parameters=[FilterSerializer],
+        parameters=[FilterSerializer, cursor_query_parameter],
         responses=CommentListSerializer(many=True),
     )
+    @conditional(_get_comment_list_version)
     def get(self, request: Request, issue_id: int) -> Response:
         filters_serializer = self.FilterSerializer(data=request.query_params)
         filters_serializer.is_valid(raise_exception=True)
@@ -42,6 +53,7 @@ class CommentListCreateView(views.APIView):
             queryset=comments,
             request=request,
             view=self,
+            cursor_pagination_class=CursorPagination,
         )
 
     @extend_schema(request=CommentCreateSerializer, responses={201: CommentDetailSerializer})
@@ -59,6 +71,7 @@ class CommentListCreateView(views.APIView):
 
 class CommentDetailUpdateDeleteView(views.APIView):
     @extend_schema(responses=CommentDetailSerializer)
+    @conditional(_get_comment_version)
     def get(self, request: Request, issue_id: int, comment_id: int) -> Response:
         comment = query_or_404(comment_get, issue_id=issue_id, comment_id=comment_id, user=self.request.user)
 
@@ -77,6 +90,7 @@ class CommentDetailUpdateDeleteView(views.APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(request=CommentUpdateSerializer, responses=CommentDetailSerializer)
+    @conditional(_get_comment_version)
     def put(self, request: Request, issue_id: int, comment_id: int) -> Response:
         serializer = CommentUpdateSerializer(data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -0,0 +1,61 @@
+from asgiref.sync import sync_to_async
+from core.events import stream_events
+from core.exceptions import NotSupported
+from core.services import query_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from issues.events import get_project_channel
+from projects.membership_cache import get_user_project_ids
+from projects.services.query_project import project_get
+from rest_framework import views
+from rest_framework.request import Request
+
+
+class ProjectEventStreamView(views.APIView):
+    def perform_content_negotiation(self, request: Request, force: bool = False) -> tuple:
+        # The stream is served whatever the client accepts
+        return super().perform_content_negotiation(request, force=True)
+
+    @extend_schema(
+        description=_(
+            "Server-sent events about issues, comments, assignments and attachments changed within the project. "
+            "Events carry the ids of the changed resources only. A stream the client reconnected to "
+            "(with `Last-Event-ID`) starts with a `stream.resync` event, after which the client should fetch "
+            "the resources it shows again, as events published while it was disconnected are not replayed."
+        ),
+        responses={(200, "text/event-stream"): OpenApiTypes.STR},
+    )
+    def get(self, request: Request, project_id: int) -> StreamingHttpResponse:
+        if not isinstance(request._request, ASGIRequest):
+            # A sync worker would be held for the whole lifetime of the stream
+            raise NotSupported(_("Event streams are served only by the ASGI application."))
+
+        project = query_or_404(project_get, project_id=project_id, user=request.user)
+        user_id = request.user.pk
+
+        @sync_to_async
+        def is_member() -> bool:
+            try:
+                return project.id in get_user_project_ids(user_id=user_id)
+            finally:
+                connection.close()
+
+        response = StreamingHttpResponse(
+            stream_events(
+                [get_project_channel(project.id)],
+                is_allowed=is_member,
+                last_event_id=request.headers.get("Last-Event-ID"),
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Lets nginx pass the events on as they come, instead of buffering them
+        response["X-Accel-Buffering"] = "no"
+        # Django releases the connection only once the stream ends, which would hold it (or a slot of the pool)
+        # for the whole lifetime of the stream
+        connection.close()
+        return response
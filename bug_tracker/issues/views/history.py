@@ -1,5 +1,11 @@
 from auditlog.models import LogEntry
-from core.pagination import LimitOffsetPagination, get_paginated_response
+from core.pagination import (
+    CountMode,
+    CursorPagination,
+    LimitOffsetPagination,
+    cursor_query_parameter,
+    get_paginated_response,
+)
 from core.serializers import CommaSeparatedMultipleChoiceField
 from drf_spectacular.utils import extend_schema
 from issues.filters import IssueHistoryOrdering
@@ -13,7 +19,7 @@ from rest_framework.response import Response
 
 class HistoryListView(views.APIView):
     class Pagination(LimitOffsetPagination):
-        pass
+        count_mode = CountMode.CACHED
 
     class FilterSerializer(serializers.Serializer):
         action = serializers.ChoiceField(choices=LogEntry.Action.choices, required=False)
@@ -24,7 +30,7 @@ class HistoryListView(views.APIView):
     pagination_class = Pagination
 
     @extend_schema(
-        parameters=[FilterSerializer],
+        parameters=[FilterSerializer, cursor_query_parameter],
         responses=HistoryEntryListSerializer(many=True),
     )
     def get(self, request: Request, issue_id: int) -> Response:
@@ -39,4 +45,5 @@ class HistoryListView(views.APIView):
             queryset=history,
             request=request,
             view=self,
+            cursor_pagination_class=CursorPagination,
         )
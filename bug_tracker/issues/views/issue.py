@@ -1,25 +1,45 @@
+from dataclasses import asdict
+
+from core.conditional import Version, conditional
 from core.exceptions import Conflict, Unprocessable
-from core.pagination import LimitOffsetPagination, get_paginated_response
+from core.pagination import (
+    CountMode,
+    CursorPagination,
+    LimitOffsetPagination,
+    cursor_query_parameter,
+    get_paginated_response,
+)
 from core.serializers import CommaSeparatedMultipleChoiceField
 from core.services import query_or_404
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema
+from issues.change_token import project_changes_get_version
 from issues.filters import IssueOrdering
 from issues.models import Issue
 from issues.serializers.issue import (
     IssueAssignSerializer,
+    IssueBulkAssignSerializer,
+    IssueBulkResponseSerializer,
+    IssueBulkUpdateSerializer,
     IssueCreateSerializer,
     IssueDetailSerializer,
     IssueListSerializer,
     IssueUpdateSerializer,
 )
-from issues.services.command_issue import issue_assign, issue_create, issue_remove, issue_update
+from issues.services.command_issue import (
+    issue_assign,
+    issue_bulk_assign,
+    issue_bulk_update,
+    issue_create,
+    issue_remove,
+    issue_update,
+)
 from issues.services.exceptions import (
     AssigneeDoesNotExistWithinProject,
     IssueActionNotPermitted,
     IssueAlreadyAssignedToGivenAssignee,
 )
-from issues.services.query_issue import issue_get, issue_list
+from issues.services.query_issue import issue_get, issue_get_version, issue_list
 from projects.services.query_project import project_get
 from rest_framework import serializers, status, views
 from rest_framework.exceptions import PermissionDenied
@@ -27,12 +47,27 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 
+def _get_issue_list_version(*, request: Request, project_id: int, for_update: bool) -> Version | None:
+    return project_changes_get_version(project_id=project_id, user=request.user, variant=request.get_full_path())
+
+
+def _get_issue_version(*, request: Request, issue_id: int, for_update: bool) -> Version | None:
+    return issue_get_version(issue_id=issue_id, user=request.user, for_update=for_update)
+
+
 class IssueListCreateView(views.APIView):
     class Pagination(LimitOffsetPagination):
-        pass
+        count_mode = CountMode.ESTIMATED
 
     class FilterSerializer(serializers.Serializer):
         title = serializers.CharField(required=False, help_text=_("Case-insensitive substring filter."))
+        search = serializers.CharField(
+            required=False,
+            help_text=_(
+                "Case-insensitive search in title and description. "
+                "Results are ordered by relevance unless `order_by` is given."
+            ),
+        )
         status = serializers.ChoiceField(choices=Issue.Status.choices, required=False)
         priority = serializers.ChoiceField(choices=Issue.Priority.choices, required=False)
         type = serializers.ChoiceField(choices=Issue.Type.choices, required=False)
@@ -46,9 +81,10 @@ class IssueListCreateView(views.APIView):
     pagination_class = Pagination
 
     @extend_schema(
-        parameters=[FilterSerializer],
+        parameters=[FilterSerializer, cursor_query_parameter],
         responses=IssueListSerializer(many=True),
     )
+    @conditional(_get_issue_list_version)
     def get(self, request: Request, project_id: int) -> Response:
         filters_serializer = self.FilterSerializer(data=request.query_params)
         filters_serializer.is_valid(raise_exception=True)
@@ -61,6 +97,7 @@ class IssueListCreateView(views.APIView):
             queryset=issues,
             request=request,
             view=self,
+            cursor_pagination_class=CursorPagination,
         )
 
     @extend_schema(request=IssueCreateSerializer, responses={201: IssueDetailSerializer})
@@ -83,6 +120,7 @@ class IssueListCreateView(views.APIView):
 
 class IssueDetailUpdateDeleteView(views.APIView):
     @extend_schema(responses=IssueDetailSerializer)
+    @conditional(_get_issue_version)
     def get(self, request: Request, issue_id: int) -> Response:
         issue = query_or_404(issue_get, issue_id=issue_id, user=self.request.user)
 
@@ -101,6 +139,7 @@ class IssueDetailUpdateDeleteView(views.APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(request=IssueUpdateSerializer, responses=IssueDetailSerializer)
+    @conditional(_get_issue_version)
     def put(self, request: Request, issue_id: int) -> Response:
         serializer = IssueUpdateSerializer(data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -118,6 +157,7 @@ class IssueDetailUpdateDeleteView(views.APIView):
 
 class IssueAssignView(views.APIView):
     @extend_schema(request=IssueAssignSerializer, responses=IssueDetailSerializer)
+    @conditional(_get_issue_version)
     def put(self, request: Request, issue_id: int) -> Response:
         serializer = IssueAssignSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -135,3 +175,31 @@ class IssueAssignView(views.APIView):
 
         data = IssueDetailSerializer(updated_issue).data
         return Response(data)
+
+
+class IssueBulkUpdateView(views.APIView):
+    @extend_schema(request=IssueBulkUpdateSerializer, responses=IssueBulkResponseSerializer)
+    def put(self, request: Request, project_id: int) -> Response:
+        serializer = IssueBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        project = query_or_404(project_get, project_id=project_id, user=self.request.user)
+
+        results = issue_bulk_update(project=project, editor=self.request.user, **serializer.validated_data)
+
+        data = IssueBulkResponseSerializer({"results": [asdict(result) for result in results]}).data
+        return Response(data)
+
+
+class IssueBulkAssignView(views.APIView):
+    @extend_schema(request=IssueBulkAssignSerializer, responses=IssueBulkResponseSerializer)
+    def put(self, request: Request, project_id: int) -> Response:
+        serializer = IssueBulkAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        project = query_or_404(project_get, project_id=project_id, user=self.request.user)
+
+        results = issue_bulk_assign(project=project, editor=self.request.user, **serializer.validated_data)
+
+        data = IssueBulkResponseSerializer({"results": [asdict(result) for result in results]}).data
+        return Response(data)
@@ -0,0 +1,74 @@
+import time
+
+from core.request_cache import request_cache_delete, request_cache_get, request_cache_set
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from projects.models import ProjectRoleAssignment
+
+Memberships = dict[int, str]
+
+
+def _get_version_key(user_id: int) -> str:
+    return f"projects:membership:version:{user_id}"
+
+
+def _get_memberships_key(user_id: int, version: int) -> str:
+    return f"projects:membership:{user_id}:{version}"
+
+
+def _get_request_cache_key(user_id: int) -> tuple[str, int]:
+    return "project_memberships", user_id
+
+
+def _get_version(user_id: int) -> int:
+    key = _get_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seeding with a timestamp guarantees that an evicted version key never resurrects stale entries
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(user_id: int) -> None:
+    key = _get_version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def _query_memberships(user_id: int) -> Memberships:
+    return dict(ProjectRoleAssignment.objects.filter(user_id=user_id).values_list("project_id", "role"))
+
+
+def get_user_memberships(*, user_id: int) -> Memberships:
+    """Returns a mapping of project id to the user's role, for every project the user belongs to"""
+    request_key = _get_request_cache_key(user_id)
+    memberships = request_cache_get(request_key)
+    if memberships is not None:
+        return memberships
+
+    key = _get_memberships_key(user_id, _get_version(user_id))
+    memberships = cache.get(key)
+    if memberships is None:
+        memberships = _query_memberships(user_id)
+        cache.set(key, memberships, timeout=settings.PROJECT_MEMBERSHIP_CACHE_TIMEOUT)
+
+    request_cache_set(request_key, memberships)
+    return memberships
+
+
+def get_user_project_ids(*, user_id: int) -> set[int]:
+    return set(get_user_memberships(user_id=user_id))
+
+
+def invalidate_user_memberships(*, user_id: int) -> None:
+    """
+    Bumps the user's membership version now and once again after commit, so that
+    entries cached by concurrent readers before the transaction committed are discarded too.
+    """
+    request_cache_delete(_get_request_cache_key(user_id))
+    _bump_version(user_id)
+    transaction.on_commit(lambda: _bump_version(user_id))
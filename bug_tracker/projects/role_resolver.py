@@ -0,0 +1,30 @@
+from core.request_cache import request_cache_delete, request_cache_get, request_cache_set
+from django.contrib.auth.base_user import AbstractBaseUser
+from projects.membership_cache import get_user_memberships, invalidate_user_memberships
+
+_NOT_CACHED = object()
+
+
+def _get_cache_key(project_id: int, user_id: int) -> tuple[str, int, int]:
+    return "project_role", project_id, user_id
+
+
+def resolve_user_role(*, project_id: int, user: AbstractBaseUser) -> str | None:
+    """Returns user's role in the project, memoized for the duration of the current request"""
+    key = _get_cache_key(project_id, user.pk)
+    role = request_cache_get(key, _NOT_CACHED)
+    if role is not _NOT_CACHED:
+        return role
+
+    role = get_user_memberships(user_id=user.pk).get(project_id)
+    request_cache_set(key, role)
+    return role
+
+
+def remember_user_role(*, project_id: int, user_id: int, role: str | None) -> None:
+    request_cache_set(_get_cache_key(project_id, user_id), role)
+
+
+def forget_user_role(*, project_id: int, user_id: int) -> None:
+    request_cache_delete(_get_cache_key(project_id, user_id))
+    invalidate_user_memberships(user_id=user_id)
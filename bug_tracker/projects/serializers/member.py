@@ -1,6 +1,13 @@
+import csv
+
+from django.core.files.uploadedfile import UploadedFile
+from django.utils.translation import gettext_lazy as _
 from projects.models import ProjectRole
+from projects.services.command_member import ImportResult
 from rest_framework import serializers
 
+MEMBER_IMPORT_MAX_ITEMS = 1000
+
 
 class MemberDetailSerializer(serializers.Serializer):
     user_id = serializers.IntegerField()
@@ -17,3 +24,41 @@ class MemberCreateSerializer(serializers.Serializer):
 
 class MemberUpdateSerializer(serializers.Serializer):
     new_role = serializers.ChoiceField(choices=ProjectRole.choices)
+
+
+class MemberImportSerializer(serializers.Serializer):
+    members = MemberCreateSerializer(many=True, required=False, allow_empty=False, max_length=MEMBER_IMPORT_MAX_ITEMS)
+    file = serializers.FileField(
+        required=False, help_text=_("CSV file with `email` and `role` columns, sent instead of `members`.")
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        if ("members" in attrs) == ("file" in attrs):
+            raise serializers.ValidationError(_("Send either `members` or `file`."))
+        members = attrs["members"] if "members" in attrs else self._parse_csv(attrs["file"])
+
+        emails = [member["email"].lower() for member in members]
+        if len(emails) != len(set(emails)):
+            raise serializers.ValidationError(_("Each email may appear only once."))
+        return {"members": members}
+
+    @staticmethod
+    def _parse_csv(file: UploadedFile) -> list[dict]:
+        try:
+            rows = list(csv.DictReader(file.read().decode("utf-8-sig").splitlines(), skipinitialspace=True))
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise serializers.ValidationError({"file": _("Invalid CSV file.")}) from e
+
+        serializer = MemberCreateSerializer(data=rows, many=True, allow_empty=False, max_length=MEMBER_IMPORT_MAX_ITEMS)
+        if not serializer.is_valid():
+            raise serializers.ValidationError({"file": serializer.errors})
+        return serializer.validated_data
+
+
+class MemberImportResultSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    result = serializers.ChoiceField(choices=ImportResult.choices)
+
+
+class MemberImportResponseSerializer(serializers.Serializer):
+    results = MemberImportResultSerializer(many=True)
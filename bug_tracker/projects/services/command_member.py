@@ -1,45 +1,72 @@
-from allauth.account.forms import default_token_generator
-from allauth.account.models import EmailAddress, EmailConfirmationHMAC, get_emailconfirmation_model
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Sequence
+
+from allauth.account.models import EmailAddress
 from core.utils import generate_username
 from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import AbstractBaseUser
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models.functions import Lower
+from django.utils.translation import gettext_lazy as _
 from projects.models import Project, ProjectRole, ProjectRoleAssignment
 from projects.permissions import can_edit_members
-from projects.services.emails import send_invitation_email_for_existing_user, send_invitation_email_for_new_user
+from projects.role_resolver import forget_user_role
+from projects.services.emails import InvitationTemplate
 from projects.services.exceptions import (
     MemberAlreadyInProject,
     NotSufficientRoleInProject,
     UserCannotModifyOwnMembership,
 )
+from projects.tasks import send_project_invitation, send_project_invitations
+
+
+class ImportResult(models.TextChoices):
+    ADDED = "added", _("added")
+    CREATED = "created", _("created")
+    ALREADY_MEMBER = "already_member", _("already member")
+
+
+@dataclass
+class MemberImportResult:
+    email: str
+    result: ImportResult
+
+
+def _get_users_by_emails(emails: Sequence[str]) -> dict[str, AbstractBaseUser]:
+    """Returns users keyed by their lowercased primary email, matching the given emails case-insensitively"""
+    email_addresses = (
+        EmailAddress.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=[email.lower() for email in emails], primary=True)
+        .select_related("user")
+    )
+    return {email_address.email_lower: email_address.user for email_address in email_addresses}
 
 
 def _get_user_by_email(email: str) -> AbstractBaseUser | None:
-    email_obj = EmailAddress.objects.filter(email=email, primary=True).first()
-    return email_obj.user if email_obj else None
+    return _get_users_by_emails([email]).get(email.lower())
 
 
-def _generate_unique_username() -> str:
-    while True:
-        username = generate_username()
-        if not get_user_model().objects.filter(username=username).exists():
-            return username
+def _bulk_create_users_without_password(emails: Sequence[str]) -> dict[str, AbstractBaseUser]:
+    user_model = get_user_model()
+    users = []
+    for email in emails:
+        user = user_model(username=generate_username(), email=user_model.objects.normalize_email(email), is_active=True)
+        user.set_unusable_password()
+        users.append(user)
+    users = user_model.objects.bulk_create(users)
+    EmailAddress.objects.bulk_create(
+        [EmailAddress(user=user, email=email, verified=False, primary=True) for user, email in zip(users, emails)]
+    )
+    return dict(zip(emails, users))
 
 
 def _create_user_without_password(email: str) -> AbstractBaseUser:
-    username = _generate_unique_username()
-    user = get_user_model().objects.create_user(username=username, email=email, is_active=True)
+    user = get_user_model().objects.create_user(username=generate_username(), email=email, is_active=True)
     EmailAddress.objects.create(user=user, email=email, verified=False, primary=True)
     return user
 
 
-def _create_email_confirmation(*, user: AbstractBaseUser, email: str) -> EmailConfirmationHMAC:
-    model = get_emailconfirmation_model()
-    email_address = EmailAddress.objects.get(user=user, email=email)
-    email_confirmation = model.create(email_address=email_address)
-    return email_confirmation
-
-
 def _is_user_in_project(*, user: AbstractBaseUser | None, project: Project) -> bool:
     if user is None:
         return False
@@ -71,24 +98,64 @@ def member_add_to_project(
 
     if user is None:
         user = _create_user_without_password(email)
-        password_token = default_token_generator.make_token(user)
-        email_confirmation = _create_email_confirmation(user=user, email=email)
-        send_invitation_email_for_new_user(
-            email=email,
-            username=user.get_username(),
-            user_id=user.pk,
-            password_token=password_token,
-            email_confirm_token=email_confirmation.key,
-            project_name=project.name,
-            project_id=project.id,
-        )
+        template = InvitationTemplate.NEW_USER
     else:
-        send_invitation_email_for_existing_user(email=email, project_name=project.name, project_id=project.id)
+        template = InvitationTemplate.EXISTING_USER
 
     role_assignment = _create_role_assignment(user=user, project=project, role=role)
+    forget_user_role(project_id=project.id, user_id=user.pk)
+    # Rendered and sent by a worker, and only if the transaction commits
+    transaction.on_commit(
+        partial(send_project_invitation.delay, project_id=project.id, user_id=user.pk, template_name=template.value)
+    )
     return role_assignment
 
 
+@transaction.atomic
+def member_bulk_add_to_project(
+    *, project: Project, editor: AbstractBaseUser, members: Sequence[dict[str, Any]]
+) -> list[MemberImportResult]:
+    """
+    Adds members given by `email` and `role`. Existing users are resolved with a single query, missing ones
+    are created in bulk, and all invitations are sent by one Celery task after commit. Emails have to be unique.
+    """
+    if not can_edit_members(project=project, user=editor):
+        raise NotSufficientRoleInProject()
+
+    emails = [member["email"] for member in members]
+    users_by_email = _get_users_by_emails(emails)
+    member_ids = set(
+        ProjectRoleAssignment.objects.filter(project=project, user__in=users_by_email.values()).values_list(
+            "user_id", flat=True
+        )
+    )
+    new_users = _bulk_create_users_without_password([email for email in emails if email.lower() not in users_by_email])
+
+    results = []
+    role_assignments = []
+    invitations = []
+    for member in members:
+        email = member["email"]
+        if email in new_users:
+            user, result, template = new_users[email], ImportResult.CREATED, InvitationTemplate.NEW_USER
+        elif users_by_email[email.lower()].pk in member_ids:
+            results.append(MemberImportResult(email=email, result=ImportResult.ALREADY_MEMBER))
+            continue
+        else:
+            user, result, template = users_by_email[email.lower()], ImportResult.ADDED, InvitationTemplate.EXISTING_USER
+
+        role_assignments.append(ProjectRoleAssignment(project=project, user=user, role=member["role"]))
+        invitations.append((user.pk, template.value))
+        results.append(MemberImportResult(email=email, result=result))
+
+    ProjectRoleAssignment.objects.bulk_create(role_assignments)
+    for role_assignment in role_assignments:
+        forget_user_role(project_id=project.id, user_id=role_assignment.user_id)
+    if invitations:
+        transaction.on_commit(partial(send_project_invitations.delay, project_id=project.id, invitations=invitations))
+    return results
+
+
 @transaction.atomic
 def member_change_role_in_project(
     *, project: Project, editor: AbstractBaseUser, member: ProjectRoleAssignment, new_role: ProjectRole
@@ -100,6 +167,7 @@ def member_change_role_in_project(
         raise UserCannotModifyOwnMembership()
 
     _update_role_assignment(member=member, new_role=new_role)
+    forget_user_role(project_id=project.id, user_id=member.user_id)
     return member
 
 
@@ -112,3 +180,4 @@ def member_remove_from_project(*, project: Project, editor: AbstractBaseUser, me
         raise UserCannotModifyOwnMembership()
 
     member.delete()
+    forget_user_role(project_id=project.id, user_id=member.user_id)
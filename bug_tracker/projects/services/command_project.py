@@ -7,6 +7,7 @@ from django.db import transaction
 from django.utils.timezone import now
 from projects.models import Project, ProjectIdentifier, ProjectRole, ProjectRoleAssignment
 from projects.permissions import can_edit_project
+from projects.role_resolver import forget_user_role
 from projects.services.exceptions import NotSufficientRoleInProject, SubdomainRecentlyChanged
 
 AllowedSubdomainChangeDate = datetime
@@ -65,6 +66,7 @@ def project_create(*, name: str, description: str, subdomain: str, user: Abstrac
     new_project = _create_project(name=name, description=description, user=user)
     _create_identifier(project=new_project, subdomain=subdomain)
     _create_role_assignment(project=new_project, user=user, role=ProjectRole.MANAGER)
+    forget_user_role(project_id=new_project.id, user_id=user.pk)
     return new_project
 
 
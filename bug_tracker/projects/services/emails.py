@@ -1,55 +1,73 @@
+from enum import Enum
+from typing import Iterable, Sequence
+
+from allauth.account.forms import default_token_generator
+from allauth.account.models import EmailAddress, get_emailconfirmation_model
 from core.url_resolver import FrontendUrlType, resolve_front_url
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 from django.template.loader import render_to_string
 from django.utils.translation import gettext as _
+from projects.models import Project
 from users.url_generators import generate_email_confirmation_url, generate_reset_password_url
 
 
-def send_invitation_email_for_new_user(
-    *,
-    email: str,
-    username: str,
-    user_id: int,
-    password_token: str,
-    email_confirm_token: str,
-    project_name: str,
-    project_id: int,
-) -> None:
-    set_password_url = generate_reset_password_url(user_id=user_id, key=password_token)
-    email_confirm_url = generate_email_confirmation_url(email_confirm_token)
-    project_url = f"{resolve_front_url(FrontendUrlType.PROJECTS)}/{project_id}"
+class InvitationTemplate(str, Enum):
+    NEW_USER = "projects/email/invitation_new_user.txt"
+    EXISTING_USER = "projects/email/invitation_existing_user.txt"
 
-    context = {
-        "project_name": project_name,
-        "set_password_url": set_password_url,
-        "email_confirm_url": email_confirm_url,
-        "username": username,
-        "site_domain": settings.FRONT_DOMAIN,
-        "project_url": project_url,
-    }
-    message = render_to_string("projects/email/invitation_new_user.txt", context=context)
 
-    send_mail(
-        subject=_('You have been invited to the project "%(project_name)s"') % {"project_name": project_name},
-        message=message,
-        from_email=None,
-        recipient_list=[email],
-    )
+def _get_new_user_context(email_address: EmailAddress) -> dict[str, str]:
+    user = email_address.user
+    password_token = default_token_generator.make_token(user)
+    email_confirmation = get_emailconfirmation_model().create(email_address=email_address)
+    return {
+        "set_password_url": generate_reset_password_url(user_id=user.pk, key=password_token),
+        "email_confirm_url": generate_email_confirmation_url(email_confirmation.key),
+        "username": user.get_username(),
+    }
 
 
-def send_invitation_email_for_existing_user(*, email: str, project_name: str, project_id: int) -> None:
-    project_url = f"{resolve_front_url(FrontendUrlType.PROJECTS)}/{project_id}"
+def _build_invitation_message(
+    *, project: Project, email_address: EmailAddress, template: InvitationTemplate
+) -> EmailMessage:
+    project_url = f"{resolve_front_url(FrontendUrlType.PROJECTS)}/{project.id}"
     context = {
-        "project_name": project_name,
+        "project_name": project.name,
         "site_domain": settings.FRONT_DOMAIN,
         "project_url": project_url,
     }
-    message = render_to_string("projects/email/invitation_existing_user.txt", context=context)
+    if template == InvitationTemplate.NEW_USER:
+        context |= _get_new_user_context(email_address)
 
-    send_mail(
-        subject=_('You have been invited to the project "%(project_name)s"') % {"project_name": project_name},
-        message=message,
-        from_email=None,
-        recipient_list=[email],
+    return EmailMessage(
+        subject=_('You have been invited to the project "%(project_name)s"') % {"project_name": project.name},
+        body=render_to_string(template.value, context=context),
+        to=[email_address.email],
     )
+
+
+def _get_primary_email_addresses(user_ids: Iterable[int]) -> dict[int, EmailAddress]:
+    email_addresses = EmailAddress.objects.select_related("user").filter(user_id__in=user_ids, primary=True)
+    return {email_address.user_id: email_address for email_address in email_addresses}
+
+
+def send_invitation_email(*, project_id: int, user_id: int, template: InvitationTemplate) -> None:
+    """Notifies the user, unless the project or the user's primary email has been removed in the meantime"""
+    send_invitation_emails(project_id=project_id, invitations=[(user_id, template)])
+
+
+def send_invitation_emails(*, project_id: int, invitations: Sequence[tuple[int, InvitationTemplate]]) -> None:
+    """Sends invitations for `(user_id, template)` pairs over a single connection"""
+    project = Project.objects.only("name").filter(id=project_id).first()
+    if project is None:
+        return
+
+    email_addresses = _get_primary_email_addresses(user_id for user_id, _template in invitations)
+    messages = [
+        _build_invitation_message(project=project, email_address=email_addresses[user_id], template=template)
+        for user_id, template in invitations
+        if user_id in email_addresses
+    ]
+    if messages:
+        get_connection().send_messages(messages)
@@ -3,7 +3,9 @@ from typing import Any
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.db.models import F, QuerySet
 from projects.filters import MemberFilter
+from projects.membership_cache import get_user_project_ids
 from projects.models import ProjectRoleAssignment
+from projects.role_resolver import remember_user_role
 
 
 def _get_user_fields_annotation() -> dict[str, F]:
@@ -12,17 +14,21 @@ def _get_user_fields_annotation() -> dict[str, F]:
 
 def member_get(*, project_id: int, member_id: int, user: AbstractBaseUser) -> ProjectRoleAssignment | None:
     assignment = (
-        ProjectRoleAssignment.objects.filter(project_id=project_id, project__members=user, user__id=member_id)
+        ProjectRoleAssignment.objects.filter(
+            project_id=project_id, project_id__in=get_user_project_ids(user_id=user.pk), user__id=member_id
+        )
         .annotate(**_get_user_fields_annotation())
         .first()
     )
+    if assignment is not None:
+        remember_user_role(project_id=project_id, user_id=assignment.user_id, role=assignment.role)
     return assignment
 
 
 def member_list(
     *, project_id: int, user: AbstractBaseUser, filters: dict[str, Any] | None = None
 ) -> QuerySet[ProjectRoleAssignment]:
-    assignments = ProjectRoleAssignment.objects.filter(project_id=project_id, project__members=user).annotate(
-        **_get_user_fields_annotation()
-    )
+    assignments = ProjectRoleAssignment.objects.filter(
+        project_id=project_id, project_id__in=get_user_project_ids(user_id=user.pk)
+    ).annotate(**_get_user_fields_annotation())
     return MemberFilter(filters, queryset=assignments).qs
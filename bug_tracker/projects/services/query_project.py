@@ -1,9 +1,13 @@
 from typing import Any, Sequence
 
+from core.conditional import Version, queryset_get_version
 from django.contrib.auth.base_user import AbstractBaseUser
-from django.db.models import OuterRef, QuerySet, Subquery
+from django.db.models import OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Greatest
 from projects.filters import ProjectFilter
+from projects.membership_cache import get_user_memberships
 from projects.models import Project, ProjectRole, ProjectRoleAssignment
+from projects.role_resolver import resolve_user_role
 
 
 def _get_role_subquery(user: AbstractBaseUser) -> QuerySet[ProjectRoleAssignment, dict[str, Any]]:
@@ -12,19 +16,34 @@ def _get_role_subquery(user: AbstractBaseUser) -> QuerySet[ProjectRoleAssignment
 
 def project_get(*, project_id: int, user: AbstractBaseUser) -> Project | None:
     """Returns Project with `role` field"""
-    role_subquery = _get_role_subquery(user=user)
-    project = Project.objects.filter(id=project_id, members=user).annotate(role=Subquery(role_subquery)).first()
+    role = get_user_memberships(user_id=user.pk).get(project_id)
+    if role is None:
+        return None
+    project = Project.objects.filter(id=project_id).annotate(role=Value(role)).first()
     return project
 
 
+def project_get_version(*, project_id: int, user: AbstractBaseUser, for_update: bool = False) -> Version | None:
+    """Version of the project as seen by the user, which changes with the subdomain and the user's role too"""
+    role = get_user_memberships(user_id=user.pk).get(project_id)
+    if role is None:
+        return None
+    # The role's change has to move `Last-Modified` too, for clients revalidating with `If-Modified-Since` only
+    role_updated_at = ProjectRoleAssignment.objects.filter(project=OuterRef("id"), user=user).values("updated_at")[:1]
+    return queryset_get_version(
+        Project.objects.filter(id=project_id),
+        for_update=for_update,
+        updated_at=Greatest("updated_at", "identifier__updated_at", Subquery(role_updated_at)),
+        variant=role,
+    )
+
+
 def project_get_by_subdomain(*, subdomain: str, user: AbstractBaseUser) -> Project | None:
     """Returns Project with `role` field"""
-    role_subquery = _get_role_subquery(user=user)
-    project = (
-        Project.objects.filter(identifier__subdomain=subdomain, members=user)
-        .annotate(role=Subquery(role_subquery))
-        .first()
-    )
+    memberships = get_user_memberships(user_id=user.pk)
+    project = Project.objects.filter(identifier__subdomain=subdomain, id__in=memberships).first()
+    if project is not None:
+        project.role = memberships[project.id]
     return project
 
 
@@ -36,10 +55,7 @@ def project_list(*, user: AbstractBaseUser, filters: dict[str, Any] | None = Non
 
 
 def project_get_user_role(*, project: Project, user: AbstractBaseUser) -> str | None:
-    assignment = ProjectRoleAssignment.objects.filter(project=project, user=user).first()
-    if not assignment:
-        return None
-    return assignment.role
+    return resolve_user_role(project_id=project.id, user=user)
 
 
 def project_has_user_roles(*, project: Project, user: AbstractBaseUser, roles: Sequence[ProjectRole]) -> bool:
@@ -0,0 +1,16 @@
+from projects.services.emails import InvitationTemplate, send_invitation_email, send_invitation_emails
+
+from bug_tracker.celery import app
+
+
+@app.task
+def send_project_invitation(project_id: int, user_id: int, template_name: str) -> None:
+    send_invitation_email(project_id=project_id, user_id=user_id, template=InvitationTemplate(template_name))
+
+
+@app.task
+def send_project_invitations(project_id: int, invitations: list[tuple[int, str]]) -> None:
+    send_invitation_emails(
+        project_id=project_id,
+        invitations=[(user_id, InvitationTemplate(template_name)) for user_id, template_name in invitations],
+    )
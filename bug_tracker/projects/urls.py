@@ -1,6 +1,7 @@
 from django.urls import path
-from issues.views.issue import IssueListCreateView
-from projects.views.member import MemberDetailUpdateDeleteView, MemberListCreateView
+from issues.views.event import ProjectEventStreamView
+from issues.views.issue import IssueBulkAssignView, IssueBulkUpdateView, IssueListCreateView
+from projects.views.member import MemberDetailUpdateDeleteView, MemberImportView, MemberListCreateView
 from projects.views.project import ProjectCurrentDetailView, ProjectDetailUpdateView, ProjectListCreateView
 
 urlpatterns = [
@@ -8,10 +9,14 @@ urlpatterns = [
     path("current/", ProjectCurrentDetailView.as_view(), name="project-current"),
     path("<int:project_id>/", ProjectDetailUpdateView.as_view(), name="project-detail-update"),
     path("<int:project_id>/members/", MemberListCreateView.as_view(), name="member-list-create"),
+    path("<int:project_id>/members/import/", MemberImportView.as_view(), name="member-import"),
     path(
         "<int:project_id>/members/<int:member_id>/",
         MemberDetailUpdateDeleteView.as_view(),
         name="member-detail-update-delete",
     ),
     path("<int:project_id>/issues/", IssueListCreateView.as_view(), name="issue-list-create"),
+    path("<int:project_id>/issues/bulk/", IssueBulkUpdateView.as_view(), name="issue-bulk-update"),
+    path("<int:project_id>/issues/bulk/assign/", IssueBulkAssignView.as_view(), name="issue-bulk-assign"),
+    path("<int:project_id>/events/", ProjectEventStreamView.as_view(), name="project-events"),
 ]
@@ -1,3 +1,5 @@
+from dataclasses import asdict
+
 from core.exceptions import Conflict
 from core.pagination import LimitOffsetPagination, get_paginated_response
 from core.serializers import CommaSeparatedMultipleChoiceField
@@ -6,9 +8,16 @@ from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema
 from projects.filters import MemberOrdering
 from projects.models import ProjectRole
-from projects.serializers.member import MemberCreateSerializer, MemberDetailSerializer, MemberUpdateSerializer
+from projects.serializers.member import (
+    MemberCreateSerializer,
+    MemberDetailSerializer,
+    MemberImportResponseSerializer,
+    MemberImportSerializer,
+    MemberUpdateSerializer,
+)
 from projects.services.command_member import (
     member_add_to_project,
+    member_bulk_add_to_project,
     member_change_role_in_project,
     member_remove_from_project,
 )
@@ -21,6 +30,7 @@ from projects.services.query_member import member_get, member_list
 from projects.services.query_project import project_get
 from rest_framework import serializers, status, views
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
 
@@ -114,3 +124,25 @@ class MemberDetailUpdateDeleteView(views.APIView):
 
         data = MemberDetailSerializer(updated_member).data
         return Response(data)
+
+
+class MemberImportView(views.APIView):
+    parser_classes = [JSONParser, MultiPartParser]
+
+    @extend_schema(
+        request={"application/json": MemberImportSerializer, "multipart/form-data": MemberImportSerializer},
+        responses=MemberImportResponseSerializer,
+    )
+    def post(self, request: Request, project_id: int) -> Response:
+        serializer = MemberImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        project = query_or_404(project_get, project_id=project_id, user=self.request.user)
+
+        try:
+            results = member_bulk_add_to_project(**serializer.validated_data, editor=self.request.user, project=project)
+        except NotSufficientRoleInProject as e:
+            raise PermissionDenied(str(e)) from e
+
+        data = MemberImportResponseSerializer({"results": [asdict(result) for result in results]}).data
+        return Response(data)
@@ -1,3 +1,4 @@
+from core.conditional import Version, conditional
 from core.exceptions import Unprocessable
 from core.pagination import LimitOffsetPagination, get_paginated_response
 from core.serializers import CommaSeparatedMultipleChoiceField
@@ -18,15 +19,20 @@ from projects.serializers.project import (
 )
 from projects.services.command_project import project_create, project_update
 from projects.services.exceptions import NotSufficientRoleInProject, SubdomainRecentlyChanged
-from projects.services.query_project import project_get, project_list
+from projects.services.query_project import project_get, project_get_version, project_list
 from rest_framework import serializers, status, views
 from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 
+def _get_project_version(*, request: Request, project_id: int, for_update: bool) -> Version | None:
+    return project_get_version(project_id=project_id, user=request.user, for_update=for_update)
+
+
 class ProjectDetailUpdateView(views.APIView):
     @extend_schema(responses=ProjectDetailSerializer)
+    @conditional(_get_project_version)
     def get(self, request: Request, project_id: int) -> Response:
         project = query_or_404(project_get, project_id=project_id, user=self.request.user)
 
@@ -34,6 +40,7 @@ class ProjectDetailUpdateView(views.APIView):
         return Response(data)
 
     @extend_schema(request=ProjectUpdateSerializer, responses=ProjectDetailWithoutRoleSerializer)
+    @conditional(_get_project_version)
     def put(self, request: Request, project_id: int) -> Response:
         serializer = ProjectUpdateSerializer(data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -1,4 +1,8 @@
+from pathlib import Path
+
 import pytest
+from django.conf import Settings
+from django.core.cache import cache
 from faker.proxy import Faker
 from projects.models import Project
 from rest_framework.test import APIClient, APIRequestFactory
@@ -6,6 +10,19 @@ from tests.factories import fake_project, fake_user
 from users.models import CustomUser
 
 
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.fixture
+def shared_cache(settings: Settings, tmp_path: Path) -> None:
+    """Replaces the per-process cache with one that processes could share, which list ETags require"""
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}
+    }
+
+
 @pytest.fixture
 def faker() -> Faker:
     fake = Faker()
@@ -57,5 +57,5 @@ def fake_file() -> tuple[File, str]:
 def fake_attachment(*, issue: Issue, comment: IssueComment | None = None) -> IssueAttachment:
     file, extension = fake_file()
     return IssueAttachment.objects.create(
-        issue=issue, comment=comment, uploaded_by=issue.created_by, file=file, extension=extension
+        issue=issue, comment=comment, uploaded_by=issue.created_by, file=file, name=file.name, extension=extension
     )
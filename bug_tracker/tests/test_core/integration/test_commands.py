@@ -1,4 +1,5 @@
 import pytest
+from core.management.commands.benchmark_db_connections import get_unpooled_connection
 from django.core.management import call_command
 from django.db import OperationalError, connections
 from pytest_mock import MockerFixture
@@ -31,3 +32,25 @@ def test_wait_for_db_retry_until_ready(mocker: MockerFixture, capsys: pytest.Cap
     assert captured.out.count("Database unavailable") == 2
     assert "Database is ready!" in captured.out
     assert sleep_mock.call_count == 2
+
+
+@pytest.mark.django_db
+def test_benchmark_db_connections(mocker: MockerFixture, capsys: pytest.CaptureFixture[str]) -> None:
+    mocker.patch.dict(connections["default"].settings_dict, {"CONN_MAX_AGE": 60})
+
+    call_command("benchmark_db_connections", requests=3)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("new connection per request: mean")
+    assert lines[1].startswith("persistent connection: mean")
+    assert "Requests with persistent connection are" in lines[2]
+
+
+def test_get_unpooled_connection(mocker: MockerFixture) -> None:
+    mocker.patch.dict(connections["default"].settings_dict, {"CONN_MAX_AGE": 60, "OPTIONS": {"pool": True}})
+
+    connection = get_unpooled_connection("default")
+
+    assert connection.settings_dict["CONN_MAX_AGE"] == 0
+    assert connection.settings_dict["OPTIONS"] == {}
+    assert connections["default"].settings_dict["OPTIONS"] == {"pool": True}
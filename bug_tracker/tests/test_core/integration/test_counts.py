@@ -0,0 +1,25 @@
+import pytest
+from core.counts import cached_count, estimate_count
+from core.models import DummyModel
+from pytest_django import DjangoAssertNumQueries
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture
+def dummy_instances() -> list[DummyModel]:
+    return DummyModel.objects.bulk_create([DummyModel(name=str(i % 2)) for i in range(5)])
+
+
+def test_estimate_count_falls_back_to_exact_count(dummy_instances: list[DummyModel]) -> None:
+    assert estimate_count(DummyModel.objects.filter(name="0"), exact_below=10) == 3
+
+
+def test_cached_count_is_keyed_by_filters(
+    dummy_instances: list[DummyModel], django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    assert cached_count(DummyModel.objects.filter(name="0"), timeout=60) == 3
+    assert cached_count(DummyModel.objects.filter(name="1"), timeout=60) == 2
+
+    with django_assert_num_queries(0):
+        assert cached_count(DummyModel.objects.filter(name="0").order_by("-pk"), timeout=60) == 3
@@ -1,9 +1,12 @@
 from typing import Sequence
 
 import pytest
+from core.email_backend import email_outbox_scope
+from core.tasks import async_send_messages, close_worker_connections
 from django.conf import Settings
 from django.core import mail as django_mail
 from django.core.mail import EmailMessage, send_mail
+from pytest_mock import MockerFixture
 
 pytestmark = pytest.mark.integration
 
@@ -13,6 +16,7 @@ def override_email_related_settings(settings: Settings) -> None:
     settings.CELERY_TASK_ALWAYS_EAGER = True
     settings.CORE_EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
     settings.EMAIL_BACKEND = "core.email_backend.AsyncEmailBackend"
+    close_worker_connections()
 
 
 @pytest.fixture
@@ -47,3 +51,19 @@ def test_async_email_backend_sends_messages(email_messages: Sequence[EmailMessag
         assert mail.from_email == email_messages[i].from_email
         assert mail.to == email_messages[i].to
         assert mail.body == email_messages[i].body
+
+
+def test_async_email_backend_enqueues_one_task_per_outbox_scope(
+    email_messages: Sequence[EmailMessage], mocker: MockerFixture
+) -> None:
+    delay_spy = mocker.spy(async_send_messages, "delay")
+
+    with email_outbox_scope():
+        for message in email_messages:
+            send_mail(
+                subject=message.subject, message=message.body, from_email=message.from_email, recipient_list=message.to
+            )
+        assert len(django_mail.outbox) == 0
+
+    delay_spy.assert_called_once()
+    assert len(django_mail.outbox) == len(email_messages)
@@ -1,7 +1,11 @@
 import pytest
-from core.pagination import LimitOffsetPagination, get_paginated_response
+from core.models import DummyModel
+from core.pagination import CountMode, CursorPagination, LimitOffsetPagination, get_paginated_response
+from pytest_django import DjangoAssertNumQueries
 from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound
 from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory
 from rest_framework.views import APIView
 
@@ -68,3 +72,142 @@ def test_get_paginated_response_without_pagination(dummy_data: list[DummyObject]
 
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data["results"]) == len(dummy_data)
+
+
+class DummyModelSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+@pytest.fixture
+def dummy_instances() -> list[DummyModel]:
+    return DummyModel.objects.bulk_create([DummyModel(name=str(i % 3)) for i in range(11)])
+
+
+def _paginate_with_cursor(url: str) -> Response:
+    request = Request(APIRequestFactory().get(url))
+    return get_paginated_response(
+        pagination_class=LimitOffsetPagination,
+        serializer_class=DummyModelSerializer,
+        queryset=DummyModel.objects.order_by("-name"),
+        request=request,
+        view=DummyView(),
+        cursor_pagination_class=CursorPagination,
+    )
+
+
+@pytest.mark.django_db
+def test_get_paginated_response_uses_cursor_pagination_when_requested(dummy_instances: list[DummyModel]) -> None:
+    response = _paginate_with_cursor("/fake-url/?cursor=&limit=4")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "count" not in response.data
+    assert len(response.data["results"]) == 4
+    assert response.data["previous"] is None
+    assert response.data["next"] is not None
+
+
+@pytest.mark.django_db
+def test_get_paginated_response_uses_limit_offset_pagination_by_default(dummy_instances: list[DummyModel]) -> None:
+    response = _paginate_with_cursor("/fake-url/?limit=4")
+
+    assert response.data["count"] == len(dummy_instances)
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_pages_forward_and_back(dummy_instances: list[DummyModel]) -> None:
+    expected = list(DummyModel.objects.order_by("-name", "-pk").values_list("id", flat=True))
+
+    pages = []
+    url = "/fake-url/?cursor=&limit=4"
+    while url:
+        response = _paginate_with_cursor(url)
+        pages.append([item["id"] for item in response.data["results"]])
+        url = response.data["next"]
+
+    assert [item for page in pages for item in page] == expected
+    assert len(pages) == 3
+
+    url = response.data["previous"]
+    for page in reversed(pages[:-1]):
+        response = _paginate_with_cursor(url)
+        assert [item["id"] for item in response.data["results"]] == page
+        url = response.data["previous"]
+    assert url is None
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_does_not_count(
+    dummy_instances: list[DummyModel], django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    next_url = _paginate_with_cursor("/fake-url/?cursor=&limit=4").data["next"]
+
+    with django_assert_num_queries(1):
+        _paginate_with_cursor(next_url)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("cursor", ["invalid", "eyJwIjogWyJ4Il19", "eyJwIjpbIngiLCJ5Il19"])
+def test_cursor_pagination_invalid_cursor(dummy_instances: list[DummyModel], cursor: str) -> None:
+    with pytest.raises(NotFound):
+        _paginate_with_cursor(f"/fake-url/?cursor={cursor}")
+
+
+def _paginate_with_count_mode(url: str, count_mode: CountMode) -> Response:
+    pagination_class = type("Pagination", (LimitOffsetPagination,), {"count_mode": count_mode})
+    return get_paginated_response(
+        pagination_class=pagination_class,
+        serializer_class=DummyModelSerializer,
+        queryset=DummyModel.objects.order_by("pk"),
+        request=Request(APIRequestFactory().get(url)),
+        view=DummyView(),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count_mode", [CountMode.ESTIMATED, CountMode.CACHED])
+def test_limit_offset_pagination_approximate_count_modes(
+    dummy_instances: list[DummyModel], count_mode: CountMode
+) -> None:
+    response = _paginate_with_count_mode("/fake-url/?limit=4&offset=4", count_mode)
+
+    assert response.data["count"] == len(dummy_instances)
+    assert len(response.data["results"]) == 4
+    assert response.data["next"] is not None
+    assert response.data["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_limit_offset_pagination_without_count(
+    dummy_instances: list[DummyModel], django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    with django_assert_num_queries(1):
+        response = _paginate_with_count_mode("/fake-url/?limit=4", CountMode.NONE)
+
+    assert response.data["count"] is None
+    assert response.data["next"] is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count_mode", [CountMode.ESTIMATED, CountMode.CACHED, CountMode.NONE])
+def test_limit_offset_pagination_last_page_count_is_exact_without_count_query(
+    dummy_instances: list[DummyModel], count_mode: CountMode, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    with django_assert_num_queries(1):
+        response = _paginate_with_count_mode("/fake-url/?limit=4&offset=8", count_mode)
+
+    assert response.data["count"] == len(dummy_instances)
+    assert len(response.data["results"]) == 3
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_limit_offset_pagination_cached_count_is_reused(
+    dummy_instances: list[DummyModel], django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    _paginate_with_count_mode("/fake-url/?limit=4", CountMode.CACHED)
+
+    with django_assert_num_queries(1):
+        response = _paginate_with_count_mode("/fake-url/?limit=4", CountMode.CACHED)
+
+    assert response.data["count"] == len(dummy_instances)
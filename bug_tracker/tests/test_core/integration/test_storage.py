@@ -0,0 +1,101 @@
+from datetime import timedelta
+from typing import Iterator
+
+import pytest
+import requests
+from core.storage import (
+    DirectUploadNotSupported,
+    generate_presigned_upload,
+    get_signed_url,
+    list_files,
+    read_file_head,
+    serves_signed_urls,
+)
+from django.core.files.base import ContentFile
+from django.core.files.storage import InMemoryStorage, Storage
+from django.db.models import FileField
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+from moto import mock_aws
+from storages.backends.s3 import S3Storage
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def s3_storage() -> Iterator[Storage]:
+    with mock_aws():
+        storage = S3Storage(
+            bucket_name="attachments", region_name="us-east-1", querystring_expire=60, signature_version="s3v4"
+        )
+        storage.connection.create_bucket(Bucket="attachments")
+        yield storage
+
+
+@pytest.fixture
+def in_memory_storage() -> Storage:
+    return InMemoryStorage()
+
+
+def test_generate_presigned_upload(s3_storage: Storage) -> None:
+    upload = generate_presigned_upload(s3_storage, "attachments/file.txt", max_size=1024, expires_in=60)
+
+    response = requests.post(upload["url"], data=upload["fields"], files={"file": b"Sample content"})
+
+    assert response.ok
+    assert s3_storage.exists("attachments/file.txt")
+
+
+def test_generate_presigned_upload_not_supported() -> None:
+    with pytest.raises(DirectUploadNotSupported):
+        generate_presigned_upload(InMemoryStorage(), "file.txt", max_size=1024, expires_in=60)
+
+
+def test_read_file_head_s3(s3_storage: Storage) -> None:
+    s3_storage.save("file.txt", ContentFile(b"Sample content"))
+
+    assert read_file_head(s3_storage, "file.txt", 6) == b"Sample"
+
+
+def test_read_file_head() -> None:
+    storage = InMemoryStorage()
+    storage.save("file.txt", ContentFile(b"Sample content"))
+
+    assert read_file_head(storage, "file.txt", 6) == b"Sample"
+
+
+def test_s3_url_is_signed(s3_storage: Storage) -> None:
+    s3_storage.save("file.txt", ContentFile(b"Sample content"))
+
+    url = s3_storage.url("file.txt")
+
+    assert "X-Amz-Signature=" in url
+    assert "X-Amz-Expires=60" in url
+
+
+def test_get_signed_url_with_filename(s3_storage: Storage) -> None:
+    s3_storage.save("blob.txt", ContentFile(b"Sample content"))
+    file = FieldFile(None, FileField(storage=s3_storage), "blob.txt")
+
+    response = requests.get(get_signed_url(file, filename="notes.txt"))
+
+    assert response.ok
+    assert response.headers["Content-Disposition"] == 'attachment; filename="notes.txt"'
+
+
+def test_serves_signed_urls(s3_storage: Storage) -> None:
+    assert serves_signed_urls(s3_storage)
+    assert not serves_signed_urls(InMemoryStorage())
+
+
+@pytest.mark.parametrize("storage_fixture", ["s3_storage", "in_memory_storage"])
+def test_list_files(storage_fixture: str, request: pytest.FixtureRequest) -> None:
+    storage = request.getfixturevalue(storage_fixture)
+    for name in ("attachments/file.txt", "attachments/issue-1/file.txt", "other/file.txt"):
+        storage.save(name, ContentFile(b"Sample content"))
+
+    names = list_files(storage, "attachments", modified_before=timezone.now() + timedelta(seconds=1))
+    recent_names = list_files(storage, "attachments", modified_before=timezone.now() - timedelta(hours=1))
+
+    assert sorted(names) == ["attachments/file.txt", "attachments/issue-1/file.txt"]
+    assert list(recent_names) == []
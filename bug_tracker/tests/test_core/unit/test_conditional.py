@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from core.conditional import get_version
+
+pytestmark = pytest.mark.unit
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, 0, 500_000, tzinfo=timezone.utc)
+
+
+def test_get_version() -> None:
+    version = get_version(pk=1, updated_at=UPDATED_AT)
+
+    assert version.etag.startswith('"') and version.etag.endswith('"')
+    assert version.etag == get_version(pk=1, updated_at=UPDATED_AT).etag
+    assert version.timestamp == int(UPDATED_AT.timestamp())
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        {"pk": 2, "updated_at": UPDATED_AT},
+        {"pk": 1, "updated_at": UPDATED_AT + timedelta(microseconds=1)},
+        {"pk": 1, "updated_at": UPDATED_AT, "variant": "DEV"},
+    ],
+)
+def test_get_version_changes(other: dict) -> None:
+    assert get_version(pk=1, updated_at=UPDATED_AT).etag != get_version(**other).etag
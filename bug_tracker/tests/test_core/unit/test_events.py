@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from core.events import RESYNC_EVENT, Event, InMemoryBroker, stream_events
+from django.conf import Settings
+from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+
+def test_event_to_sse() -> None:
+    event = Event(type="issue.updated", channel="project:1", data={"issue_id": 1}, id="1")
+
+    assert event.to_sse() == 'id: 1\nevent: issue.updated\ndata: {"issue_id": 1}\n\n'
+    assert Event.from_json(event.to_json()).id == event.id
+
+
+def test_in_memory_broker_delivers_to_subscribed_channels() -> None:
+    broker = InMemoryBroker()
+    event = Event(type="issue.created", channel="project:1")
+
+    async def subscribe() -> list[Event]:
+        async with broker.subscribe(["project:1"]) as subscription:
+            broker.publish(Event(type="issue.created", channel="project:2"))
+            broker.publish(event)
+            return [await subscription.get()]
+
+    assert asyncio.run(subscribe()) == [event]
+    assert not broker._subscriptions
+
+
+def test_in_memory_broker_drops_events_of_slow_subscribers(settings: Settings) -> None:
+    settings.EVENTS_QUEUE_SIZE = 1
+    broker = InMemoryBroker()
+
+    async def subscribe() -> int:
+        async with broker.subscribe(["project:1"]) as subscription:
+            for _ in range(3):
+                broker.publish(Event(type="issue.created", channel="project:1"))
+            await asyncio.sleep(0)
+            return subscription.queue.qsize()
+
+    assert asyncio.run(subscribe()) == 1
+
+
+def test_stream_events_ends_when_not_allowed(settings: Settings, mocker: MockerFixture) -> None:
+    settings.EVENTS_HEARTBEAT_INTERVAL = 0.01
+    mocker.patch("core.events.get_broker", return_value=InMemoryBroker())
+    is_allowed = mocker.AsyncMock(side_effect=[True, False])
+
+    async def read() -> list[str]:
+        return [chunk async for chunk in stream_events(["project:1"], is_allowed=is_allowed)]
+
+    connected, *chunks = asyncio.run(read())
+
+    assert connected.startswith(": connected\nid: ")
+    assert chunks == [": heartbeat\n\n"]
+
+
+def test_stream_events_resyncs_after_reconnect(settings: Settings, mocker: MockerFixture) -> None:
+    settings.EVENTS_HEARTBEAT_INTERVAL = 0.01
+    mocker.patch("core.events.get_broker", return_value=InMemoryBroker())
+    is_allowed = mocker.AsyncMock(return_value=False)
+
+    async def read() -> list[str]:
+        return [chunk async for chunk in stream_events(["project:1"], is_allowed=is_allowed, last_event_id="1")]
+
+    _, resync, *_ = asyncio.run(read())
+
+    assert f"event: {RESYNC_EVENT}\n" in resync
+
+
+def test_stream_events_ends_after_timeout(settings: Settings, mocker: MockerFixture) -> None:
+    settings.EVENTS_STREAM_TIMEOUT = 0.01
+    mocker.patch("core.events.get_broker", return_value=InMemoryBroker())
+
+    async def read() -> list[str]:
+        return [chunk async for chunk in stream_events(["project:1"], is_allowed=mocker.AsyncMock(return_value=True))]
+
+    assert asyncio.run(read())[0].startswith(": connected\n")
@@ -0,0 +1,41 @@
+import runpy
+from typing import Any
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from django.conf import settings
+from gunicorn.util import load_class
+
+pytestmark = pytest.mark.unit
+
+
+def _load_config() -> dict[str, Any]:
+    return runpy.run_path(str(settings.BASE_DIR / "gunicorn.conf.py"))
+
+
+def test_gunicorn_conf_defaults_to_wsgi(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.delenv("SERVER_INTERFACE", raising=False)
+
+    config = _load_config()
+
+    assert config["wsgi_app"] == "bug_tracker.wsgi:application"
+    assert config["worker_class"] == "sync"
+
+
+def test_gunicorn_conf_asgi(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("SERVER_INTERFACE", "asgi")
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+
+    config = _load_config()
+
+    assert config["wsgi_app"] == "bug_tracker.asgi:application"
+    assert config["worker_class"] == "bug_tracker.workers.UvicornWorker"
+    assert config["workers"] == 3
+    assert load_class(config["worker_class"]).CONFIG_KWARGS["lifespan"] == "off"
+
+
+def test_gunicorn_conf_invalid_interface(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("SERVER_INTERFACE", "cgi")
+
+    with pytest.raises(ValueError):
+        _load_config()
@@ -1,7 +1,8 @@
 from unittest.mock import MagicMock
 
 import pytest
-from core.middleware import LogIpMiddleware, get_client_ip
+from core.middleware import LogIpMiddleware, RequestCacheMiddleware, get_client_ip
+from core.request_cache import request_cache_get, request_cache_set
 from django.http import HttpRequest
 from pytest_mock import MockerFixture
 
@@ -46,3 +47,18 @@ def test_log_ip_middleware_logs_ip(
     assert response == get_response.return_value
     assert ip in logged_message
     assert str(user) in logged_message
+
+
+def test_request_cache_middleware_scopes_cache_to_request(mock_request: HttpRequest) -> None:
+    cached_during_request = []
+
+    def get_response(_request: HttpRequest) -> MagicMock:
+        request_cache_set("key", "value")
+        cached_during_request.append(request_cache_get("key"))
+        return MagicMock()
+
+    middleware = RequestCacheMiddleware(get_response)
+    middleware(mock_request)
+
+    assert cached_during_request == ["value"]
+    assert request_cache_get("key") is None
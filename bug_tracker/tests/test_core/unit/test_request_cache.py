@@ -0,0 +1,41 @@
+import pytest
+from core.request_cache import request_cache_delete, request_cache_get, request_cache_scope, request_cache_set
+
+pytestmark = pytest.mark.unit
+
+
+def test_request_cache_stores_values_within_scope() -> None:
+    with request_cache_scope():
+        request_cache_set("key", "value")
+
+        assert request_cache_get("key") == "value"
+
+
+def test_request_cache_is_cleared_after_scope_ends() -> None:
+    with request_cache_scope():
+        request_cache_set("key", "value")
+
+    with request_cache_scope():
+        assert request_cache_get("key") is None
+
+
+def test_request_cache_does_nothing_outside_scope() -> None:
+    request_cache_set("key", "value")
+
+    assert request_cache_get("key", "default") == "default"
+
+
+def test_request_cache_delete_removes_value() -> None:
+    with request_cache_scope():
+        request_cache_set("key", "value")
+        request_cache_delete("key")
+
+        assert request_cache_get("key") is None
+
+
+def test_request_cache_can_store_none() -> None:
+    missing = object()
+    with request_cache_scope():
+        request_cache_set("key", None)
+
+        assert request_cache_get("key", missing) is None
@@ -0,0 +1,69 @@
+import importlib
+import sys
+from types import ModuleType
+from typing import Callable
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+from psycopg_pool import ConnectionPool
+
+pytestmark = pytest.mark.unit
+
+LoadSettingsFunc = Callable[..., ModuleType]
+
+
+@pytest.fixture
+def load_settings(monkeypatch: MonkeyPatch) -> LoadSettingsFunc:
+    def _load_settings(environment: str, **env: str) -> ModuleType:
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        module = f"bug_tracker.settings.{environment}"
+        for name in ("bug_tracker.settings.base", module):
+            monkeypatch.delitem(sys.modules, name, raising=False)
+        return importlib.import_module(module)
+
+    return _load_settings
+
+
+def test_production_settings_require_cache_url(load_settings: LoadSettingsFunc) -> None:
+    with pytest.raises(ImproperlyConfigured, match="CACHE_URL"):
+        load_settings("production", CACHE_URL="", EVENTS_BROKER_URL="redis://redis:6379/2")
+
+
+def test_production_settings_require_events_broker_url(load_settings: LoadSettingsFunc) -> None:
+    with pytest.raises(ImproperlyConfigured, match="EVENTS_BROKER_URL"):
+        load_settings("production", CACHE_URL="redis://redis:6379/1", EVENTS_BROKER_URL="")
+
+
+def test_production_settings_with_shared_services(load_settings: LoadSettingsFunc) -> None:
+    production = load_settings("production", CACHE_URL="redis://redis:6379/1", EVENTS_BROKER_URL="redis://redis:6379/2")
+
+    assert production.CACHES["default"]["BACKEND"] == "django.core.cache.backends.redis.RedisCache"
+    assert production.EVENTS_BROKER_URL == "redis://redis:6379/2"
+
+
+def test_settings_with_database_pool(load_settings: LoadSettingsFunc) -> None:
+    base = load_settings(
+        "base", DATABASE_URL="postgres://user:password@db:5432/bug_tracker", DATABASE_POOL_MAX_SIZE="8"
+    )
+    settings_dict = connections.configure_settings({"default": base.DATABASES["default"]})["default"]
+    database = DatabaseWrapper(settings_dict, alias="pool")
+
+    try:
+        pool = database.pool
+        connection_params = database.get_connection_params()
+    finally:
+        DatabaseWrapper._connection_pools.pop("pool", None)
+
+    assert base.DATABASES["default"]["CONN_MAX_AGE"] == 0
+    assert isinstance(pool, ConnectionPool)
+    assert pool.max_size == 8
+    assert "pool" not in connection_params
+
+
+def test_settings_with_database_pool_require_postgresql(load_settings: LoadSettingsFunc) -> None:
+    with pytest.raises(ImproperlyConfigured, match="DATABASE_POOL_MAX_SIZE"):
+        load_settings("base", DATABASE_URL="sqlite:///db.sqlite3", DATABASE_POOL_MAX_SIZE="8")
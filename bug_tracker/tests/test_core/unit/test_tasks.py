@@ -1,8 +1,10 @@
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from typing import Iterator
 from unittest.mock import MagicMock
 
 import pytest
-from celery.exceptions import Reject
-from core.tasks import async_send_messages
+from celery.exceptions import Reject, Retry
+from core.tasks import async_send_messages, close_worker_connections
 from django.core.mail import EmailMessage
 from pytest_mock import MockerFixture
 
@@ -10,8 +12,10 @@ pytestmark = pytest.mark.unit
 
 
 @pytest.fixture
-def mock_get_connection(mocker: MockerFixture) -> MagicMock:
-    return mocker.patch("core.tasks.get_connection")
+def mock_get_connection(mocker: MockerFixture) -> Iterator[MagicMock]:
+    close_worker_connections()
+    yield mocker.patch("core.tasks.get_connection")
+    close_worker_connections()
 
 
 @pytest.fixture
@@ -43,3 +47,53 @@ def test_async_send_messages_sends_emails_message_instances_to_email_backend(
     email = send_messages.call_args[0][0][0]
     assert isinstance(email, EmailMessage)
     send_messages.assert_called_once()
+
+
+def test_async_send_messages_reuses_worker_connection(
+    mock_get_connection: MagicMock, valid_email_data: dict[str, str]
+) -> None:
+    async_send_messages([valid_email_data, valid_email_data])
+    async_send_messages([valid_email_data])
+
+    mock_get_connection.assert_called_once()
+    mock_get_connection.return_value.open.assert_called_once()
+    assert mock_get_connection.return_value.send_messages.call_count == 3
+
+
+def test_async_send_messages_reconnects_when_server_disconnected(
+    mock_get_connection: MagicMock, valid_email_data: dict[str, str]
+) -> None:
+    mock_get_connection.return_value.send_messages.side_effect = [SMTPServerDisconnected(), 1]
+
+    async_send_messages([valid_email_data])
+
+    assert mock_get_connection.call_count == 2
+    mock_get_connection.return_value.close.assert_called_once()
+
+
+def test_async_send_messages_retries_only_failed_messages(
+    mocker: MockerFixture, mock_get_connection: MagicMock, valid_email_data: dict[str, str]
+) -> None:
+    failing_email_data = {**valid_email_data, "to": ["invalid@example.com"]}
+    mock_get_connection.return_value.send_messages.side_effect = [1, SMTPRecipientsRefused({}), 1]
+    retry_mock = mocker.patch.object(async_send_messages, "retry", side_effect=Retry())
+
+    with pytest.raises(Retry):
+        async_send_messages([valid_email_data, failing_email_data, valid_email_data], enqueued_at=1.0)
+
+    assert retry_mock.call_args.kwargs["args"] == ([failing_email_data],)
+    assert retry_mock.call_args.kwargs["kwargs"] == {"enqueued_at": 1.0}
+
+
+def test_async_send_messages_sends_metrics_event(
+    mocker: MockerFixture, mock_get_connection: MagicMock, valid_email_data: dict[str, str]
+) -> None:
+    send_event_mock = mocker.patch.object(async_send_messages, "send_event")
+
+    async_send_messages([valid_email_data, valid_email_data], enqueued_at=1.0)
+
+    send_event_mock.assert_called_once()
+    assert send_event_mock.call_args.args == ("task-emails-sent",)
+    assert send_event_mock.call_args.kwargs["sent"] == 2
+    assert send_event_mock.call_args.kwargs["failed"] == 0
+    assert send_event_mock.call_args.kwargs["queued"] > 0
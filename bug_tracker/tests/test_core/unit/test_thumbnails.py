@@ -0,0 +1,58 @@
+from io import BytesIO
+
+import pypdfium2
+import pytest
+from core.thumbnails import build_thumbnail
+from django.core.files.base import ContentFile
+from PIL import Image
+
+pytestmark = pytest.mark.unit
+
+
+def _image_file(size: tuple[int, int], image_format: str, mode: str = "RGB") -> ContentFile:
+    output = BytesIO()
+    Image.new(mode, size, "red").save(output, format=image_format)
+    return ContentFile(output.getvalue())
+
+
+def _thumbnail_size(thumbnail: ContentFile) -> tuple[int, int]:
+    image = Image.open(thumbnail)
+    assert image.format == "JPEG"
+    return image.size
+
+
+def test_build_thumbnail_from_image() -> None:
+    file = _image_file((1000, 500), "JPEG")
+
+    thumbnail = build_thumbnail(file, extension="jpg", size=(320, 320))
+
+    assert _thumbnail_size(thumbnail) == (320, 160)
+
+
+def test_build_thumbnail_from_transparent_image() -> None:
+    file = _image_file((100, 200), "PNG", mode="RGBA")
+
+    thumbnail = build_thumbnail(file, extension="png", size=(50, 50))
+
+    assert _thumbnail_size(thumbnail) == (25, 50)
+
+
+def test_build_thumbnail_from_pdf() -> None:
+    document = pypdfium2.PdfDocument.new()
+    document.new_page(612, 792)
+    output = BytesIO()
+    document.save(output)
+
+    thumbnail = build_thumbnail(ContentFile(output.getvalue()), extension="pdf", size=(320, 320))
+
+    width, height = _thumbnail_size(thumbnail)
+    assert height == 320
+    assert width in (247, 248)
+
+
+def test_build_thumbnail_unsupported_extension() -> None:
+    assert build_thumbnail(ContentFile(b"Sample content"), extension="txt", size=(320, 320)) is None
+
+
+def test_build_thumbnail_corrupted_file() -> None:
+    assert build_thumbnail(ContentFile(b"\x89PNG corrupted"), extension="png", size=(320, 320)) is None
@@ -0,0 +1,72 @@
+import hashlib
+import os
+
+import pytest
+from core.upload_handlers import AttachmentUploadHandler
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.http import HttpRequest
+from django.test import RequestFactory
+from django.test.client import MULTIPART_CONTENT
+from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+
+def _upload_request(content: bytes, name: str = "file.txt") -> HttpRequest:
+    return RequestFactory().post("/", data={"file": ContentFile(content, name)}, content_type=MULTIPART_CONTENT)
+
+
+def test_attachment_upload_handler_streams_file() -> None:
+    request = _upload_request(b"Sample content")
+    request.upload_handlers = [AttachmentUploadHandler(request, max_size=1024)]
+
+    file = request.FILES["file"]
+
+    assert isinstance(file, TemporaryUploadedFile)
+    assert file.size == len(b"Sample content")
+    assert file.mime_type == "text/plain"
+    assert file.read() == b"Sample content"
+
+
+def test_attachment_upload_handler_sniffs_first_chunk_only(mocker: MockerFixture) -> None:
+    mock_get_mime_type = mocker.patch("core.upload_handlers.get_mime_type", return_value="application/pdf")
+    content = b"%PDF-1.4" + b"0" * 10_000
+    request = _upload_request(content)
+    handler = AttachmentUploadHandler(request, max_size=len(content))
+    handler.chunk_size = 1024
+    request.upload_handlers = [handler]
+
+    file = request.FILES["file"]
+
+    assert file.mime_type == "application/pdf"
+    mock_get_mime_type.assert_called_once()
+    assert mock_get_mime_type.call_args.args[0].startswith(b"%PDF-1.4")
+
+
+def test_attachment_upload_handler_aborts_when_too_large(mocker: MockerFixture) -> None:
+    request = _upload_request(b"0" * 10_000)
+    handler = AttachmentUploadHandler(request, max_size=2048)
+    handler.chunk_size = 1024
+    request.upload_handlers = [handler]
+    receive_spy = mocker.spy(handler, "receive_data_chunk")
+
+    with pytest.raises(ValidationError) as exc_info:
+        request.FILES
+
+    assert "file" in exc_info.value.message_dict
+    assert receive_spy.call_count < 10_000 // handler.chunk_size
+    assert not os.path.exists(handler.file.temporary_file_path())
+
+
+def test_attachment_upload_handler_hashes_file() -> None:
+    content = b"0" * 10_000
+    request = _upload_request(content)
+    handler = AttachmentUploadHandler(request, max_size=len(content))
+    handler.chunk_size = 1024
+    request.upload_handlers = [handler]
+
+    file = request.FILES["file"]
+
+    assert file.sha256 == hashlib.sha256(content).hexdigest()
@@ -1,4 +1,5 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from core.utils import bytes_to_mib, generate_username, get_file_extension, snake_to_title_case
@@ -16,8 +17,8 @@ def test_generate_username_default_prefix() -> None:
     username = generate_username()
 
     assert username.startswith("user_")
-    assert len(username) == len("user_") + 8
-    assert re.fullmatch(r"user_[0-9a-f]{8}", username)
+    assert len(username) == len("user_") + 32
+    assert re.fullmatch(r"user_[0-9a-f]{32}", username)
 
 
 def test_generate_username_custom_prefix() -> None:
@@ -26,7 +27,14 @@ def test_generate_username_custom_prefix() -> None:
     username = generate_username(prefix)
 
     assert username.startswith(prefix)
-    assert len(username) == len(prefix) + 8
+    assert len(username) == len(prefix) + 32
+
+
+def test_generate_username_is_unique_across_threads() -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        usernames = list(executor.map(lambda _index: generate_username(), range(10_000)))
+
+    assert len(set(usernames)) == len(usernames)
 
 
 def test_bytes_to_mib() -> None:
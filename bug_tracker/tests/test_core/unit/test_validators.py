@@ -1,5 +1,6 @@
 import pytest
-from core.validators import validate_file_size, validate_file_type, validate_mime_type
+from core import validators
+from core.validators import get_mime_type, validate_file_size, validate_file_type, validate_mime_type
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
 from pytest_mock import MockerFixture
@@ -13,20 +14,39 @@ def txt_file() -> SimpleUploadedFile:
 
 
 def test_validate_mime_type_valid(mocker: MockerFixture, txt_file: SimpleUploadedFile) -> None:
-    mocker.patch("core.validators.magic.Magic", return_value=mocker.Mock(from_buffer=lambda _: "text/plain"))
+    mocker.patch("core.validators.get_mime_type", return_value="text/plain")
     allowed = {"txt": "text/plain"}
 
     validate_mime_type(txt_file, allowed_file_types=allowed)
 
 
 def test_validate_mime_type_invalid_mime_type(mocker: MockerFixture, txt_file: SimpleUploadedFile) -> None:
-    mocker.patch("core.validators.magic.Magic", return_value=mocker.Mock(from_buffer=lambda _: "application/pdf"))
+    mocker.patch("core.validators.get_mime_type", return_value="application/pdf")
     allowed = {"txt": "text/plain"}
 
     with pytest.raises(ValidationError):
         validate_mime_type(txt_file, allowed_file_types=allowed)
 
 
+def test_validate_mime_type_uses_sniffed_mime_type(mocker: MockerFixture, txt_file: SimpleUploadedFile) -> None:
+    mock_get_mime_type = mocker.patch("core.validators.get_mime_type")
+    txt_file.mime_type = "text/plain"
+    allowed = {"txt": "text/plain"}
+
+    validate_mime_type(txt_file, allowed_file_types=allowed)
+
+    mock_get_mime_type.assert_not_called()
+
+
+def test_get_mime_type_reuses_handle(mocker: MockerFixture) -> None:
+    validators._get_magic.cache_clear()
+    magic_spy = mocker.spy(validators.magic, "Magic")
+
+    assert get_mime_type(b"%PDF-1.4 sample") == "application/pdf"
+    assert get_mime_type(b"Sample content") == "text/plain"
+    assert magic_spy.call_count == 1
+
+
 def test_validate_file_type_valid(mocker: MockerFixture, txt_file: SimpleUploadedFile) -> None:
     validate_file_type(
         txt_file,
@@ -0,0 +1,52 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from issues.models import Issue
+from projects.models import Project
+from rest_framework import status
+from users.models import CustomUser
+
+pytestmark = pytest.mark.e2e
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+def test_issue_flow_served_by_asgi_application(
+    async_client: AsyncClient, user_with_verified_email: CustomUser, password: str, project: Project
+) -> None:
+    @async_to_sync
+    async def run() -> None:
+        # login as given project manager
+        response = await async_client.post(
+            reverse("rest_login"),
+            data={"username": user_with_verified_email.username, "password": password},
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        headers = {"Authorization": f"Bearer {response.json()['access']}"}
+
+        # create issue
+        issues_url = reverse("issue-list-create", kwargs={"project_id": project.id})
+        create_issue_data = {
+            "title": "new issue",
+            "description": "new issue description",
+            "priority": Issue.Priority.CRITICAL,
+            "issue_type": Issue.Type.BUG,
+            "assigned_to_id": None,
+        }
+        response = await async_client.post(
+            issues_url, data=create_issue_data, content_type="application/json", headers=headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        # new issue should appear in the list
+        response = await async_client.get(issues_url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["count"] == 1
+
+        # the list has not changed since
+        response = await async_client.get(issues_url, headers={**headers, "If-None-Match": response["ETag"]})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    run()
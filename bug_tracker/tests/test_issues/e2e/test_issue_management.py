@@ -98,7 +98,9 @@ def test_issue_management_flow(
     issue_attachments_url = reverse("issue-attachment-list-create", kwargs={"issue_id": issue_id})
     response = client.post(issue_attachments_url, data=attachment_data, content_type=MULTIPART_CONTENT)
     assert response.status_code == status.HTTP_201_CREATED
-    actual_file_name = response.data["url"].split("/")[-1]
+    response = client.get(response.data["url"])
+    assert response.status_code == status.HTTP_200_OK
+    actual_file_name = response["X-Accel-Redirect"].split("/")[-1]
     assert actual_file_name.startswith(file_name)
     assert actual_file_name.endswith(file_extension)
 
@@ -108,7 +110,9 @@ def test_issue_management_flow(
     )
     response = client.post(comment_attachments_url, data=attachment_data, content_type=MULTIPART_CONTENT)
     assert response.status_code == status.HTTP_201_CREATED
-    actual_file_name = response.data["url"].split("/")[-1]
+    response = client.get(response.data["url"])
+    assert response.status_code == status.HTTP_200_OK
+    actual_file_name = response["X-Accel-Redirect"].split("/")[-1]
     assert actual_file_name.startswith(file_name)
     assert actual_file_name.endswith(file_extension)
 
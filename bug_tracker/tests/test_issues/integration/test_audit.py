@@ -0,0 +1,138 @@
+from typing import Iterator
+
+import pytest
+from auditlog.context import set_actor
+from auditlog.models import LogEntry
+from django.conf import Settings
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from issues import audit
+from issues.middleware import HistoryOutboxMiddleware
+from issues.models import Issue, IssueAttachment, IssueComment, IssueHistoryEntry
+from issues.services.command_issue import issue_bulk_update, issue_update
+from issues.tasks import write_history_entries
+from kombu.exceptions import OperationalError
+from pytest_mock import MockerFixture
+from rest_framework.test import APIRequestFactory
+from tests.factories import fake_comment
+from tests.utils import CaptureOnCommitCallbacks
+from users.models import CustomUser
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+AUDITED_MODELS = [Issue, IssueComment, IssueAttachment]
+
+
+@pytest.fixture(autouse=True)
+def buffered_history(settings: Settings) -> Iterator[None]:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    audit.enable_buffered_history(AUDITED_MODELS)
+    yield
+    audit.disable_buffered_history(AUDITED_MODELS)
+
+
+def test_entries_of_outbox_scope_are_written_in_one_task_after_commit(
+    issue_1: Issue,
+    user_1: CustomUser,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    delay_spy = mocker.spy(write_history_entries, "delay")
+    log_count = LogEntry.objects.count()
+
+    with audit.history_outbox_scope():
+        with django_capture_on_commit_callbacks(execute=True):
+            comment = fake_comment(issue=issue_1, author=user_1)
+            issue_update(issue=issue_1, editor=user_1, title="new title")
+            assert LogEntry.objects.count() == log_count
+        delay_spy.assert_not_called()
+
+    delay_spy.assert_called_once()
+    assert len(delay_spy.call_args.args[0]) == 2
+    assert LogEntry.objects.get_for_object(comment).get().action == LogEntry.Action.CREATE
+    assert LogEntry.objects.get_for_object(issue_1).filter(action=LogEntry.Action.UPDATE).exists()
+    assert IssueHistoryEntry.objects.filter(issue_id=issue_1.id).count() == LogEntry.objects.count() - log_count
+
+
+def test_bulk_update_entries_are_written_after_commit(
+    issue_1: Issue, user_1: CustomUser, django_capture_on_commit_callbacks: CaptureOnCommitCallbacks
+) -> None:
+    items = [{"id": issue_1.id, "status": Issue.Status.CLOSED}]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        issue_bulk_update(project=issue_1.project, editor=user_1, items=items)
+        assert not LogEntry.objects.get_for_object(issue_1).filter(action=LogEntry.Action.UPDATE).exists()
+
+    entry = LogEntry.objects.get_for_object(issue_1).filter(action=LogEntry.Action.UPDATE).get()
+    assert IssueHistoryEntry.objects.filter(log_entry=entry, issue_id=issue_1.id).exists()
+
+
+def test_entries_of_rolled_back_savepoint_are_discarded(
+    issue_1: Issue, user_1: CustomUser, django_capture_on_commit_callbacks: CaptureOnCommitCallbacks
+) -> None:
+    with django_capture_on_commit_callbacks(execute=True):
+        kept = fake_comment(issue=issue_1, author=user_1)
+        with pytest.raises(RuntimeError), transaction.atomic():
+            discarded = fake_comment(issue=issue_1, author=user_1)
+            discarded_id = discarded.id
+            raise RuntimeError
+
+    assert LogEntry.objects.get_for_object(kept).exists()
+    assert not LogEntry.objects.filter(content_type__model="issuecomment", object_id=discarded_id).exists()
+
+
+def test_entries_keep_actor(
+    issue_1: Issue, user_1: CustomUser, django_capture_on_commit_callbacks: CaptureOnCommitCallbacks
+) -> None:
+    with django_capture_on_commit_callbacks(execute=True), set_actor(user_1):
+        comment = fake_comment(issue=issue_1, author=user_1)
+
+    entry = LogEntry.objects.get_for_object(comment).get()
+    assert entry.actor == user_1
+
+
+def test_entries_are_written_in_process_if_broker_is_unavailable(
+    issue_1: Issue,
+    user_1: CustomUser,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    mocker.patch.object(write_history_entries, "delay", side_effect=OperationalError("broker down"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        comment = fake_comment(issue=issue_1, author=user_1)
+
+    assert LogEntry.objects.get_for_object(comment).exists()
+
+
+def test_history_outbox_middleware_flushes_entries_after_response(
+    request_factory: APIRequestFactory, mocker: MockerFixture
+) -> None:
+    flush_mock = mocker.patch("issues.audit.flush_history_entries")
+    entry = {"action": LogEntry.Action.CREATE}
+
+    def get_response(_request: HttpRequest) -> HttpResponse:
+        audit._enqueue_committed_entries([entry])
+        flush_mock.assert_not_called()
+        return HttpResponse()
+
+    HistoryOutboxMiddleware(get_response)(request_factory.get("/"))
+
+    flush_mock.assert_called_once_with([entry])
+
+
+def test_redelivered_entries_are_written_once(
+    issue_1: Issue,
+    user_1: CustomUser,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    delay_spy = mocker.spy(write_history_entries, "delay")
+    with django_capture_on_commit_callbacks(execute=True):
+        comment = fake_comment(issue=issue_1, author=user_1)
+    log_count = LogEntry.objects.count()
+
+    write_history_entries(delay_spy.call_args.args[0])
+
+    assert LogEntry.objects.count() == log_count
+    assert LogEntry.objects.get_for_object(comment).count() == 1
@@ -0,0 +1,77 @@
+import pytest
+from issues.change_token import (
+    bump_project_change_token,
+    get_project_change_token,
+    issue_changes_get_version,
+    project_changes_get_version,
+)
+from issues.models import Issue, IssueComment
+from issues.services.command_comment import comment_create
+from issues.services.command_issue import issue_update
+from projects.models import Project
+from pytest_django import DjangoAssertNumQueries
+from tests.factories import fake_user
+from tests.utils import CaptureOnCommitCallbacks
+from users.models import CustomUser
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+def test_bump_project_change_token(
+    project_1: Project, django_capture_on_commit_callbacks: CaptureOnCommitCallbacks
+) -> None:
+    token = get_project_change_token(project_id=project_1.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_project_change_token(project_id=project_1.id)
+
+    assert get_project_change_token(project_id=project_1.id) == token + 2
+
+
+@pytest.mark.django_db
+def test_project_change_token_is_bumped_by_commands(
+    issue_1: Issue, comment_1: IssueComment, user_1: CustomUser
+) -> None:
+    tokens = [get_project_change_token(project_id=issue_1.project_id)]
+
+    issue_update(issue=issue_1, editor=user_1, title="new issue title")
+    tokens.append(get_project_change_token(project_id=issue_1.project_id))
+    comment_create(issue=issue_1, author=user_1, text="new comment")
+    tokens.append(get_project_change_token(project_id=issue_1.project_id))
+
+    assert tokens == sorted(set(tokens))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+def test_project_changes_get_version(
+    project_1: Project, user_1: CustomUser, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    version = project_changes_get_version(project_id=project_1.id, user=user_1, variant="/issues/")
+
+    with django_assert_num_queries(0):
+        assert project_changes_get_version(project_id=project_1.id, user=user_1, variant="/issues/") == version
+    assert project_changes_get_version(project_id=project_1.id, user=user_1, variant="/issues/?page=2") != version
+    bump_project_change_token(project_id=project_1.id)
+    assert project_changes_get_version(project_id=project_1.id, user=user_1, variant="/issues/") != version
+
+
+@pytest.mark.django_db
+def test_project_changes_get_version_without_shared_cache(project_1: Project, user_1: CustomUser) -> None:
+    assert project_changes_get_version(project_id=project_1.id, user=user_1) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+def test_project_changes_get_version_for_non_member(project_1: Project) -> None:
+    assert project_changes_get_version(project_id=project_1.id, user=fake_user()) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+def test_issue_changes_get_version(issue_1: Issue, user_1: CustomUser) -> None:
+    version = issue_changes_get_version(issue_id=issue_1.id, user=user_1)
+
+    assert version == project_changes_get_version(project_id=issue_1.project_id, user=user_1)
+    assert issue_changes_get_version(issue_id=999, user=user_1) is None
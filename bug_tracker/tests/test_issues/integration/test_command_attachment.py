@@ -1,8 +1,28 @@
+import hashlib
+from io import BytesIO
+
 import pytest
-from issues.models import Issue, IssueAttachment, IssueComment
+from core.events import Event
+from core.storage import DirectUploadNotSupported
+from django.conf import Settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from issues.events import ProjectEvent
+from issues.models import AttachmentBlob, Issue, IssueAttachment, IssueComment
 from issues.services import command_attachment, query_attachment
-from issues.services.exceptions import CommentActionNotPermitted, IssueActionNotPermitted
+from issues.services.exceptions import (
+    AttachmentNotUploaded,
+    AttachmentUploadInvalid,
+    CommentActionNotPermitted,
+    IssueActionNotPermitted,
+)
+from PIL import Image
+from pytest_mock import MockerFixture
 from tests.factories import fake_attachment, fake_file
+from tests.utils import CaptureOnCommitCallbacks
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
@@ -92,3 +112,239 @@ def test_comment_attachment_remove_with_not_enough_permission(
 ) -> None:
     with pytest.raises(CommentActionNotPermitted):
         command_attachment.attachment_remove(attachment=attachment_2, requestor=user_2)
+
+
+@pytest.fixture
+def content_addressed(settings: Settings) -> None:
+    settings.ATTACHMENTS_CONTENT_ADDRESSED = True
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("content_addressed")
+def test_attachment_add_stores_content_once(issue_1: Issue, comment_1: IssueComment, user_1: CustomUser) -> None:
+    content = b"Sample content"
+
+    first = command_attachment.attachment_add_to_issue(
+        uploaded_by=user_1, issue=issue_1, file=SimpleUploadedFile("first.txt", content)
+    )
+    second = command_attachment.attachment_add_to_comment(
+        uploaded_by=user_1, comment=comment_1, file=SimpleUploadedFile("second.txt", content)
+    )
+
+    blob = AttachmentBlob.objects.get()
+    assert blob.digest == hashlib.sha256(content).hexdigest()
+    assert blob.size == len(content)
+    assert first.blob == second.blob == blob
+    assert first.file.name == second.file.name == blob.file.name
+    assert (first.name, second.name) == ("first.txt", "second.txt")
+    assert blob.file.read() == content
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("content_addressed")
+def test_attachment_add_uses_streamed_digest(issue_1: Issue, user_1: CustomUser) -> None:
+    file = SimpleUploadedFile("file.txt", b"Sample content")
+    file.sha256 = "0" * 64
+
+    attachment = command_attachment.attachment_add_to_issue(uploaded_by=user_1, issue=issue_1, file=file)
+
+    assert attachment.blob_id == "0" * 64
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("content_addressed")
+def test_attachment_remove_deletes_blob_with_last_reference(
+    issue_1: Issue,
+    comment_1: IssueComment,
+    user_1: CustomUser,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    first, second = [
+        command_attachment.attachment_add_to_issue(
+            uploaded_by=user_1, issue=issue_1, file=SimpleUploadedFile(f"{name}.txt", b"Sample content")
+        )
+        for name in ("first", "second")
+    ]
+    storage, name = first.file.storage, first.file.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        command_attachment.attachment_remove(attachment=first, requestor=user_1)
+
+    assert AttachmentBlob.objects.filter(digest=second.blob_id).exists()
+    assert storage.exists(name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        command_attachment.attachment_remove(attachment=second, requestor=user_1)
+
+    assert not AttachmentBlob.objects.exists()
+    assert not storage.exists(name)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("content_addressed")
+def test_attachment_remove_keeps_blob_file_on_rollback(
+    issue_1: Issue, user_1: CustomUser, django_capture_on_commit_callbacks: CaptureOnCommitCallbacks
+) -> None:
+    attachment = command_attachment.attachment_add_to_issue(
+        uploaded_by=user_1, issue=issue_1, file=SimpleUploadedFile("first.txt", b"Sample content")
+    )
+    storage, name = attachment.file.storage, attachment.file.name
+
+    with django_capture_on_commit_callbacks(execute=True), pytest.raises(IntegrityError):
+        with transaction.atomic():
+            command_attachment.attachment_remove(attachment=attachment, requestor=user_1)
+            raise IntegrityError
+
+    assert AttachmentBlob.objects.filter(digest=attachment.blob_id).exists()
+    assert storage.exists(name)
+
+
+@pytest.fixture
+def presigned_upload(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "issues.services.command_attachment.generate_presigned_upload",
+        return_value={"url": "http://bucket.s3.local/", "fields": {"key": "key"}},
+    )
+
+
+@pytest.mark.django_db
+def test_attachment_upload_start_not_supported(issue_1: Issue, user_1: CustomUser) -> None:
+    with pytest.raises(DirectUploadNotSupported):
+        command_attachment.attachment_upload_start_for_issue(file_name="file.txt", uploaded_by=user_1, issue=issue_1)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("presigned_upload")
+def test_attachment_upload_start_invalid_extension(issue_1: Issue, user_1: CustomUser) -> None:
+    with pytest.raises(ValidationError):
+        command_attachment.attachment_upload_start_for_issue(file_name="file.ini", uploaded_by=user_1, issue=issue_1)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("presigned_upload")
+def test_attachment_upload_start_with_not_enough_permission(comment_1: IssueComment, user_2: CustomUser) -> None:
+    with pytest.raises(CommentActionNotPermitted):
+        command_attachment.attachment_upload_start_for_comment(
+            file_name="file.txt", uploaded_by=user_2, comment=comment_1
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("presigned_upload")
+def test_attachment_upload_confirm(comment_1: IssueComment, user_1: CustomUser) -> None:
+    upload = command_attachment.attachment_upload_start_for_comment(
+        file_name="file.txt", uploaded_by=user_1, comment=comment_1
+    )
+    name = signing.loads(upload.token, salt=command_attachment.UPLOAD_TOKEN_SALT)["name"]
+    IssueAttachment.file.field.storage.save(name, ContentFile(b"Sample content"))
+
+    attachment = command_attachment.attachment_upload_confirm_for_comment(
+        token=upload.token, uploaded_by=user_1, comment=comment_1
+    )
+
+    assert attachment.file.name == name
+    assert name.endswith("/file.txt")
+    assert attachment.comment == comment_1
+    assert attachment.extension == "txt"
+
+    with pytest.raises(AttachmentUploadInvalid):
+        command_attachment.attachment_upload_confirm_for_comment(
+            token=upload.token, uploaded_by=user_1, comment=comment_1
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("presigned_upload")
+def test_attachment_upload_confirm_not_uploaded(issue_1: Issue, user_1: CustomUser) -> None:
+    upload = command_attachment.attachment_upload_start_for_issue(
+        file_name="file.txt", uploaded_by=user_1, issue=issue_1
+    )
+
+    with pytest.raises(AttachmentNotUploaded):
+        command_attachment.attachment_upload_confirm_for_issue(token=upload.token, uploaded_by=user_1, issue=issue_1)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("presigned_upload")
+def test_attachment_upload_confirm_token_for_other_target(
+    issue_1: Issue, comment_1: IssueComment, user_1: CustomUser
+) -> None:
+    upload = command_attachment.attachment_upload_start_for_comment(
+        file_name="file.txt", uploaded_by=user_1, comment=comment_1
+    )
+
+    with pytest.raises(AttachmentUploadInvalid):
+        command_attachment.attachment_upload_confirm_for_issue(token=upload.token, uploaded_by=user_1, issue=issue_1)
+    with pytest.raises(AttachmentUploadInvalid):
+        command_attachment.attachment_upload_confirm_for_issue(token="invalid", uploaded_by=user_1, issue=issue_1)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("presigned_upload")
+def test_attachment_upload_confirm_invalid_mime_type(issue_1: Issue, user_1: CustomUser) -> None:
+    upload = command_attachment.attachment_upload_start_for_issue(
+        file_name="file.txt", uploaded_by=user_1, issue=issue_1
+    )
+    name = signing.loads(upload.token, salt=command_attachment.UPLOAD_TOKEN_SALT)["name"]
+    storage = IssueAttachment.file.field.storage
+    storage.save(name, ContentFile(b"%PDF-1.4 content"))
+
+    with pytest.raises(ValidationError):
+        command_attachment.attachment_upload_confirm_for_issue(token=upload.token, uploaded_by=user_1, issue=issue_1)
+
+    assert not storage.exists(name)
+
+
+@pytest.mark.django_db
+def test_attachment_add_generates_thumbnail(
+    issue_1: Issue,
+    user_1: CustomUser,
+    settings: Settings,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    publish_mock = mocker.patch("core.events._publish")
+    content = BytesIO()
+    Image.new("RGB", (1000, 500), "red").save(content, format="PNG")
+    file = SimpleUploadedFile("image.png", content.getvalue())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        attachment = command_attachment.attachment_add_to_issue(uploaded_by=user_1, issue=issue_1, file=file)
+
+    attachment.refresh_from_db()
+    assert attachment.thumbnail.name == attachment.file.name.removesuffix(".png") + ".thumbnail.jpg"
+    assert Image.open(attachment.thumbnail).size == (320, 160)
+    publish_mock.assert_called_with(
+        Event(
+            type=ProjectEvent.ATTACHMENT_THUMBNAIL_CREATED.value,
+            channel=f"project:{issue_1.project_id}",
+            data={
+                "project_id": issue_1.project_id,
+                "issue_id": issue_1.id,
+                "comment_id": None,
+                "attachment_id": attachment.id,
+            },
+        )
+    )
+    storage, name = attachment.thumbnail.storage, attachment.thumbnail.name
+
+    command_attachment.attachment_remove(attachment=attachment, requestor=user_1)
+
+    assert not storage.exists(name)
+
+
+@pytest.mark.django_db
+def test_attachment_add_skips_thumbnail_for_text(
+    issue_1: Issue,
+    user_1: CustomUser,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    mock_task = mocker.patch("issues.services.command_attachment.generate_attachment_thumbnail")
+    file, _ = fake_file()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        command_attachment.attachment_add_to_issue(uploaded_by=user_1, issue=issue_1, file=file)
+
+    mock_task.delay.assert_not_called()
@@ -1,15 +1,27 @@
 import pytest
 from auditlog.models import LogEntry
-from issues.models import Issue
+from issues.models import Issue, IssueComment, IssueHistoryEntry
 from issues.services import command_history
 
 pytestmark = pytest.mark.integration
 
 
 @pytest.mark.django_db
-def test_history_add_issue_id_to_entry(issue_1: Issue) -> None:
+def test_history_link_entry_to_issue(issue_1: Issue) -> None:
     entry = LogEntry.objects.log_create(instance=issue_1, force_log=True, action=LogEntry.Action.ACCESS)
 
-    command_history.history_add_issue_id_to_entry(log_entry=entry, issue_id=issue_1.id)
+    command_history.history_link_entry_to_issue(log_entry=entry)
 
-    assert entry.additional_data["issue_id"] == issue_1.id
+    assert IssueHistoryEntry.objects.filter(log_entry=entry, issue_id=issue_1.id).exists()
+
+
+@pytest.mark.django_db
+def test_history_backfill_entries_links_only_missing_entries(issue_1: Issue, comment_1: IssueComment) -> None:
+    unlinked = list(IssueHistoryEntry.objects.values_list("log_entry_id", flat=True))
+    IssueHistoryEntry.objects.filter(log_entry_id=unlinked[0]).delete()
+
+    created = command_history.history_backfill_entries(batch_size=1)
+
+    assert created == 1
+    assert set(IssueHistoryEntry.objects.values_list("log_entry_id", flat=True)) == set(unlinked)
+    assert set(IssueHistoryEntry.objects.values_list("issue_id", flat=True)) == {issue_1.id}
@@ -1,7 +1,14 @@
 import pytest
+from auditlog.context import set_actor
+from auditlog.models import LogEntry
+from core.events import Event
+from django.conf import Settings
 from django.core import mail
 from django.core.exceptions import ValidationError
-from issues.models import Issue
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from issues.events import ProjectEvent
+from issues.models import Issue, IssueHistoryEntry
 from issues.services import command_issue, query_issue
 from issues.services.exceptions import (
     AssigneeDoesNotExistWithinProject,
@@ -10,8 +17,9 @@ from issues.services.exceptions import (
 )
 from projects.models import Project, ProjectRole
 from projects.services import command_member
+from pytest_mock import MockerFixture
 from tests.factories import fake_issue, fake_user
-from tests.utils import clear_outbox
+from tests.utils import CaptureOnCommitCallbacks, clear_outbox
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
@@ -58,14 +66,41 @@ def test_issue_create_does_not_send_mail_if_no_assignment(
 
 
 @pytest.mark.django_db
-def test_issue_create_sends_mail_if_assigned(user_1: CustomUser, project_1: Project) -> None:
-    issue = fake_issue(project=project_1, user=user_1, assigned_to_id=user_1.id)
+def test_issue_create_sends_mail_if_assigned(
+    user_1: CustomUser,
+    project_1: Project,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    with django_capture_on_commit_callbacks(execute=True):
+        issue = fake_issue(project=project_1, user=user_1, assigned_to_id=user_1.id)
+        assert len(mail.outbox) == 0
 
     assert issue.assigned_to == user_1
     assert len(mail.outbox) == 1
     assert mail.outbox[0].to[0] == user_1.email
 
 
+@pytest.mark.django_db
+def test_issue_create_does_not_send_mail_if_rolled_back(
+    user_1: CustomUser,
+    project_1: Project,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            fake_issue(project=project_1, user=user_1, assigned_to_id=user_1.id)
+            raise RuntimeError
+
+    assert len(callbacks) == 0
+    assert len(mail.outbox) == 0
+
+
 @pytest.mark.django_db
 def test_issue_create_with_invalid_data(user_1: CustomUser, project_1: Project) -> None:
     with pytest.raises(ValidationError):
@@ -151,6 +186,29 @@ def test_issue_remove(issue_1: Issue, user_1: CustomUser) -> None:
     assert issue is None
 
 
+@pytest.mark.django_db
+def test_issue_remove_publishes_event_after_commit(
+    issue_1: Issue,
+    user_1: CustomUser,
+    mocker: MockerFixture,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    publish_mock = mocker.patch("core.events._publish")
+    issue_id = issue_1.id
+
+    with django_capture_on_commit_callbacks(execute=True):
+        command_issue.issue_remove(issue=issue_1, editor=user_1)
+        publish_mock.assert_not_called()
+
+    publish_mock.assert_called_once_with(
+        Event(
+            type=ProjectEvent.ISSUE_REMOVED.value,
+            channel=f"project:{issue_1.project_id}",
+            data={"project_id": issue_1.project_id, "issue_id": issue_id},
+        )
+    )
+
+
 @pytest.mark.django_db
 def test_issue_remove_with_not_enough_permission(issue_1: Issue, user_2: CustomUser) -> None:
     with pytest.raises(IssueActionNotPermitted):
@@ -210,10 +268,18 @@ def test_issue_assign_to_none(issue_1: Issue, user_1: CustomUser) -> None:
 
 
 @pytest.mark.django_db
-def test_issue_assign_to_someone(issue_1: Issue, user_1: CustomUser, user_reporter: CustomUser) -> None:
+def test_issue_assign_to_someone(
+    issue_1: Issue,
+    user_1: CustomUser,
+    user_reporter: CustomUser,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
     clear_outbox()
 
-    updated_issue = command_issue.issue_assign(issue=issue_1, editor=user_1, assigned_to_id=user_reporter.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        updated_issue = command_issue.issue_assign(issue=issue_1, editor=user_1, assigned_to_id=user_reporter.id)
 
     assert updated_issue.assigned_to == user_reporter
     assert len(mail.outbox) == 1
@@ -246,3 +312,108 @@ def test_issue_assign_assignee_not_member_of_project_should_fail(
 def test_issue_assign_with_not_enough_permission(issue_1: Issue, user_reporter: CustomUser) -> None:
     with pytest.raises(IssueActionNotPermitted):
         command_issue.issue_assign(issue=issue_1, editor=user_reporter, assigned_to_id=user_reporter.id)
+
+
+@pytest.mark.django_db
+def test_issue_bulk_update(issue_1: Issue, issue_2: Issue, user_1: CustomUser, project_1: Project) -> None:
+    items = [
+        {"id": issue_1.id, "status": Issue.Status.CLOSED, "priority": issue_1.priority},
+        {"id": issue_2.id, "priority": issue_2.priority},
+        {"id": 999, "status": Issue.Status.CLOSED},
+    ]
+
+    with set_actor(user_1):
+        results = command_issue.issue_bulk_update(project=project_1, editor=user_1, items=items)
+
+    assert [(r.id, r.result) for r in results] == [
+        (issue_1.id, command_issue.BulkResult.UPDATED),
+        (issue_2.id, command_issue.BulkResult.UNCHANGED),
+        (999, command_issue.BulkResult.NOT_FOUND),
+    ]
+    issue_1.refresh_from_db()
+    assert issue_1.status == Issue.Status.CLOSED
+    entry = LogEntry.objects.get_for_object(issue_1).filter(action=LogEntry.Action.UPDATE).get()
+    assert entry.actor == user_1
+    assert entry.changes_dict["status"][1] == str(Issue.Status.CLOSED.value)
+    assert IssueHistoryEntry.objects.filter(log_entry=entry, issue_id=issue_1.id).exists()
+    assert not LogEntry.objects.get_for_object(issue_2).filter(action=LogEntry.Action.UPDATE).exists()
+
+
+@pytest.mark.django_db
+def test_issue_bulk_update_reports_forbidden_and_invalid_items(
+    issue_1: Issue, user_1: CustomUser, user_reporter: CustomUser, project_1: Project
+) -> None:
+    own_issue = fake_issue(project=project_1, user=user_reporter)
+    items = [{"id": issue_1.id, "status": Issue.Status.CLOSED}, {"id": own_issue.id, "priority": 99}]
+
+    results = command_issue.issue_bulk_update(project=project_1, editor=user_reporter, items=items)
+
+    assert [(r.id, r.result) for r in results] == [
+        (issue_1.id, command_issue.BulkResult.FORBIDDEN),
+        (own_issue.id, command_issue.BulkResult.INVALID),
+    ]
+    assert "priority" in results[1].errors
+    issue_1.refresh_from_db()
+    assert issue_1.status != Issue.Status.CLOSED
+
+
+@pytest.mark.django_db
+def test_issue_bulk_update_query_count_does_not_depend_on_item_count(user_1: CustomUser, project_1: Project) -> None:
+    issues = [fake_issue(project=project_1, user=user_1) for _ in range(6)]
+
+    def bulk_close(count: int) -> int:
+        items = [{"id": issue.id, "status": Issue.Status.CLOSED} for issue in issues[:count]]
+        Issue.objects.update(status=Issue.Status.OPEN)
+        with CaptureQueriesContext(connection) as context:
+            command_issue.issue_bulk_update(project=project_1, editor=user_1, items=items)
+        return len(context.captured_queries)
+
+    assert bulk_close(2) == bulk_close(6)
+
+
+@pytest.mark.django_db
+def test_issue_bulk_assign(
+    issue_1: Issue,
+    issue_2: Issue,
+    user_1: CustomUser,
+    user_reporter: CustomUser,
+    user_not_member: CustomUser,
+    project_1: Project,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    third_issue = fake_issue(project=project_1, user=user_1)
+    items = [
+        {"id": issue_1.id, "assigned_to_id": user_reporter.id},
+        {"id": issue_2.id, "assigned_to_id": user_not_member.id},
+        {"id": third_issue.id, "assigned_to_id": None},
+    ]
+    clear_outbox()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        results = command_issue.issue_bulk_assign(project=project_1, editor=user_1, items=items)
+
+    assert [(r.id, r.result) for r in results] == [
+        (issue_1.id, command_issue.BulkResult.UPDATED),
+        (issue_2.id, command_issue.BulkResult.INVALID),
+        (third_issue.id, command_issue.BulkResult.UNCHANGED),
+    ]
+    assert "assigned_to_id" in results[1].errors
+    issue_1.refresh_from_db()
+    assert issue_1.assigned_to == user_reporter
+    assert [email.to for email in mail.outbox] == [[user_reporter.email]]
+    assert LogEntry.objects.get_for_object(issue_1).filter(action=LogEntry.Action.UPDATE).count() == 1
+
+
+@pytest.mark.django_db
+def test_issue_bulk_assign_with_not_enough_permission(
+    issue_1: Issue, user_1: CustomUser, user_reporter: CustomUser, project_1: Project
+) -> None:
+    items = [{"id": issue_1.id, "assigned_to_id": user_1.id}]
+
+    results = command_issue.issue_bulk_assign(project=project_1, editor=user_reporter, items=items)
+
+    assert results[0].result == command_issue.BulkResult.FORBIDDEN
+    issue_1.refresh_from_db()
+    assert issue_1.assigned_to is None
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import Settings
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.db.models import QuerySet
+from issues.filters import IssueFilter, IssueOrdering
+from issues.models import Issue, IssueAttachment, IssueHistoryEntry
+from issues.services import command_attachment
+from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+def test_backfill_issue_history(issue_1: Issue, capsys: pytest.CaptureFixture[str]) -> None:
+    IssueHistoryEntry.objects.all().delete()
+
+    call_command("backfill_issue_history", batch_size=10)
+
+    captured = capsys.readouterr()
+    assert "Linked 1 history entries" in captured.out
+    assert IssueHistoryEntry.objects.filter(issue_id=issue_1.id).count() == 1
+
+
+@pytest.mark.django_db
+def test_delete_unconfirmed_uploads(
+    issue_1: Issue, settings: Settings, mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # The in-memory storage is shared by all tests
+    settings.ATTACHMENTS_BASE_PATH = "unconfirmed-uploads"
+    mocker.patch.object(command_attachment, "UPLOAD_TOKEN_MAX_AGE", timedelta(seconds=-1))
+    storage = IssueAttachment.file.field.storage
+    directory = f"unconfirmed-uploads/issue-{issue_1.id}"
+    unconfirmed = storage.save(f"{directory}/{'a' * 32}/unconfirmed.txt", ContentFile(b"Sample content"))
+    confirmed = storage.save(f"{directory}/{'b' * 32}/confirmed.png", ContentFile(b"Sample content"))
+    thumbnail = storage.save(f"{directory}/{'b' * 32}/confirmed.thumbnail.jpg", ContentFile(b"Sample content"))
+    uploaded = storage.save(f"{directory}/uploaded.txt", ContentFile(b"Sample content"))
+    IssueAttachment.objects.create(
+        issue=issue_1, uploaded_by=issue_1.created_by, file=confirmed, thumbnail=thumbnail, name="confirmed.png"
+    )
+
+    call_command("delete_unconfirmed_uploads", batch_size=1)
+
+    assert "Deleted 1 unconfirmed uploads" in capsys.readouterr().out
+    assert not storage.exists(unconfirmed)
+    assert all(storage.exists(name) for name in (confirmed, thumbnail, uploaded))
+
+
+@pytest.mark.django_db
+def test_explain_issue_list_reports_every_combination(issue_1: Issue, capsys: pytest.CaptureFixture[str]) -> None:
+    call_command("explain_issue_list", verbosity=2)
+
+    lines = capsys.readouterr().out.splitlines()
+    combinations = len(IssueFilter.base_filters) * len(IssueOrdering.fields)
+    assert len([line for line in lines if line.startswith(("Sequential scan:", "Index scan:"))]) == combinations
+    assert "Index scan: order_by=-created_at" in lines
+
+
+@pytest.mark.django_db
+def test_explain_issue_list_fails_on_sequential_scans(issue_1: Issue, mocker: MockerFixture) -> None:
+    mocker.patch.object(QuerySet, "explain", return_value="2 0 0 SCAN issues_issue")
+
+    with pytest.raises(CommandError, match="scan the issues table sequentially"):
+        call_command("explain_issue_list", project=issue_1.project_id, fail=True)
+
+
+@pytest.mark.django_db
+def test_explain_issue_list_without_issues() -> None:
+    with pytest.raises(CommandError, match="No issues"):
+        call_command("explain_issue_list")
@@ -1,20 +1,32 @@
 import pytest
 from django.core import mail
 from issues.services.emails import send_issue_assignment_notification_email
+from projects.models import Project
+from tests.factories import fake_issue
+from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
 
 
 @pytest.mark.django_db
-def test_send_invitation_email_for_existing_user_integration() -> None:
-    send_issue_assignment_notification_email(
-        email="existinguser@example.com",
-        issue_title="Some Issue Title",
-        issue_id=1,
-    )
+def test_send_issue_assignment_notification_email_integration(user_1: CustomUser, project_1: Project) -> None:
+    issue = fake_issue(project=project_1, user=user_1, assigned_to_id=user_1.id)
+
+    send_issue_assignment_notification_email(issue_id=issue.id, assignee_id=user_1.id)
 
     assert len(mail.outbox) == 1
     email = mail.outbox[0]
-    assert "Some Issue Title" in email.subject
-    assert "existinguser@example.com" in email.to
-    assert "Some Issue Title" in email.body
+    assert issue.title in email.subject
+    assert user_1.email in email.to
+    assert issue.title in email.body
+
+
+@pytest.mark.django_db
+def test_send_issue_assignment_notification_email_skips_reassigned_issue(
+    user_1: CustomUser, user_2: CustomUser, project_1: Project
+) -> None:
+    issue = fake_issue(project=project_1, user=user_1, assigned_to_id=user_1.id)
+
+    send_issue_assignment_notification_email(issue_id=issue.id, assignee_id=user_2.id)
+
+    assert len(mail.outbox) == 0
@@ -1,7 +1,12 @@
 import pytest
+from auditlog.models import LogEntry
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from issues.models import Issue, IssueAttachment
+from tests.factories import fake_comment
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
@@ -9,7 +14,9 @@ pytestmark = pytest.mark.integration
 
 @pytest.mark.django_db
 def test_issue_url(attachment: IssueAttachment) -> None:
-    assert attachment.url == attachment.file.url
+    assert attachment.url == reverse(
+        "attachment-download", kwargs={"issue_id": attachment.issue_id, "attachment_id": attachment.id}
+    )
 
 
 @pytest.mark.django_db
@@ -25,3 +32,20 @@ def test_file_is_deleted_with_attachment_instance(issue: Issue, user_with_verifi
     attachment.delete()
 
     assert not default_storage.exists(file_name)
+
+
+@pytest.mark.django_db
+def test_history_entry_is_written_with_issue_id_in_a_single_insert(
+    issue: Issue, user_with_verified_email: CustomUser
+) -> None:
+    log_table = LogEntry._meta.db_table
+
+    with CaptureQueriesContext(connection) as context:
+        comment = fake_comment(issue=issue, author=user_with_verified_email)
+
+    log_writes = [query["sql"] for query in context.captured_queries if log_table in query["sql"]]
+    assert len(log_writes) == 1
+    assert log_writes[0].startswith("INSERT")
+    entry = LogEntry.objects.get_for_object(comment).get()
+    assert entry.additional_data == {"issue_id": issue.id}
+    assert entry.issue_history_entry.issue_id == issue.id
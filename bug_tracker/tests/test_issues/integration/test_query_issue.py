@@ -2,6 +2,7 @@ import pytest
 from issues.models import Issue
 from issues.services import query_issue
 from projects.models import Project
+from tests.factories import fake_issue
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
@@ -55,3 +56,30 @@ def test_issue_list_returns_empty_if_invalid_project_id(project_1: Project, user
     issues = query_issue.issue_list(project_id=999, user=user_1)
 
     assert issues.count() == 0
+
+
+@pytest.mark.django_db
+def test_issue_list_search_matches_title_and_description(
+    issue_1: Issue, issue_2: Issue, user_1: CustomUser, project_1: Project
+) -> None:
+    Issue.objects.filter(id=issue_1.id).update(title="Login button is broken")
+    Issue.objects.filter(id=issue_2.id).update(description="Clicking the LOGIN button does nothing")
+    fake_issue(project=project_1, user=user_1)
+
+    issues = query_issue.issue_list(project_id=project_1.id, user=user_1, filters={"search": "login"})
+
+    assert {i.id for i in issues} == {issue_1.id, issue_2.id}
+
+
+@pytest.mark.django_db
+def test_issue_list_search_keeps_requested_ordering(
+    issue_1: Issue, issue_2: Issue, user_1: CustomUser, project_1: Project
+) -> None:
+    Issue.objects.filter(id=issue_1.id).update(title="b login")
+    Issue.objects.filter(id=issue_2.id).update(title="a login")
+
+    issues = query_issue.issue_list(
+        project_id=project_1.id, user=user_1, filters={"search": "login", "order_by": "-title"}
+    )
+
+    assert [i.id for i in issues] == [issue_1.id, issue_2.id]
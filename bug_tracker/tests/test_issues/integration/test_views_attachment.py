@@ -1,13 +1,22 @@
 import pytest
+from core import upload_handlers, validators
+from django.conf import Settings
 from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
 from django.urls import reverse
 from issues.models import Issue, IssueAttachment, IssueComment
+from issues.services.command_attachment import attachment_add_to_issue
 from issues.views.attachment import (
     AttachmentDetailDeleteView,
+    AttachmentDownloadView,
+    AttachmentThumbnailView,
     CommentAttachmentListCreateView,
+    CommentAttachmentUploadConfirmView,
     IssueAttachmentListCreateView,
+    IssueAttachmentUploadView,
 )
+from pytest_mock import MockerFixture
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
 from users.models import CustomUser
@@ -29,7 +38,7 @@ def test_attachment_detail_success(
     response = view(request, issue_id=attachment_1.issue.id, attachment_id=attachment_1.id)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["url"] == attachment_1.url
+    assert response.data["url"] == f"http://testserver{attachment_1.url}"
 
 
 @pytest.mark.django_db
@@ -91,7 +100,7 @@ def test_comment_attachment_list_success(
 
     assert response.status_code == status.HTTP_200_OK
     assert response.data["count"] == 1
-    assert response.data["results"][0]["url"] == attachment_2.url
+    assert response.data["results"][0]["url"] == f"http://testserver{attachment_2.url}"
 
 
 @pytest.mark.django_db
@@ -138,6 +147,7 @@ def test_issue_attachment_list_success(
     attachment_1: IssueAttachment, user_1: CustomUser, request_factory: APIRequestFactory
 ) -> None:
     url = reverse("issue-attachment-list-create", kwargs={"issue_id": attachment_1.issue.id})
+    attachment_1.thumbnail.save("thumbnail.jpg", ContentFile(b"thumbnail"))
 
     request = request_factory.get(url)
     force_authenticate(request, user=user_1)
@@ -146,7 +156,9 @@ def test_issue_attachment_list_success(
 
     assert response.status_code == status.HTTP_200_OK
     assert response.data["count"] == 1
-    assert response.data["results"][0]["url"] == attachment_1.url
+    # The client is served from another origin, so the URLs are absolute
+    assert response.data["results"][0]["url"] == f"http://testserver{attachment_1.url}"
+    assert response.data["results"][0]["thumbnail_url"] == f"http://testserver{attachment_1.thumbnail_url}"
 
 
 @pytest.mark.django_db
@@ -187,3 +199,188 @@ def test_issue_attachment_create_failure(
     response = view(request, issue_id=issue_1.id)
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_issue_attachment_create_too_large(
+    user_1: CustomUser, issue_1: Issue, request_factory: APIRequestFactory, settings: Settings
+) -> None:
+    settings.ATTACHMENTS_MAX_SIZE = 16
+    url = reverse("issue-attachment-list-create", kwargs={"issue_id": issue_1.id})
+    data = encode_multipart(boundary=BOUNDARY, data={"file": ContentFile(b"0" * 17, "test.txt")})
+
+    request = request_factory.post(url, data=data, content_type=MULTIPART_CONTENT)
+    force_authenticate(request, user=user_1)
+    view = IssueAttachmentListCreateView.as_view()
+    response = view(request, issue_id=issue_1.id)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "file" in response.data["detail"]
+    assert not IssueAttachment.objects.filter(issue=issue_1).exists()
+
+
+@pytest.mark.django_db
+def test_comment_attachment_create_sniffs_mime_type_once(
+    user_1: CustomUser, comment_1: IssueComment, request_factory: APIRequestFactory, mocker: MockerFixture
+) -> None:
+    validator_spy = mocker.spy(validators, "get_mime_type")
+    upload_handler_spy = mocker.spy(upload_handlers, "get_mime_type")
+    url = reverse("comment-attachment-list-create", kwargs={"issue_id": comment_1.issue.id, "comment_id": comment_1.id})
+    data = encode_multipart(boundary=BOUNDARY, data={"file": ContentFile(b"%PDF-1.4 content", "test.txt")})
+
+    request = request_factory.post(url, data=data, content_type=MULTIPART_CONTENT)
+    force_authenticate(request, user=user_1)
+    view = CommentAttachmentListCreateView.as_view()
+    response = view(request, issue_id=comment_1.issue.id, comment_id=comment_1.id)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "file" in response.data["detail"]
+    # Sniffed by the upload handler while the file streams, and not again by the validator
+    assert upload_handler_spy.call_count == 1
+    assert validator_spy.call_count + upload_handler_spy.call_count == 1
+
+
+@pytest.mark.django_db
+def test_issue_attachment_upload_not_supported(
+    user_1: CustomUser, issue_1: Issue, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("issue-attachment-upload", kwargs={"issue_id": issue_1.id})
+
+    request = request_factory.post(url, data={"file_name": "file.txt"}, format="json")
+    force_authenticate(request, user=user_1)
+    view = IssueAttachmentUploadView.as_view()
+    response = view(request, issue_id=issue_1.id)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.django_db
+def test_comment_attachment_upload_confirm_invalid_token(
+    user_1: CustomUser, comment_1: IssueComment, request_factory: APIRequestFactory
+) -> None:
+    kwargs = {"issue_id": comment_1.issue.id, "comment_id": comment_1.id}
+    url = reverse("comment-attachment-upload-confirm", kwargs=kwargs)
+
+    request = request_factory.post(url, data={"token": "invalid"}, format="json")
+    force_authenticate(request, user=user_1)
+    view = CommentAttachmentUploadConfirmView.as_view()
+    response = view(request, **kwargs)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.django_db
+def test_attachment_download_accel_redirect(
+    request_factory: APIRequestFactory, attachment_1: IssueAttachment, user_1: CustomUser, settings: Settings
+) -> None:
+    settings.MEDIA_ACCEL_REDIRECT_LOCATION = "/internal/media/"
+    kwargs = {"issue_id": attachment_1.issue.id, "attachment_id": attachment_1.id}
+
+    request = request_factory.get(reverse("attachment-download", kwargs=kwargs), HTTP_ACCEPT="text/plain")
+    force_authenticate(request, user=user_1)
+    response = AttachmentDownloadView.as_view()(request, **kwargs)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["X-Accel-Redirect"] == f"/internal/media/{attachment_1.file.name}"
+    assert response["Content-Type"] == "text/plain"
+    assert response["Content-Disposition"].startswith("attachment;")
+    assert response["ETag"] and response["Last-Modified"]
+    assert response.content == b""
+
+
+@pytest.mark.django_db
+def test_attachment_download_streams_without_accel_redirect(
+    request_factory: APIRequestFactory, attachment_1: IssueAttachment, user_1: CustomUser, settings: Settings
+) -> None:
+    settings.MEDIA_ACCEL_REDIRECT_LOCATION = ""
+    kwargs = {"issue_id": attachment_1.issue.id, "attachment_id": attachment_1.id}
+
+    request = request_factory.get(reverse("attachment-download", kwargs=kwargs))
+    force_authenticate(request, user=user_1)
+    response = AttachmentDownloadView.as_view()(request, **kwargs)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Accel-Redirect" not in response
+    assert b"".join(response.streaming_content) == attachment_1.file.open("rb").read()
+
+
+@pytest.mark.django_db
+def test_attachment_download_uses_uploaded_name(
+    request_factory: APIRequestFactory, issue_1: Issue, user_1: CustomUser, settings: Settings
+) -> None:
+    settings.ATTACHMENTS_CONTENT_ADDRESSED = True
+    attachment = attachment_add_to_issue(
+        uploaded_by=user_1, issue=issue_1, file=SimpleUploadedFile("notes.txt", b"Sample content")
+    )
+    kwargs = {"issue_id": issue_1.id, "attachment_id": attachment.id}
+
+    request = request_factory.get(reverse("attachment-download", kwargs=kwargs))
+    force_authenticate(request, user=user_1)
+    response = AttachmentDownloadView.as_view()(request, **kwargs)
+
+    assert attachment.file.name.endswith(f"{attachment.blob.digest}.txt")
+    assert str(attachment) == "notes.txt"
+    assert response["Content-Disposition"] == 'attachment; filename="notes.txt"'
+
+
+@pytest.mark.django_db
+def test_attachment_download_conditional(
+    request_factory: APIRequestFactory, attachment_1: IssueAttachment, user_1: CustomUser
+) -> None:
+    kwargs = {"issue_id": attachment_1.issue.id, "attachment_id": attachment_1.id}
+    url = reverse("attachment-download", kwargs=kwargs)
+    view = AttachmentDownloadView.as_view()
+
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    etag = view(request, **kwargs)["ETag"]
+
+    request = request_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    not_modified = view(request, **kwargs)
+
+    request = request_factory.get(url, HTTP_IF_MATCH='"other"')
+    force_authenticate(request, user=user_1)
+    precondition_failed = view(request, **kwargs)
+
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified["ETag"] == etag
+    assert "X-Accel-Redirect" not in not_modified
+    assert precondition_failed.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+
+@pytest.mark.django_db
+def test_attachment_download_not_member(
+    request_factory: APIRequestFactory, attachment_1: IssueAttachment, user_2: CustomUser
+) -> None:
+    kwargs = {"issue_id": attachment_1.issue.id, "attachment_id": attachment_1.id}
+
+    request = request_factory.get(reverse("attachment-download", kwargs=kwargs))
+    force_authenticate(request, user=user_2)
+    response = AttachmentDownloadView.as_view()(request, **kwargs)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_attachment_thumbnail(
+    request_factory: APIRequestFactory, attachment_1: IssueAttachment, user_1: CustomUser
+) -> None:
+    kwargs = {"issue_id": attachment_1.issue.id, "attachment_id": attachment_1.id}
+    url = reverse("attachment-thumbnail", kwargs=kwargs)
+    view = AttachmentThumbnailView.as_view()
+
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    missing = view(request, **kwargs)
+
+    attachment_1.thumbnail.save("thumbnail.jpg", ContentFile(b"thumbnail"))
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    response = view(request, **kwargs)
+
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Content-Disposition"].startswith("inline;")
+    assert attachment_1.thumbnail_url == url
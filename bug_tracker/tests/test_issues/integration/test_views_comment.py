@@ -3,7 +3,10 @@ from django.urls import reverse
 from issues.models import Issue, IssueComment
 from issues.views.comment import CommentDetailUpdateDeleteView, CommentListCreateView
 from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory, force_authenticate
+from tests.factories import fake_comment, fake_user
+from tests.utils import assert_num_queries_independent_of_page_size
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
@@ -24,6 +27,23 @@ def test_comment_detail_success(
     assert response.data["text"] == comment_1.text
 
 
+@pytest.mark.django_db
+def test_comment_detail_not_modified(
+    request_factory: APIRequestFactory, comment_1: IssueComment, user_1: CustomUser
+) -> None:
+    url = reverse("comment-detail-update-delete", kwargs={"issue_id": comment_1.issue.id, "comment_id": comment_1.id})
+    view = CommentDetailUpdateDeleteView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    etag = view(request, issue_id=comment_1.issue.id, comment_id=comment_1.id).headers["ETag"]
+
+    request = request_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    response = view(request, issue_id=comment_1.issue.id, comment_id=comment_1.id)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
 @pytest.mark.django_db
 def test_comment_detail_failure(request_factory: APIRequestFactory, issue_1: Issue, user_1: CustomUser) -> None:
     comment_id = 999
@@ -56,6 +76,22 @@ def test_comment_update_success(
     assert response.data["text"] == new_text
 
 
+@pytest.mark.django_db
+def test_comment_update_stale_if_match(
+    request_factory: APIRequestFactory, user_1: CustomUser, comment_1: IssueComment
+) -> None:
+    url = reverse("comment-detail-update-delete", kwargs={"issue_id": comment_1.issue.id, "comment_id": comment_1.id})
+
+    request = request_factory.put(url, data={"text": "new comment content"}, HTTP_IF_MATCH='"stale"')
+    force_authenticate(request, user=user_1)
+    view = CommentDetailUpdateDeleteView.as_view()
+    response = view(request, issue_id=comment_1.issue.id, comment_id=comment_1.id)
+
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    comment_1.refresh_from_db()
+    assert comment_1.text != "new comment content"
+
+
 @pytest.mark.django_db
 def test_comment_update_failure(
     request_factory: APIRequestFactory, user_1: CustomUser, comment_1: IssueComment
@@ -115,6 +151,22 @@ def test_comment_list_success(comment_1: IssueComment, user_1: CustomUser, reque
     assert response.data["results"][0]["text"] == comment_1.text
 
 
+@pytest.mark.django_db
+def test_comment_list_query_count_does_not_depend_on_page_size(
+    issue_1: Issue, user_1: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    for _ in range(6):
+        fake_comment(issue=issue_1, author=fake_user())
+    url = reverse("comment-list-create", kwargs={"issue_id": issue_1.id})
+
+    def request_page(page_size: int) -> Response:
+        request = request_factory.get(url, data={"limit": page_size})
+        force_authenticate(request, user=user_1)
+        return CommentListCreateView.as_view()(request, issue_id=issue_1.id)
+
+    assert_num_queries_independent_of_page_size(request_page=request_page, page_sizes=[1, 5])
+
+
 @pytest.mark.django_db
 def test_comment_list_failure(comment_1: IssueComment, user_1: CustomUser, request_factory: APIRequestFactory) -> None:
     url = reverse("comment-list-create", kwargs={"issue_id": comment_1.issue.id})
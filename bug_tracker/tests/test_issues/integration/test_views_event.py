@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import Settings
+from django.db import connections
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from issues.models import Issue
+from issues.services.command_issue import issue_update
+from issues.views.event import ProjectEventStreamView
+from projects.models import Project
+from pytest_mock import MockerFixture
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from tests.factories import fake_user
+from tests.utils import CaptureOnCommitCallbacks
+from users.models import CustomUser
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+def test_project_events_stream(
+    issue_1: Issue,
+    user_1: CustomUser,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.EVENTS_HEARTBEAT_INTERVAL = 0.01
+    url = reverse("project-events", kwargs={"project_id": issue_1.project_id})
+    request = AsyncRequestFactory().get(url)
+    force_authenticate(request, user=user_1)
+    response = ProjectEventStreamView.as_view()(request, project_id=issue_1.project_id)
+
+    def update_issue() -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            issue_update(issue=issue_1, editor=user_1, title="new issue title")
+
+    async def read_stream() -> list[bytes]:
+        stream = response.streaming_content.__aiter__()
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        await sync_to_async(update_issue)()
+        chunks += [await asyncio.wait_for(stream.__anext__(), timeout=1) for _ in range(2)]
+        await stream.aclose()
+        return chunks
+
+    connected, heartbeat, *chunks = async_to_sync(read_stream)()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/event-stream"
+    assert connected.startswith(b":") and heartbeat.startswith(b":")
+    event = f'event: issue.updated\ndata: {{"project_id": {issue_1.project_id}, "issue_id": {issue_1.id}}}\n\n'
+    assert any(chunk.endswith(f"\n{event}".encode()) for chunk in chunks)
+
+
+@pytest.mark.django_db
+def test_project_events_stream_releases_connection(
+    project_1: Project, user_1: CustomUser, settings: Settings, mocker: MockerFixture
+) -> None:
+    settings.EVENTS_HEARTBEAT_INTERVAL = 0.01
+    close_spy = mocker.spy(connections["default"], "close")
+    url = reverse("project-events", kwargs={"project_id": project_1.id})
+    request = AsyncRequestFactory().get(url)
+    force_authenticate(request, user=user_1)
+    response = ProjectEventStreamView.as_view()(request, project_id=project_1.id)
+    closed_before_stream = close_spy.call_count
+
+    async def read_stream() -> None:
+        stream = response.streaming_content.__aiter__()
+        await stream.__anext__()
+        await stream.__anext__()
+        await stream.aclose()
+
+    async_to_sync(read_stream)()
+
+    # Closed once the view returns, and again after the membership check made along with the heartbeat
+    assert closed_before_stream == 1
+    assert close_spy.call_count == 2
+
+
+@pytest.mark.django_db
+def test_project_events_not_member(project_1: Project) -> None:
+    url = reverse("project-events", kwargs={"project_id": project_1.id})
+    request = AsyncRequestFactory().get(url)
+    force_authenticate(request, user=fake_user())
+
+    response = ProjectEventStreamView.as_view()(request, project_id=project_1.id)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_project_events_not_supported_by_wsgi(
+    project_1: Project, user_1: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("project-events", kwargs={"project_id": project_1.id})
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+
+    response = ProjectEventStreamView.as_view()(request, project_id=project_1.id)
+
+    assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
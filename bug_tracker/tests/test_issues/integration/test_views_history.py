@@ -1,9 +1,13 @@
 import pytest
+from auditlog.context import set_actor
 from django.urls import reverse
 from issues.models import Issue, IssueComment
 from issues.views.history import HistoryListView
 from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory, force_authenticate
+from tests.factories import fake_comment, fake_user
+from tests.utils import assert_num_queries_independent_of_page_size
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
@@ -29,6 +33,24 @@ def test_history_list_success(
     assert response.data["count"] == 3
 
 
+@pytest.mark.django_db
+def test_history_list_query_count_does_not_depend_on_page_size(
+    request_factory: APIRequestFactory, user_1: CustomUser, issue_1: Issue
+) -> None:
+    for _ in range(6):
+        author = fake_user()
+        with set_actor(author):
+            fake_comment(issue=issue_1, author=author)
+    url = reverse("issue-history", kwargs={"issue_id": issue_1.id})
+
+    def request_page(page_size: int) -> Response:
+        request = request_factory.get(url, data={"limit": page_size})
+        force_authenticate(request, user=user_1)
+        return HistoryListView.as_view()(request, issue_id=issue_1.id)
+
+    assert_num_queries_independent_of_page_size(request_page=request_page, page_sizes=[1, 5])
+
+
 @pytest.mark.django_db
 def test_history_list_failure(request_factory: APIRequestFactory, user_1: CustomUser, issue_1: Issue) -> None:
     url = reverse("issue-history", kwargs={"issue_id": issue_1.id})
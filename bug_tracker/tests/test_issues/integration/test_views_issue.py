@@ -1,10 +1,20 @@
 import pytest
 from django.urls import reverse
 from issues.models import Issue
-from issues.views.issue import IssueAssignView, IssueDetailUpdateDeleteView, IssueListCreateView
-from projects.models import Project
+from issues.views.issue import (
+    IssueAssignView,
+    IssueBulkAssignView,
+    IssueBulkUpdateView,
+    IssueDetailUpdateDeleteView,
+    IssueListCreateView,
+)
+from projects.models import Project, ProjectRole, ProjectRoleAssignment
+from pytest_mock import MockerFixture
 from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory, force_authenticate
+from tests.factories import fake_issue, fake_user
+from tests.utils import assert_num_queries_independent_of_page_size
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
@@ -36,6 +46,45 @@ def test_issue_detail_failure(request_factory: APIRequestFactory, user_1: Custom
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.django_db
+def test_issue_detail_not_modified(
+    request_factory: APIRequestFactory, issue_1: Issue, user_1: CustomUser, mocker: MockerFixture
+) -> None:
+    url = reverse("issue-detail-update-delete", kwargs={"issue_id": issue_1.id})
+    view = IssueDetailUpdateDeleteView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    etag = view(request, issue_id=issue_1.id).headers["ETag"]
+    issue_get_mock = mocker.patch("issues.views.issue.issue_get")
+
+    request = request_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    response = view(request, issue_id=issue_1.id)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    issue_get_mock.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_issue_detail_modified(request_factory: APIRequestFactory, issue_1: Issue, user_1: CustomUser) -> None:
+    url = reverse("issue-detail-update-delete", kwargs={"issue_id": issue_1.id})
+    view = IssueDetailUpdateDeleteView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    etag = view(request, issue_id=issue_1.id).headers["ETag"]
+    issue_1.title = "new issue title"
+    issue_1.save()
+
+    request = request_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    response = view(request, issue_id=issue_1.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert "Last-Modified" in response.headers
+
+
 @pytest.mark.django_db
 def test_issue_update_success(request_factory: APIRequestFactory, user_1: CustomUser, issue_1: Issue) -> None:
     url = reverse("issue-detail-update-delete", kwargs={"issue_id": issue_1.id})
@@ -53,6 +102,47 @@ def test_issue_update_success(request_factory: APIRequestFactory, user_1: Custom
     assert response.data["title"] == new_title
 
 
+@pytest.mark.django_db
+def test_issue_update_if_match(request_factory: APIRequestFactory, user_1: CustomUser, issue_1: Issue) -> None:
+    url = reverse("issue-detail-update-delete", kwargs={"issue_id": issue_1.id})
+    view = IssueDetailUpdateDeleteView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    etag = view(request, issue_id=issue_1.id).headers["ETag"]
+
+    request = request_factory.put(url, data={"title": "first title"}, HTTP_IF_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    first_response = view(request, issue_id=issue_1.id)
+    request = request_factory.put(url, data={"title": "second title"}, HTTP_IF_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    second_response = view(request, issue_id=issue_1.id)
+
+    assert first_response.status_code == status.HTTP_200_OK
+    assert first_response.headers["ETag"] != etag
+    assert second_response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    issue_1.refresh_from_db()
+    assert issue_1.title == "first title"
+
+
+@pytest.mark.django_db
+def test_issue_update_if_unmodified_since_requires_if_match(
+    request_factory: APIRequestFactory, user_1: CustomUser, issue_1: Issue
+) -> None:
+    url = reverse("issue-detail-update-delete", kwargs={"issue_id": issue_1.id})
+    view = IssueDetailUpdateDeleteView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    last_modified = view(request, issue_id=issue_1.id).headers["Last-Modified"]
+
+    request = request_factory.put(url, data={"title": "new title"}, HTTP_IF_UNMODIFIED_SINCE=last_modified)
+    force_authenticate(request, user=user_1)
+    response = view(request, issue_id=issue_1.id)
+
+    assert response.status_code == status.HTTP_428_PRECONDITION_REQUIRED
+    issue_1.refresh_from_db()
+    assert issue_1.title != "new title"
+
+
 @pytest.mark.django_db
 def test_issue_update_failure(request_factory: APIRequestFactory, user_1: CustomUser, issue_1: Issue) -> None:
     url = reverse("issue-detail-update-delete", kwargs={"issue_id": issue_1.id})
@@ -106,6 +196,62 @@ def test_issue_list_success(issue_1: Issue, user_1: CustomUser, request_factory:
     assert response.data["results"][0]["title"] == issue_1.title
 
 
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+def test_issue_list_not_modified(issue_1: Issue, user_1: CustomUser, request_factory: APIRequestFactory) -> None:
+    url = reverse("issue-list-create", kwargs={"project_id": issue_1.project.id})
+    view = IssueListCreateView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_1)
+    etag = view(request, project_id=issue_1.project.id).headers["ETag"]
+
+    request = request_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    not_modified_response = view(request, project_id=issue_1.project.id)
+    fake_issue(project=issue_1.project, user=user_1)
+    request = request_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+    force_authenticate(request, user=user_1)
+    modified_response = view(request, project_id=issue_1.project.id)
+
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert modified_response.status_code == status.HTTP_200_OK
+    assert modified_response.data["count"] == 2
+    assert modified_response.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_issue_list_with_cursor_success(issue_1: Issue, user_1: CustomUser, request_factory: APIRequestFactory) -> None:
+    url = reverse("issue-list-create", kwargs={"project_id": issue_1.project.id})
+
+    request = request_factory.get(url, data={"cursor": ""})
+    force_authenticate(request, user=user_1)
+    view = IssueListCreateView.as_view()
+    response = view(request, project_id=issue_1.project.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "count" not in response.data
+    assert response.data["next"] is None
+    assert response.data["results"][0]["title"] == issue_1.title
+
+
+@pytest.mark.django_db
+def test_issue_list_query_count_does_not_depend_on_page_size(
+    project_1: Project, user_1: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    for _ in range(6):
+        assignee = fake_user()
+        ProjectRoleAssignment.objects.create(project=project_1, user=assignee, role=ProjectRole.DEVELOPER)
+        fake_issue(project=project_1, user=user_1, assigned_to_id=assignee.id)
+    url = reverse("issue-list-create", kwargs={"project_id": project_1.id})
+
+    def request_page(page_size: int) -> Response:
+        request = request_factory.get(url, data={"limit": page_size})
+        force_authenticate(request, user=user_1)
+        return IssueListCreateView.as_view()(request, project_id=project_1.id)
+
+    assert_num_queries_independent_of_page_size(request_page=request_page, page_sizes=[1, 5])
+
+
 @pytest.mark.django_db
 def test_issue_list_failure(issue_1: Issue, user_1: CustomUser, request_factory: APIRequestFactory) -> None:
     url = reverse("issue-list-create", kwargs={"project_id": issue_1.project.id})
@@ -185,3 +331,65 @@ def test_issue_assign_failure(request_factory: APIRequestFactory, user_1: Custom
     response = view(request, issue_id=issue_1.id)
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_issue_bulk_update_success(
+    request_factory: APIRequestFactory, issue_1: Issue, issue_2: Issue, user_1: CustomUser
+) -> None:
+    url = reverse("issue-bulk-update", kwargs={"project_id": issue_1.project_id})
+    data = {"items": [{"id": issue_1.id, "status": Issue.Status.CLOSED}, {"id": 999, "priority": Issue.Priority.LOW}]}
+
+    request = request_factory.put(url, data=data)
+    force_authenticate(request, user=user_1)
+    response = IssueBulkUpdateView.as_view()(request, project_id=issue_1.project_id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"id": issue_1.id, "result": "updated", "errors": None},
+        {"id": 999, "result": "not_found", "errors": None},
+    ]
+
+
+@pytest.mark.django_db
+def test_issue_bulk_update_duplicate_ids_failure(
+    request_factory: APIRequestFactory, issue_1: Issue, user_1: CustomUser
+) -> None:
+    url = reverse("issue-bulk-update", kwargs={"project_id": issue_1.project_id})
+    item = {"id": issue_1.id, "status": Issue.Status.CLOSED}
+
+    request = request_factory.put(url, data={"items": [item, item]})
+    force_authenticate(request, user=user_1)
+    response = IssueBulkUpdateView.as_view()(request, project_id=issue_1.project_id)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_issue_bulk_assign_success(
+    request_factory: APIRequestFactory, issue_1: Issue, user_1: CustomUser, user_2: CustomUser
+) -> None:
+    url = reverse("issue-bulk-assign", kwargs={"project_id": issue_1.project_id})
+    data = {"items": [{"id": issue_1.id, "assigned_to_id": user_2.id}]}
+
+    request = request_factory.put(url, data=data)
+    force_authenticate(request, user=user_1)
+    response = IssueBulkAssignView.as_view()(request, project_id=issue_1.project_id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["result"] == "invalid"
+    assert "assigned_to_id" in response.data["results"][0]["errors"]
+
+
+@pytest.mark.django_db
+def test_issue_bulk_assign_project_not_found(
+    request_factory: APIRequestFactory, user_2: CustomUser, issue_1: Issue
+) -> None:
+    url = reverse("issue-bulk-assign", kwargs={"project_id": issue_1.project_id})
+    data = {"items": [{"id": issue_1.id, "assigned_to_id": None}]}
+
+    request = request_factory.put(url, data=data)
+    force_authenticate(request, user=user_2)
+    response = IssueBulkAssignView.as_view()(request, project_id=issue_1.project_id)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
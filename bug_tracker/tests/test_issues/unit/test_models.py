@@ -0,0 +1,15 @@
+import pytest
+from issues.filters import IssueFilter, IssueOrdering
+from issues.models import Issue
+
+pytestmark = pytest.mark.unit
+
+
+def test_issue_indexes_cover_list_orderings_and_filters() -> None:
+    index_prefixes = {tuple(index.fields[:2]) for index in Issue._meta.indexes}
+    exact_filters = [field for field, lookups in IssueFilter.Meta.fields.items() if lookups == ["exact"]]
+
+    for field in IssueOrdering.base_fields:
+        assert ("project", field) in index_prefixes
+    for field in exact_filters:
+        assert ("project", field) in index_prefixes or Issue._meta.get_field(field).db_index
@@ -1,19 +1,27 @@
 import pytest
-from django.conf import settings
+from django.conf import Settings
 from django.core import mail
 from django.urls import reverse
 from projects.models import ProjectRole
 from rest_framework import status
 from rest_framework.test import APIClient
 from tests.factories import fake_user
-from tests.utils import login_as
+from tests.utils import CaptureOnCommitCallbacks, login_as
 from users.models import CustomUser
 
 pytestmark = pytest.mark.e2e
 
 
 @pytest.mark.django_db
-def test_project_management_flow(client: APIClient, user_with_verified_email: CustomUser, password: str) -> None:
+def test_project_management_flow(
+    client: APIClient,
+    user_with_verified_email: CustomUser,
+    password: str,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
     # login as (future) manager
     login_as(client=client, user=user_with_verified_email, password=password)
 
@@ -67,7 +75,8 @@ def test_project_management_flow(client: APIClient, user_with_verified_email: Cu
         "role": ProjectRole.DEVELOPER,
     }
     assert len(mail.outbox) == 0
-    response = client.post(members_url, data=new_member_data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(members_url, data=new_member_data)
     assert response.status_code == status.HTTP_201_CREATED
     assert len(mail.outbox) == 1
     invitation_email = mail.outbox[0]
@@ -1,17 +1,30 @@
+import re
+
 import pytest
-from projects.models import Project, ProjectRole
+from django.conf import Settings
+from django.core import mail
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from projects.models import Project, ProjectRole, ProjectRoleAssignment
 from projects.services import command_member, query_member
 from projects.services.exceptions import (
     MemberAlreadyInProject,
     NotSufficientRoleInProject,
     UserCannotModifyOwnMembership,
 )
+from projects.tasks import send_project_invitations
+from pytest_mock import MockerFixture
 from tests.factories import fake_project, fake_user
+from tests.utils import CaptureOnCommitCallbacks
 from users.models import CustomUser
 
 pytestmark = pytest.mark.integration
 
 
+def _get_username_lookups(queries: list[dict[str, str]]) -> list[str]:
+    return [query["sql"] for query in queries if re.search(r'"username" (=|IN) ', query["sql"])]
+
+
 @pytest.fixture
 def user_1() -> CustomUser:
     return fake_user()
@@ -37,6 +50,161 @@ def test_member_add_to_project(project_1: Project, user_1: CustomUser) -> None:
     assert member.project_id == project_1.id
 
 
+@pytest.mark.django_db
+def test_member_add_to_project_sends_invitation_after_commit(
+    project_1: Project,
+    user_1: CustomUser,
+    user_2: CustomUser,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    with django_capture_on_commit_callbacks(execute=True):
+        command_member.member_add_to_project(
+            project=project_1, editor=user_1, email="new@example.com", role=ProjectRole.REPORTER
+        )
+        command_member.member_add_to_project(
+            project=project_1, editor=user_1, email=user_2.email, role=ProjectRole.REPORTER
+        )
+        assert len(mail.outbox) == 0
+
+    assert [email.to for email in mail.outbox] == [["new@example.com"], [user_2.email]]
+    assert user_2.username not in mail.outbox[1].body
+
+
+@pytest.mark.django_db
+def test_member_add_to_project_does_not_send_invitation_if_rolled_back(
+    project_1: Project,
+    user_1: CustomUser,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            command_member.member_add_to_project(
+                project=project_1, editor=user_1, email="new@example.com", role=ProjectRole.REPORTER
+            )
+            raise RuntimeError
+
+    assert len(callbacks) == 0
+    assert len(mail.outbox) == 0
+
+
+@pytest.mark.django_db
+def test_member_bulk_add_to_project(
+    project_1: Project,
+    user_1: CustomUser,
+    user_2: CustomUser,
+    settings: Settings,
+    django_capture_on_commit_callbacks: CaptureOnCommitCallbacks,
+    mocker: MockerFixture,
+) -> None:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    delay_spy = mocker.spy(send_project_invitations, "delay")
+    members = [
+        {"email": "new@example.com", "role": ProjectRole.DEVELOPER},
+        {"email": user_2.email, "role": ProjectRole.REPORTER},
+        {"email": user_1.email, "role": ProjectRole.REPORTER},
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        results = command_member.member_bulk_add_to_project(project=project_1, editor=user_1, members=members)
+
+    assert [(r.email, r.result) for r in results] == [
+        ("new@example.com", command_member.ImportResult.CREATED),
+        (user_2.email, command_member.ImportResult.ADDED),
+        (user_1.email, command_member.ImportResult.ALREADY_MEMBER),
+    ]
+    new_user = CustomUser.objects.get(emailaddress__email="new@example.com", emailaddress__primary=True)
+    assert not new_user.has_usable_password()
+    roles = dict(ProjectRoleAssignment.objects.filter(project=project_1).values_list("user_id", "role"))
+    assert roles == {
+        user_1.id: ProjectRole.MANAGER,
+        user_2.id: ProjectRole.REPORTER,
+        new_user.id: ProjectRole.DEVELOPER,
+    }
+    delay_spy.assert_called_once()
+    assert [email.to for email in mail.outbox] == [["new@example.com"], [user_2.email]]
+    assert new_user.username in mail.outbox[0].body
+
+
+@pytest.mark.django_db
+def test_member_add_to_project_matches_email_case_insensitively(
+    project_1: Project, user_1: CustomUser, user_2: CustomUser
+) -> None:
+    users_count = CustomUser.objects.count()
+
+    role_assignment = command_member.member_add_to_project(
+        project=project_1, editor=user_1, email=user_2.email.upper(), role=ProjectRole.REPORTER
+    )
+
+    assert role_assignment.user == user_2
+    assert CustomUser.objects.count() == users_count
+
+
+@pytest.mark.django_db
+def test_member_bulk_add_to_project_matches_emails_case_insensitively(
+    project_1: Project, user_1: CustomUser, user_2: CustomUser
+) -> None:
+    members = [{"email": user_2.email.upper(), "role": ProjectRole.REPORTER}]
+
+    results = command_member.member_bulk_add_to_project(project=project_1, editor=user_1, members=members)
+
+    assert [(r.email, r.result) for r in results] == [(user_2.email.upper(), command_member.ImportResult.ADDED)]
+    assert ProjectRoleAssignment.objects.filter(project=project_1, user=user_2).exists()
+
+
+@pytest.mark.django_db
+def test_member_bulk_add_to_project_query_count_does_not_depend_on_member_count(
+    user_1: CustomUser, project_1: Project
+) -> None:
+    def bulk_add(count: int) -> int:
+        existing = [{"email": fake_user().email, "role": ProjectRole.REPORTER} for _index in range(count)]
+        new = [{"email": f"new{count}-{index}@example.com", "role": ProjectRole.REPORTER} for index in range(count)]
+        with CaptureQueriesContext(connection) as context:
+            command_member.member_bulk_add_to_project(project=project_1, editor=user_1, members=existing + new)
+        return len(context.captured_queries)
+
+    bulk_add(1)  # warms up the editor's memberships cache
+    assert bulk_add(2) == bulk_add(6)
+
+
+@pytest.mark.django_db
+def test_member_bulk_add_to_project_allocates_usernames_without_reading_them(
+    user_1: CustomUser, project_1: Project
+) -> None:
+    members = [{"email": f"new{index}@example.com", "role": ProjectRole.REPORTER} for index in range(2000)]
+
+    with CaptureQueriesContext(connection) as context:
+        command_member.member_bulk_add_to_project(project=project_1, editor=user_1, members=members)
+
+    new_users = CustomUser.objects.filter(email__startswith="new")
+    assert new_users.count() == len(members)
+    assert new_users.values("username").distinct().count() == len(members)
+    assert not _get_username_lookups(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_member_add_to_project_allocates_username_without_reading_it(user_1: CustomUser, project_1: Project) -> None:
+    with CaptureQueriesContext(connection) as context:
+        command_member.member_add_to_project(
+            project=project_1, editor=user_1, email="new@example.com", role=ProjectRole.REPORTER
+        )
+
+    assert not _get_username_lookups(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_member_bulk_add_to_project_by_non_manager_should_fail(project_1: Project, user_2: CustomUser) -> None:
+    with pytest.raises(NotSufficientRoleInProject):
+        command_member.member_bulk_add_to_project(
+            project=project_1, editor=user_2, members=[{"email": "new@example.com", "role": ProjectRole.REPORTER}]
+        )
+
+
 @pytest.mark.django_db
 def test_member_add_to_project_by_non_manager_should_fail(project_1: Project, user_2: CustomUser) -> None:
     with pytest.raises(NotSufficientRoleInProject):
@@ -0,0 +1,100 @@
+import pytest
+from core.request_cache import request_cache_scope
+from projects.membership_cache import get_user_memberships, get_user_project_ids, invalidate_user_memberships
+from projects.models import Project, ProjectRole, ProjectRoleAssignment
+from projects.services import command_member
+from pytest_django import DjangoAssertNumQueries
+from tests.factories import fake_project, fake_user
+from users.models import CustomUser
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.django_db
+def test_get_user_memberships_returns_roles_by_project(project: Project, user_with_verified_email: CustomUser) -> None:
+    other_project = fake_project(user=fake_user())
+    ProjectRoleAssignment.objects.create(
+        project=other_project, user=user_with_verified_email, role=ProjectRole.REPORTER
+    )
+
+    memberships = get_user_memberships(user_id=user_with_verified_email.pk)
+
+    assert memberships == {project.id: ProjectRole.MANAGER, other_project.id: ProjectRole.REPORTER}
+
+
+@pytest.mark.django_db
+def test_get_user_project_ids_returns_empty_set_if_no_memberships() -> None:
+    project_ids = get_user_project_ids(user_id=fake_user().pk)
+
+    assert project_ids == set()
+
+
+@pytest.mark.django_db
+def test_get_user_memberships_is_served_from_cache(
+    project: Project, user_with_verified_email: CustomUser, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    get_user_memberships(user_id=user_with_verified_email.pk)
+
+    with django_assert_num_queries(0):
+        memberships = get_user_memberships(user_id=user_with_verified_email.pk)
+
+    assert memberships == {project.id: ProjectRole.MANAGER}
+
+
+@pytest.mark.django_db
+def test_invalidate_user_memberships_discards_cached_entry(project: Project) -> None:
+    user = fake_user()
+    get_user_memberships(user_id=user.pk)
+    ProjectRoleAssignment.objects.create(project=project, user=user, role=ProjectRole.DEVELOPER)
+
+    invalidate_user_memberships(user_id=user.pk)
+
+    assert get_user_memberships(user_id=user.pk) == {project.id: ProjectRole.DEVELOPER}
+
+
+@pytest.mark.django_db
+def test_invalidate_user_memberships_discards_request_scoped_entry(project: Project) -> None:
+    user = fake_user()
+
+    with request_cache_scope():
+        get_user_memberships(user_id=user.pk)
+        ProjectRoleAssignment.objects.create(project=project, user=user, role=ProjectRole.DEVELOPER)
+        invalidate_user_memberships(user_id=user.pk)
+
+        memberships = get_user_memberships(user_id=user.pk)
+
+    assert memberships == {project.id: ProjectRole.DEVELOPER}
+
+
+@pytest.mark.django_db
+def test_member_add_to_project_invalidates_memberships(project: Project, user_with_verified_email: CustomUser) -> None:
+    user = fake_user()
+    get_user_memberships(user_id=user.pk)
+
+    command_member.member_add_to_project(
+        project=project, editor=user_with_verified_email, email=user.email, role=ProjectRole.DEVELOPER
+    )
+
+    assert get_user_memberships(user_id=user.pk) == {project.id: ProjectRole.DEVELOPER}
+
+
+@pytest.mark.django_db
+def test_member_remove_from_project_invalidates_memberships(
+    project: Project, user_with_verified_email: CustomUser
+) -> None:
+    user = fake_user()
+    member = ProjectRoleAssignment.objects.create(project=project, user=user, role=ProjectRole.DEVELOPER)
+    get_user_memberships(user_id=user.pk)
+
+    command_member.member_remove_from_project(project=project, editor=user_with_verified_email, member=member)
+
+    assert get_user_memberships(user_id=user.pk) == {}
+
+
+@pytest.mark.django_db
+def test_project_create_invalidates_creator_memberships(user_with_verified_email: CustomUser) -> None:
+    get_user_memberships(user_id=user_with_verified_email.pk)
+
+    project = fake_project(user=user_with_verified_email)
+
+    assert get_user_memberships(user_id=user_with_verified_email.pk) == {project.id: ProjectRole.MANAGER}
@@ -0,0 +1,93 @@
+import pytest
+from core.request_cache import request_cache_scope
+from projects.models import Project, ProjectRole, ProjectRoleAssignment
+from projects.role_resolver import forget_user_role, resolve_user_role
+from projects.services import command_member
+from pytest_django import DjangoAssertNumQueries
+from tests.factories import fake_user
+from users.models import CustomUser
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def developer(project: Project) -> CustomUser:
+    user = fake_user()
+    ProjectRoleAssignment.objects.create(project=project, user=user, role=ProjectRole.DEVELOPER)
+    return user
+
+
+@pytest.mark.django_db
+def test_resolve_user_role_returns_role(project: Project, user_with_verified_email: CustomUser) -> None:
+    role = resolve_user_role(project_id=project.id, user=user_with_verified_email)
+
+    assert role == ProjectRole.MANAGER
+
+
+@pytest.mark.django_db
+def test_resolve_user_role_returns_none_if_not_a_member(project: Project) -> None:
+    role = resolve_user_role(project_id=project.id, user=fake_user())
+
+    assert role is None
+
+
+@pytest.mark.django_db
+def test_resolve_user_role_is_memoized_within_scope(
+    project: Project, user_with_verified_email: CustomUser, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    with request_cache_scope(), django_assert_num_queries(1):
+        for _ in range(3):
+            resolve_user_role(project_id=project.id, user=user_with_verified_email)
+
+
+@pytest.mark.django_db
+def test_resolve_user_role_uses_shared_membership_cache_outside_scope(
+    project: Project, user_with_verified_email: CustomUser, django_assert_num_queries: DjangoAssertNumQueries
+) -> None:
+    with django_assert_num_queries(1):
+        resolve_user_role(project_id=project.id, user=user_with_verified_email)
+        resolve_user_role(project_id=project.id, user=user_with_verified_email)
+
+
+@pytest.mark.django_db
+def test_forget_user_role_invalidates_memoized_role(project: Project, developer: CustomUser) -> None:
+    with request_cache_scope():
+        resolve_user_role(project_id=project.id, user=developer)
+        ProjectRoleAssignment.objects.filter(project=project, user=developer).update(role=ProjectRole.REPORTER)
+        forget_user_role(project_id=project.id, user_id=developer.pk)
+
+        role = resolve_user_role(project_id=project.id, user=developer)
+
+    assert role == ProjectRole.REPORTER
+
+
+@pytest.mark.django_db
+def test_member_change_role_in_project_invalidates_memoized_role(
+    project: Project, user_with_verified_email: CustomUser, developer: CustomUser
+) -> None:
+    member = ProjectRoleAssignment.objects.get(project=project, user=developer)
+
+    with request_cache_scope():
+        resolve_user_role(project_id=project.id, user=developer)
+        command_member.member_change_role_in_project(
+            project=project, editor=user_with_verified_email, member=member, new_role=ProjectRole.MANAGER
+        )
+
+        role = resolve_user_role(project_id=project.id, user=developer)
+
+    assert role == ProjectRole.MANAGER
+
+
+@pytest.mark.django_db
+def test_member_remove_from_project_invalidates_memoized_role(
+    project: Project, user_with_verified_email: CustomUser, developer: CustomUser
+) -> None:
+    member = ProjectRoleAssignment.objects.get(project=project, user=developer)
+
+    with request_cache_scope():
+        resolve_user_role(project_id=project.id, user=developer)
+        command_member.member_remove_from_project(project=project, editor=user_with_verified_email, member=member)
+
+        role = resolve_user_role(project_id=project.id, user=developer)
+
+    assert role is None
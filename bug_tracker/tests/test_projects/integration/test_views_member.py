@@ -1,8 +1,9 @@
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from projects.models import Project, ProjectRole
 from projects.services.command_member import member_add_to_project
-from projects.views.member import MemberDetailUpdateDeleteView, MemberListCreateView
+from projects.views.member import MemberDetailUpdateDeleteView, MemberImportView, MemberListCreateView
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
 from tests.factories import fake_user
@@ -174,3 +175,77 @@ def test_member_delete_failure(
     response = view(request, project_id=project.id, member_id=member_id)
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_member_import_json_success(
+    project: Project, user_with_verified_email: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("member-import", kwargs={"project_id": project.id})
+    data = {
+        "members": [
+            {"email": "new@example.com", "role": ProjectRole.DEVELOPER},
+            {"email": user_with_verified_email.email, "role": ProjectRole.DEVELOPER},
+        ]
+    }
+
+    request = request_factory.post(url, data=data)
+    force_authenticate(request, user=user_with_verified_email)
+    response = MemberImportView.as_view()(request, project_id=project.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"email": "new@example.com", "result": "created"},
+        {"email": user_with_verified_email.email, "result": "already_member"},
+    ]
+
+
+@pytest.mark.django_db
+def test_member_import_csv_success(
+    project: Project, user_with_verified_email: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("member-import", kwargs={"project_id": project.id})
+    content = f"email,role\nnew@example.com,{ProjectRole.DEVELOPER}\nother@example.com,{ProjectRole.REPORTER}\n"
+    file = SimpleUploadedFile("members.csv", content.encode(), content_type="text/csv")
+
+    request = request_factory.post(url, data={"file": file}, format="multipart")
+    force_authenticate(request, user=user_with_verified_email)
+    response = MemberImportView.as_view()(request, project_id=project.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["email"] for result in response.data["results"]] == ["new@example.com", "other@example.com"]
+
+
+@pytest.mark.django_db
+def test_member_import_csv_failure(
+    project: Project, user_with_verified_email: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("member-import", kwargs={"project_id": project.id})
+    content = "email,role\nnew@example.com,invalid\n"
+    file = SimpleUploadedFile("members.csv", content.encode(), content_type="text/csv")
+
+    request = request_factory.post(url, data={"file": file}, format="multipart")
+    force_authenticate(request, user=user_with_verified_email)
+    response = MemberImportView.as_view()(request, project_id=project.id)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "file" in response.data["detail"]
+
+
+@pytest.mark.django_db
+def test_member_import_duplicate_emails_failure(
+    project: Project, user_with_verified_email: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("member-import", kwargs={"project_id": project.id})
+    data = {
+        "members": [
+            {"email": "new@example.com", "role": ProjectRole.DEVELOPER},
+            {"email": "NEW@example.com", "role": ProjectRole.REPORTER},
+        ]
+    }
+
+    request = request_factory.post(url, data=data)
+    force_authenticate(request, user=user_with_verified_email)
+    response = MemberImportView.as_view()(request, project_id=project.id)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 import pytest
 from django.conf import settings
 from django.urls import reverse
-from projects.models import Project
+from django.utils import timezone
+from projects.models import Project, ProjectRole, ProjectRoleAssignment
+from projects.role_resolver import forget_user_role
 from projects.views.project import ProjectCurrentDetailView, ProjectDetailUpdateView, ProjectListCreateView
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
@@ -25,6 +29,51 @@ def test_project_detail_success(
     assert response.data["name"] == project.name
 
 
+@pytest.mark.django_db
+def test_project_detail_etag_changes_with_role(
+    project: Project, user_with_verified_email: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("project-detail-update", kwargs={"project_id": project.id})
+    view = ProjectDetailUpdateView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_with_verified_email)
+    etag = view(request, project_id=project.id).headers["ETag"]
+    ProjectRoleAssignment.objects.filter(project=project, user=user_with_verified_email).update(
+        role=ProjectRole.DEVELOPER
+    )
+    forget_user_role(project_id=project.id, user_id=user_with_verified_email.pk)
+
+    request = request_factory.get(url, HTTP_IF_NONE_MATCH=etag)
+    force_authenticate(request, user=user_with_verified_email)
+    response = view(request, project_id=project.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_project_detail_last_modified_changes_with_role(
+    project: Project, user_with_verified_email: CustomUser, request_factory: APIRequestFactory
+) -> None:
+    url = reverse("project-detail-update", kwargs={"project_id": project.id})
+    view = ProjectDetailUpdateView.as_view()
+    request = request_factory.get(url)
+    force_authenticate(request, user=user_with_verified_email)
+    last_modified = view(request, project_id=project.id).headers["Last-Modified"]
+    ProjectRoleAssignment.objects.filter(project=project, user=user_with_verified_email).update(
+        role=ProjectRole.DEVELOPER, updated_at=timezone.now() + timedelta(minutes=1)
+    )
+    forget_user_role(project_id=project.id, user_id=user_with_verified_email.pk)
+
+    request = request_factory.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    force_authenticate(request, user=user_with_verified_email)
+    response = view(request, project_id=project.id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["role"] == ProjectRole.DEVELOPER
+    assert response.headers["Last-Modified"] != last_modified
+
+
 @pytest.mark.django_db
 def test_project_detail_failure(user_with_verified_email: CustomUser, request_factory: APIRequestFactory) -> None:
     project_id = 999
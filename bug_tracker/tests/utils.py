@@ -1,10 +1,17 @@
+from typing import Callable, ContextManager, Iterable
+
 from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.views import View
 from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.test import APIClient, APIRequestFactory
 from users.models import CustomUser
 
+CaptureOnCommitCallbacks = Callable[..., ContextManager[list[Callable[[], None]]]]
+
 
 def clear_outbox() -> None:
     mail.outbox.clear()
@@ -32,3 +39,23 @@ def login_as(*, client: APIClient, user: CustomUser, password: str) -> None:
     token = response.data["access"]
 
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def assert_num_queries_independent_of_page_size(
+    *, request_page: Callable[[int], Response], page_sizes: Iterable[int]
+) -> None:
+    """
+    Requests a list endpoint with every page size (once to warm up caches, once measured)
+    and asserts that the number of executed queries does not depend on the page size.
+    """
+    query_counts = {}
+    for page_size in page_sizes:
+        request_page(page_size)
+        with CaptureQueriesContext(connection) as context:
+            response = request_page(page_size)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == page_size
+        query_counts[page_size] = len(context.captured_queries)
+
+    assert len(set(query_counts.values())) == 1, f"Query count depends on page size: {query_counts}"